@@ -0,0 +1,103 @@
+"""Time method-call-heavy scripts on the naive interpreter and on both engines.
+
+Usage: python -m benchmarks.classes [--engines naive,tree,vm] [--scripts ...]
+                                    [--repeat N]
+
+The naive interpreter looks every property up through the instance's fields
+and the chain of classes and binds every method it calls, which is what the
+inline caches of the other two engines avoid.
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from typing import Final
+
+from benchmarks.interpreter import _run_naive, parse
+from benchmarks.vm import ENGINES
+from plox.stmt import Stmt
+
+SCRIPTS: Final = {
+    "monomorphic": """
+class Counter {
+    init() { this.count = 0; this.step = 1; }
+    increment() { this.count = this.count + this.step; return this; }
+    value() { return this.count; }
+}
+var counter = Counter();
+for (var i = 0; i < 100000; i = i + 1) counter.increment();
+print counter.value();
+""",
+    "polymorphic": """
+class Shape { area() { return 0; } describe() { return this.area(); } }
+class Square < Shape {
+    init(side) { this.side = side; }
+    area() { return this.side * this.side; }
+}
+class Rectangle < Shape {
+    init(width, height) { this.width = width; this.height = height; }
+    area() { return this.width * this.height; }
+}
+class Circle < Shape {
+    init(radius) { this.radius = radius; }
+    area() { return 3 * this.radius * this.radius; }
+}
+var total = 0;
+for (var i = 0; i < 20000; i = i + 1) {
+    total = total + Square(i).describe() + Rectangle(i, 2).describe();
+    total = total + Circle(1).describe();
+}
+print total;
+""",
+    "inheritance": """
+class A { base() { return 1; } }
+class B < A { }
+class C < B { }
+class D < C { }
+class E < D { step(n) { return super.base() + n; } }
+var e = E();
+var total = 0;
+for (var i = 0; i < 50000; i = i + 1) total = e.step(total) + e.base();
+print total;
+""",
+}
+
+ALL_ENGINES: Final[dict[str, Callable[[list[Stmt]], str]]] = {
+    "naive": _run_naive,
+    **ENGINES,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmarks.classes")
+    parser.add_argument("--engines", default=",".join(ALL_ENGINES))
+    parser.add_argument("--scripts", default=",".join(SCRIPTS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name in args.scripts.split(","):
+        outputs = set()
+        timings = {}
+        for engine in args.engines.split(","):
+            runs = []
+            for _ in range(args.repeat):
+                # Parsed for every run, so that caches start out empty.
+                statements = parse(SCRIPTS[name])
+                start = time.perf_counter()
+                outputs.add(ALL_ENGINES[engine](statements))
+                runs.append(time.perf_counter() - start)
+            timings[engine] = min(runs)
+
+        baseline = timings.get("naive")
+        for engine, seconds in timings.items():
+            speedup = "" if baseline is None else f"  x{baseline / seconds:.2f}"
+            print(f"{name:<12} {engine:<6} {seconds:>8.3f} s{speedup}")
+
+        if len(outputs) > 1:
+            print(f"{name}: outputs differ", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Synthetic Lox sources of different shapes for the benchmarks."""
+
+import itertools
+import random
+import string
+from collections.abc import Callable
+from typing import Final
+
+_NESTING_DEPTH: Final = 64
+# Odds of either variant of a snippet that comes in two.
+_EVEN_ODDS: Final = 0.5
+
+
+def _name(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_letters, k=rng.randint(3, 12)))
+
+
+def _identifiers(rng: random.Random) -> str:
+    names = [_name(rng) for _ in range(4)]
+    declarations = [f"var {names[0]} = nil;"]
+    declarations.extend(
+        f"var {name} = {previous};" for previous, name in itertools.pairwise(names)
+    )
+    return "{ " + " ".join(declarations) + f" {names[0]} = {names[-1]}; }}\n"
+
+
+def _strings(rng: random.Random) -> str:
+    text = "".join(rng.choices(string.ascii_letters + " .,!?", k=rng.randint(8, 80)))
+    return f'{{ var text = "{text}"; }}\n'
+
+
+def _comments(rng: random.Random) -> str:
+    words = " ".join(_name(rng) for _ in range(rng.randint(4, 16)))
+    comment = (
+        f"// {words}\n" if rng.random() < _EVEN_ODDS else f"/* {words}\n   {words} */\n"
+    )
+
+    return f"{comment}{{ var {_name(rng)} = nil; }}\n"
+
+
+def _numbers(rng: random.Random) -> str:
+    operands = [
+        str(rng.randint(0, 10**6))
+        if rng.random() < _EVEN_ODDS
+        else f"{rng.random() * 1e3:.4f}"
+        for _ in range(4)
+    ]
+    return f"{{ var number = {' + '.join(operands)}; }}\n"
+
+
+def _nested(_: random.Random) -> str:
+    return "{ " * _NESTING_DEPTH + "}" * _NESTING_DEPTH + "\n"
+
+
+SHAPES: Final[dict[str, Callable[[random.Random], str]]] = {
+    "identifiers": _identifiers,
+    "strings": _strings,
+    "comments": _comments,
+    "numbers": _numbers,
+    "nested": _nested,
+}
+
+
+def generate(shape: str, size: int, seed: int = 0) -> str:
+    # Returns a valid program of at least `size` characters, always the same
+    # for a given shape, size and seed.
+    rng = random.Random(seed)  # noqa: S311
+    make_snippet = SHAPES[shape]
+
+    snippets = []
+    length = 0
+    while length < size:
+        snippet = make_snippet(rng)
+        snippets.append(snippet)
+        length += len(snippet)
+
+    return "".join(snippets)
+
+
+def parse_size(size: str) -> int:
+    # Parses sizes such as "64", "16KB" or "256MB".
+    units = {"KB": 1024, "MB": 1024**2, "GB": 1024**3}
+    for unit, multiplier in units.items():
+        if size.upper().endswith(unit):
+            return int(size[: -len(unit)]) * multiplier
+
+    return int(size)
@@ -0,0 +1,81 @@
+"""Time the first and the later executions of scripts on one embedded engine.
+
+Usage: python -m benchmarks.embedded [--engines tree,vm] [--repeat N]
+
+A host serving scripts runs the same few sources over and over. The first
+execution of a source scans, parses, resolves and compiles it; later ones only
+run the program kept from then, with fresh globals.
+"""
+
+import argparse
+import sys
+import time
+from typing import Final
+
+from plox.embedded import EmbeddedLox
+from plox.pipeline import Engine
+
+SCRIPTS: Final = {
+    "handler": """
+fun handle(request) {
+    if (request == "ping") return "pong";
+    return "unknown " + request;
+}
+print handle("ping");
+print handle("status");
+""",
+    "classes": """
+class Greeter {
+    init(name) { this.name = name; }
+    greet() { return "hello " + this.name; }
+}
+class LoudGreeter < Greeter {
+    greet() { return super.greet() + "!"; }
+}
+print Greeter("a").greet();
+print LoudGreeter("b").greet();
+""",
+    "loop": """
+var total = 0;
+for (var i = 0; i < 100; i = i + 1) total = total + i;
+print total;
+""",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmarks.embedded")
+    parser.add_argument(
+        "--engines",
+        default=",".join(engine.value for engine in Engine),
+    )
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for engine in args.engines.split(","):
+        for name, source in SCRIPTS.items():
+            first = []
+            warm = []
+            for _ in range(args.repeat):
+                lox = EmbeddedLox(engine=Engine(engine))
+                start = time.perf_counter()
+                expected = lox.execute(source)
+                first.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                result = lox.execute(source)
+                warm.append(time.perf_counter() - start)
+
+                if result != expected or result.errors:
+                    print(f"{name}: executions differ", file=sys.stderr)
+                    sys.exit(1)
+
+            print(
+                f"{name:<8} {engine:<5} first {min(first) * 1e6:>8.1f} us"
+                f"  warm {min(warm) * 1e6:>8.1f} us"
+                f"  speedup x{min(first) / min(warm):.2f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
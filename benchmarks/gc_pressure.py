@@ -0,0 +1,157 @@
+"""Measure how hard scripts make the garbage collector work on both engines.
+
+Usage: python -m benchmarks.gc_pressure [--engines tree,tree-closures,vm]
+                                        [--scripts ...] [--ops N]
+
+Reports, per operation (one iteration of the script's loop):
+
+- gen0/gen1/gen2: collections of each generation. CPython counts container
+  allocations minus deallocations towards the generation 0 threshold, so this
+  is the closest thing to an allocation rate it exposes.
+- collected: objects freed by the cycle collector, which only happens for
+  garbage that reference counting could not free.
+- pause: time spent in collections, measured through gc.callbacks.
+- peak: the largest amount of memory traced by tracemalloc during the run.
+
+The "tree-closures" engine is the tree interpreter with every function keeping its
+enclosing scope, as all of them did before the resolver learned which ones
+capture variables.
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import fields
+from typing import Final, Self
+
+from benchmarks.interpreter import parse
+from benchmarks.vm import ENGINES
+from plox.expr import Expr
+from plox.stmt import Function, Stmt
+
+SCRIPTS: Final = {
+    "helpers": """
+fun norm(x, y) {
+    fun square(n) { return n * n; }
+    return square(x) + square(y);
+}
+var total = 0;
+for (var i = 0; i < OPS; i = i + 1) total = total + norm(i, 1);
+print total;
+""",
+    "closures": """
+fun counter() {
+    var count = 0;
+    fun increment() { count = count + 1; return count; }
+    return increment;
+}
+var total = 0;
+for (var i = 0; i < OPS; i = i + 1) total = total + counter()();
+print total;
+""",
+    "instances": """
+class Point {
+    init(x, y) { this.x = x; this.y = y; }
+    plus(other) { return Point(this.x + other.x, this.y + other.y); }
+}
+var sum = Point(0, 0);
+for (var i = 0; i < OPS; i = i + 1) sum = sum.plus(Point(i, 1));
+print sum.x;
+""",
+}
+
+
+def _keep_closures(node: Expr | Stmt) -> None:
+    if type(node) is Function:
+        node.captures = True
+
+    for node_field in fields(node):
+        value = getattr(node, node_field.name)
+        if isinstance(value, Expr | Stmt):
+            _keep_closures(value)
+        elif type(value) is list:
+            for item in value:
+                if isinstance(item, Expr | Stmt):
+                    _keep_closures(item)
+
+
+def _run_closures(statements: list[Stmt]) -> str:
+    for statement in statements:
+        _keep_closures(statement)
+
+    return ENGINES["tree"](statements)
+
+
+ALL_ENGINES: Final[dict[str, Callable[[list[Stmt]], str]]] = {
+    "tree": ENGINES["tree"],
+    "tree-closures": _run_closures,
+    "vm": ENGINES["vm"],
+}
+
+
+class _Collections:
+    def __init__(self: Self) -> None:
+        self.counts = [0, 0, 0]
+        self.collected = 0
+        self.pause = 0.0
+        self._start = 0.0
+
+    def __call__(self: Self, phase: str, info: dict[str, int]) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.pause += time.perf_counter() - self._start
+            self.counts[info["generation"]] += 1
+            self.collected += info["collected"]
+
+
+def _measure(
+    run: Callable[[list[Stmt]], str],
+    statements: list[Stmt],
+) -> tuple[str, _Collections, int]:
+    collections = _Collections()
+    gc.collect()
+    tracemalloc.start()
+    gc.callbacks.append(collections)
+    try:
+        output = run(statements)
+    finally:
+        gc.callbacks.remove(collections)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return output, collections, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmarks.gc_pressure")
+    parser.add_argument("--engines", default=",".join(ALL_ENGINES))
+    parser.add_argument("--scripts", default=",".join(SCRIPTS))
+    parser.add_argument("--ops", type=int, default=20000)
+    args = parser.parse_args()
+
+    for name in args.scripts.split(","):
+        source = SCRIPTS[name].replace("OPS", str(args.ops))
+        outputs = set()
+        for engine in args.engines.split(","):
+            output, collections, peak = _measure(ALL_ENGINES[engine], parse(source))
+            outputs.add(output)
+            gen0, gen1, gen2 = (count / args.ops for count in collections.counts)
+            print(
+                f"{name:<10} {engine:<13}"
+                f" gen0 {gen0:.4f} gen1 {gen1:.4f} gen2 {gen2:.4f} /op"
+                f"  collected {collections.collected / args.ops:>6.2f} /op"
+                f"  pause {collections.pause * 1e3:>7.2f} ms"
+                f"  peak {peak / 1024:>8.1f} KiB",
+            )
+
+        if len(outputs) > 1:
+            print(f"{name}: outputs differ", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure what interning lexemes and literals saves when scanning.
+
+Usage: python -m benchmarks.interning [REPEAT]
+
+Scans a generated script, in which the same names and values recur, with and
+without interning, and then looks every identifier up in a dict of names, as
+name resolution does.
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Self
+
+from plox.errors import ListErrorReporter
+from plox.interner import Interner
+from plox.scanner import Scanner, ScannerEngine
+from plox.token import Token
+from plox.token_type import TokenType
+
+_SNIPPET = """
+var counter = 0;
+fun increment(amount) {
+    counter = counter + amount * 1.5;
+    return "incremented";
+}
+while (counter < 1000) {
+    print increment(2) + " by two";
+}
+"""
+
+
+class _NoInterner(Interner):
+    # Returns fresh objects, as the scanner did before interning.
+    __slots__ = ()
+
+    def string(self: Self, value: str) -> str:
+        return value
+
+    def number(self: Self, lexeme: str) -> float:
+        return float(lexeme)
+
+
+def _scan(source: str, interner: Interner) -> tuple[list[Token], int, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = Scanner(
+        source=source,
+        error_reporter=ListErrorReporter(),
+        engine=ScannerEngine.REGEX,
+        interner=interner,
+    ).scan_tokens()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tokens, size, elapsed
+
+
+def _resolve(tokens: list[Token]) -> float:
+    names = {
+        token.lexeme: index
+        for index, token in enumerate(tokens)
+        if token.type is TokenType.IDENTIFIER
+    }
+
+    found = 0
+    start = time.perf_counter()
+    for token in tokens:
+        if token.type is TokenType.IDENTIFIER:
+            found += names[token.lexeme]
+    elapsed = time.perf_counter() - start
+
+    assert found > 0  # noqa: S101
+    return elapsed
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    source = _SNIPPET * repeat
+
+    print(f"source: {len(source):,} characters")
+    for name, interner in (("fresh", _NoInterner()), ("interned", Interner())):
+        tokens, size, elapsed = _scan(source, interner)
+        lookups = _resolve(tokens)
+        print(
+            f"{name:<9} {len(tokens):>10,} tokens {size:>14,} bytes "
+            f"{size / len(tokens):>7.1f} bytes/token  scan {elapsed:>6.3f} s"
+            f"  lookups {lookups:>6.3f} s",
+        )
+        del tokens
+
+
+if __name__ == "__main__":
+    main()
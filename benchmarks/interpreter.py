@@ -0,0 +1,112 @@
+"""Compare the slot-resolving interpreter with a naive dict-environment one.
+
+Usage: python -m benchmarks.interpreter [REPEAT]
+"""
+
+import io
+import sys
+import time
+from collections.abc import Callable
+from typing import Final
+
+from benchmarks.naive_interpreter import NaiveInterpreter
+from plox.errors import ListErrorReporter
+from plox.interpreter import Interpreter
+from plox.parser import Parser
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+from plox.stmt import Stmt
+
+SCRIPTS: Final = {
+    "fib": """
+fun fib(n) {
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}
+print fib(22);
+""",
+    "loop": """
+var total = 0;
+for (var i = 0; i < 100000; i = i + 1) {
+    var square = i * i;
+    total = total + square - i;
+}
+print total;
+""",
+    "closures": """
+fun counter() {
+    var count = 0;
+    fun increment() {
+        count = count + 1;
+        return count;
+    }
+    return increment;
+}
+var next = counter();
+var i = 0;
+while (i < 30000) {
+    {
+        { i = i + next() - next() + 2; }
+    }
+}
+print i;
+""",
+}
+
+
+def parse(source: str) -> list[Stmt]:
+    error_reporter = ListErrorReporter()
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    if error_reporter.had_error:
+        raise SyntaxError(error_reporter.errors)
+
+    return statements
+
+
+def _run_resolved(statements: list[Stmt]) -> str:
+    out = io.StringIO()
+    Interpreter(ListErrorReporter(), out).interpret(statements)
+    return out.getvalue()
+
+
+def _run_naive(statements: list[Stmt]) -> str:
+    interpreter = NaiveInterpreter()
+    interpreter.interpret(statements)
+    return interpreter.out.getvalue()
+
+
+def _time(
+    run: Callable[[list[Stmt]], str],
+    statements: list[Stmt],
+    repeat: int,
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(statements)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    for name, source in SCRIPTS.items():
+        statements = parse(source)
+        if _run_resolved(statements) != _run_naive(statements):
+            print(f"{name}: outputs differ", file=sys.stderr)
+            sys.exit(1)
+
+        naive = _time(_run_naive, statements, repeat)
+        resolved = _time(_run_resolved, statements, repeat)
+        print(
+            f"{name:<10} naive {naive:>8.3f} s  resolved {resolved:>8.3f} s"
+            f"  speedup x{naive / resolved:.2f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""A straightforward tree-walking interpreter, kept as a benchmark baseline.
+
+Variables live in a chain of dictionaries searched by name, and nodes are
+dispatched with an `isinstance` chain. It ignores the resolver's slots and the
+inline caches: properties are looked up in the instance's fields and then
+through the chain of classes on every access, and every method call binds a
+new method object first.
+"""
+
+from __future__ import annotations
+
+import io
+from typing import Any, Self
+
+from plox.errors import LoxRuntimeError
+from plox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    Get,
+    Grouping,
+    Literal,
+    Logical,
+    Set,
+    Super,
+    This,
+    Unary,
+    Variable,
+)
+from plox.runtime import Clock, is_equal, is_truthy, stringify
+from plox.stmt import (
+    Block,
+    Class,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
+from plox.token_type import TokenType
+
+
+class _Environment:
+    def __init__(self: Self, enclosing: _Environment | None = None) -> None:
+        self.enclosing = enclosing
+        self.variables: dict[str, Any] = {}
+
+    def get(self: Self, name: str) -> Any:
+        environment: _Environment | None = self
+        while environment is not None:
+            if name in environment.variables:
+                return environment.variables[name]
+            environment = environment.enclosing
+
+        msg = f"Undefined variable '{name}'."
+        raise KeyError(msg)
+
+    def assign(self: Self, name: str, value: Any) -> None:
+        environment: _Environment | None = self
+        while environment is not None:
+            if name in environment.variables:
+                environment.variables[name] = value
+                return
+            environment = environment.enclosing
+
+        msg = f"Undefined variable '{name}'."
+        raise KeyError(msg)
+
+
+class _ReturnValue(Exception):  # noqa: N818
+    def __init__(self: Self, value: Any) -> None:
+        self.value = value
+
+
+class _Function:
+    def __init__(
+        self: Self,
+        declaration: Function,
+        closure: _Environment,
+        *,
+        is_initializer: bool = False,
+    ) -> None:
+        self.declaration = declaration
+        self.closure = closure
+        self.is_initializer = is_initializer
+
+    def bind(self: Self, instance: _Instance) -> _Function:
+        environment = _Environment(self.closure)
+        environment.variables["this"] = instance
+        return _Function(
+            self.declaration,
+            environment,
+            is_initializer=self.is_initializer,
+        )
+
+
+class _Class:
+    def __init__(
+        self: Self,
+        name: str,
+        superclass: _Class | None,
+        methods: dict[str, _Function],
+    ) -> None:
+        self.name = name
+        self.superclass = superclass
+        self.methods = methods
+
+    def find_method(self: Self, name: str) -> _Function | None:
+        klass: _Class | None = self
+        while klass is not None:
+            if name in klass.methods:
+                return klass.methods[name]
+            klass = klass.superclass
+
+        return None
+
+
+class _Instance:
+    def __init__(self: Self, klass: _Class) -> None:
+        self.klass = klass
+        self.fields: dict[str, Any] = {}
+
+    def get(self: Self, name: str) -> Any:
+        if name in self.fields:
+            return self.fields[name]
+
+        method = self.klass.find_method(name)
+        if method is None:
+            msg = f"Undefined property '{name}'."
+            raise KeyError(msg)
+
+        return method.bind(self)
+
+
+class NaiveInterpreter:
+    def __init__(self: Self) -> None:
+        self.out = io.StringIO()
+        self._globals = _Environment()
+        self._globals.variables["clock"] = Clock()
+        self._environment = self._globals
+
+    def interpret(self: Self, statements: list[Stmt]) -> None:
+        for statement in statements:
+            self._execute(statement)
+
+    def _execute(self: Self, statement: Stmt) -> None:
+        if isinstance(statement, Expression):
+            self._evaluate(statement.expression)
+        elif isinstance(statement, Print):
+            print(stringify(self._evaluate(statement.expression)), file=self.out)
+        elif isinstance(statement, Var):
+            value = None
+            if statement.initializer is not None:
+                value = self._evaluate(statement.initializer)
+            self._environment.variables[statement.name.lexeme] = value
+        elif isinstance(statement, Block):
+            self._execute_block(statement.statements, _Environment(self._environment))
+        elif isinstance(statement, If):
+            if is_truthy(self._evaluate(statement.condition)):
+                self._execute(statement.then_branch)
+            elif statement.else_branch is not None:
+                self._execute(statement.else_branch)
+        elif isinstance(statement, While):
+            while is_truthy(self._evaluate(statement.condition)):
+                self._execute(statement.body)
+        elif isinstance(statement, Function):
+            function = _Function(statement, self._environment)
+            self._environment.variables[statement.name.lexeme] = function
+        elif isinstance(statement, Class):
+            self._execute_class(statement)
+        elif isinstance(statement, Return):
+            value = None
+            if statement.value is not None:
+                value = self._evaluate(statement.value)
+            raise _ReturnValue(value)
+
+    def _execute_class(self: Self, statement: Class) -> None:
+        superclass = None
+        environment = self._environment
+        if statement.superclass is not None:
+            superclass = self._evaluate(statement.superclass)
+            environment = _Environment(environment)
+            environment.variables["super"] = superclass
+
+        methods = {
+            method.name.lexeme: _Function(
+                method,
+                environment,
+                is_initializer=method.name.lexeme == "init",
+            )
+            for method in statement.methods
+        }
+        klass = _Class(statement.name.lexeme, superclass, methods)
+        self._environment.variables[statement.name.lexeme] = klass
+
+    def _execute_block(
+        self: Self,
+        statements: list[Stmt],
+        environment: _Environment,
+    ) -> None:
+        previous = self._environment
+        try:
+            self._environment = environment
+            for statement in statements:
+                self._execute(statement)
+        finally:
+            self._environment = previous
+
+    def _evaluate(self: Self, expression: Expr) -> Any:  # noqa: PLR0911
+        if isinstance(expression, Literal):
+            return expression.value
+        if isinstance(expression, Grouping):
+            return self._evaluate(expression.expression)
+        if isinstance(expression, Variable):
+            return self._environment.get(expression.name.lexeme)
+        if isinstance(expression, Assign):
+            value = self._evaluate(expression.value)
+            self._environment.assign(expression.name.lexeme, value)
+            return value
+        if isinstance(expression, Logical):
+            left = self._evaluate(expression.left)
+            if expression.operator.type is TokenType.OR:
+                if is_truthy(left):
+                    return left
+            elif not is_truthy(left):
+                return left
+            return self._evaluate(expression.right)
+        if isinstance(expression, Unary):
+            right = self._evaluate(expression.right)
+            if expression.operator.type is TokenType.MINUS:
+                return -right
+            return not is_truthy(right)
+        if isinstance(expression, Binary):
+            return self._evaluate_binary(expression)
+        if isinstance(expression, Call):
+            return self._evaluate_call(expression)
+        if isinstance(expression, Get):
+            return self._evaluate(expression.object).get(expression.name.lexeme)
+        if isinstance(expression, Set):
+            instance = self._evaluate(expression.object)
+            value = self._evaluate(expression.value)
+            instance.fields[expression.name.lexeme] = value
+            return value
+        if isinstance(expression, This):
+            return self._environment.get("this")
+        if isinstance(expression, Super):
+            superclass = self._environment.get("super")
+            method = superclass.find_method(expression.method.lexeme)
+            return method.bind(self._environment.get("this"))
+
+        raise TypeError(expression)
+
+    def _evaluate_binary(self: Self, expression: Binary) -> Any:  # noqa: PLR0911
+        left = self._evaluate(expression.left)
+        right = self._evaluate(expression.right)
+
+        match expression.operator.type:
+            case TokenType.PLUS:
+                return left + right
+            case TokenType.MINUS:
+                return left - right
+            case TokenType.STAR:
+                return left * right
+            case TokenType.SLASH:
+                return left / right
+            case TokenType.GREATER:
+                return left > right
+            case TokenType.GREATER_EQUAL:
+                return left >= right
+            case TokenType.LESS:
+                return left < right
+            case TokenType.LESS_EQUAL:
+                return left <= right
+            case TokenType.EQUAL_EQUAL:
+                return is_equal(left, right)
+            case TokenType.BANG_EQUAL:
+                return not is_equal(left, right)
+
+        raise LoxRuntimeError(expression.operator.line, "Unknown operator.")
+
+    def _evaluate_call(self: Self, expression: Call) -> Any:
+        callee = self._evaluate(expression.callee)
+        arguments = [self._evaluate(argument) for argument in expression.arguments]
+
+        if isinstance(callee, _Class):
+            instance = _Instance(callee)
+            initializer = callee.find_method("init")
+            if initializer is not None:
+                self._call_function(initializer.bind(instance), arguments)
+            return instance
+
+        if not isinstance(callee, _Function):
+            return callee.call(self, arguments)
+
+        return self._call_function(callee, arguments)
+
+    def _call_function(self: Self, function: _Function, arguments: list[Any]) -> Any:
+        environment = _Environment(function.closure)
+        params = function.declaration.params
+        for param, argument in zip(params, arguments, strict=True):
+            environment.variables[param.lexeme] = argument
+
+        try:
+            self._execute_block(function.declaration.body, environment)
+        except _ReturnValue as returned:
+            if not function.is_initializer:
+                return returned.value
+
+        if function.is_initializer:
+            return function.closure.get("this")
+
+        return None
@@ -0,0 +1,106 @@
+"""Compare running templated scripts with and without the optimizer.
+
+Usage: python -m benchmarks.optimizer [--engines tree,vm] [--repeat N]
+
+The scripts look like generated code: constant arithmetic left in by a template
+and blocks behind flags that are switched off. Every script is parsed and
+resolved once per run, and only execution is timed; the time the optimizer
+itself takes is reported on its own.
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from typing import Final
+
+from benchmarks.vm import ENGINES
+from plox.errors import ListErrorReporter
+from plox.optimizer import Optimizer
+from plox.parser import Parser
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+from plox.stmt import Stmt
+
+SCRIPTS: Final = {
+    "constant_arithmetic": """
+var total = 0;
+for (var i = 0; i < 100000; i = i + (2 - 1)) {
+    total = total + i * (60 * 60 * 24) / (1000 * 1000) - (3 + 4 * 2);
+}
+print total;
+""",
+    "disabled_blocks": """
+var total = 0;
+for (var i = 0; i < 100000; i = i + 1) {
+    if (false) { print "trace: " + "iteration"; }
+    if (!true) { total = total - 1; }
+    if ("debug" == "release") print "debug build";
+    while (1 > 2) print "never";
+    total = total + 1;
+}
+print total;
+""",
+    "feature_flags": """
+fun step(value) {
+    if (nil) return value * 2;
+    if (true and "feature enabled" != "") return value + (1 + 1);
+    return value;
+}
+var total = 0;
+for (var i = 0; i < 50000; i = i + 1) total = step(total);
+print total;
+""",
+}
+
+
+def _parse(source: str) -> list[Stmt]:
+    error_reporter = ListErrorReporter()
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    if error_reporter.had_error:
+        raise SyntaxError(error_reporter.errors)
+
+    return statements
+
+
+def _time(run: Callable[[list[Stmt]], str], statements: list[Stmt]) -> float:
+    start = time.perf_counter()
+    run(statements)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmarks.optimizer")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, source in SCRIPTS.items():
+        for engine in args.engines.split(","):
+            run = ENGINES[engine]
+            if run(_parse(source)) != run(Optimizer().optimize(_parse(source))):
+                print(f"{name}: outputs differ", file=sys.stderr)
+                sys.exit(1)
+
+            plain = min(_time(run, _parse(source)) for _ in range(args.repeat))
+            optimized = []
+            optimize = []
+            for _ in range(args.repeat):
+                statements = _parse(source)
+                start = time.perf_counter()
+                statements = Optimizer().optimize(statements)
+                optimize.append(time.perf_counter() - start)
+                optimized.append(_time(run, statements))
+
+            print(
+                f"{name:<20} {engine:<5} plain {plain:>7.3f} s"
+                f"  optimized {min(optimized):>7.3f} s"
+                f"  speedup x{plain / min(optimized):.2f}"
+                f"  (optimizing {min(optimize) * 1000:.2f} ms)",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Time deep, tail and mutual recursion on both engines.
+
+Usage: python -m benchmarks.recursion [--engines tree,vm] [--scripts ...]
+                                      [--depth N] [--repeat N]
+
+The tree-walking interpreter recurses in Python for every Lox call, so it
+overflows long before the VM, whose frames live on an explicit stack bounded
+by its call depth limit, set here just above the depth of the scripts. Tail
+calls reuse the frame of their caller on the VM, so the tail and mutual
+scripts run in constant space there, and are best compared with the loop.
+"""
+
+import argparse
+import io
+import sys
+import time
+from collections.abc import Callable
+from typing import Final
+
+from benchmarks.vm import _parse
+from plox.compiler import Compiler
+from plox.errors import ListErrorReporter
+from plox.interpreter import Interpreter
+from plox.limits import Limits
+from plox.stmt import Stmt
+from plox.vm import VM
+
+SCRIPTS: Final = {
+    "deep": """
+fun sum(n) { if (n == 0) return 0; return n + sum(n - 1); }
+print sum(DEPTH);
+""",
+    "tail": """
+fun sum(n, total) { if (n == 0) return total; return sum(n - 1, total + n); }
+print sum(DEPTH, 0);
+""",
+    "mutual": """
+fun even(n) { if (n == 0) return true; return odd(n - 1); }
+fun odd(n) { if (n == 0) return false; return even(n - 1); }
+print even(DEPTH);
+""",
+    "loop": """
+var total = 0;
+for (var n = DEPTH; n > 0; n = n - 1) total = total + n;
+print total;
+""",
+}
+
+
+def _run_tree(statements: list[Stmt], _depth: int) -> tuple[str, list[str]]:
+    out = io.StringIO()
+    error_reporter = ListErrorReporter()
+    Interpreter(error_reporter, out).interpret(statements)
+    return out.getvalue(), error_reporter.errors
+
+
+def _run_vm(statements: list[Stmt], depth: int) -> tuple[str, list[str]]:
+    out = io.StringIO()
+    error_reporter = ListErrorReporter()
+    function = Compiler(error_reporter).compile(statements)
+    limits = Limits(max_call_depth=depth + 1)
+    VM(error_reporter, out, limits=limits).interpret(function)
+    return out.getvalue(), error_reporter.errors
+
+
+ENGINES: Final[dict[str, Callable[[list[Stmt], int], tuple[str, list[str]]]]] = {
+    "tree": _run_tree,
+    "vm": _run_vm,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmarks.recursion")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--scripts", default=",".join(SCRIPTS))
+    parser.add_argument("--depth", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name in args.scripts.split(","):
+        statements = _parse(SCRIPTS[name].replace("DEPTH", str(args.depth)))
+        outputs = set()
+        for engine in args.engines.split(","):
+            runs = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                output, errors = ENGINES[engine](statements, args.depth)
+                runs.append(time.perf_counter() - start)
+
+            if errors:
+                error = errors[0].splitlines()[0]
+                print(f"{name:<7} {engine:<5} {error}")
+                continue
+
+            outputs.add(output)
+            print(f"{name:<7} {engine:<5} {min(runs) * 1e3:>9.2f} ms")
+
+        if len(outputs) > 1:
+            print(f"{name}: outputs differ", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Run the scanner and CLI benchmarks and save the results as JSON.
+
+Usage: python -m benchmarks.run [--sizes 16KB,1MB] [--shapes strings,...]
+                                [--output PATH] [--compare BASELINE]
+
+Every benchmark runs in a fresh process, so that its peak RSS is its own.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import pathlib
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any, Final
+
+from benchmarks.corpora import SHAPES, generate, parse_size
+from plox.__main__ import Lox
+from plox.batch import scan_file_parallel
+from plox.errors import ListErrorReporter
+from plox.scanner import Scanner
+from plox.token_format import load_tokens
+
+_DEFAULT_SIZES: Final = "16KB,1MB,16MB"
+_RESULTS_DIRECTORY: Final = pathlib.Path(__file__).parent / "results"
+
+
+def _scan_tokens(path: pathlib.Path) -> Callable[[], object]:
+    source = path.read_text()
+    return lambda: Scanner(source, ListErrorReporter()).scan_tokens()
+
+
+def _scan_parallel(path: pathlib.Path) -> Callable[[], object]:
+    return lambda: scan_file_parallel(path, ListErrorReporter())
+
+
+def _load_tokens(path: pathlib.Path) -> Callable[[], object]:
+    # The tokens are dumped by another process, so that scanning them does not
+    # count towards the peak RSS of loading them.
+    data = subprocess.run(  # noqa: S603
+        [sys.executable, "-m", "plox", "--emit-tokens", str(path)],
+        check=True,
+        capture_output=True,
+    ).stdout
+    return lambda: list(load_tokens(data))
+
+
+def _run_file(path: pathlib.Path) -> Callable[[], object]:
+    return lambda: Lox(ListErrorReporter()).run_file(str(path))
+
+
+_TARGETS: Final[dict[str, Callable[[pathlib.Path], Callable[[], object]]]] = {
+    "scan_tokens": _scan_tokens,
+    "scan_parallel": _scan_parallel,
+    "load_tokens": _load_tokens,
+    "run_file": _run_file,
+}
+
+
+def _peak_rss() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _measure(target: str, shape: str, size: int, repeat: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / f"{shape}.lox"
+        source = generate(shape, size)
+        path.write_text(source)
+
+        benchmark = _TARGETS[target](path)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            benchmark()
+            timings.append(time.perf_counter() - start)
+
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        result = benchmark()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        retained_blocks = sys.getallocatedblocks() - blocks_before
+        del result
+        peak_rss = _peak_rss()
+
+        # Counted only now, as the peak RSS never goes back down.
+        token_count = len(Scanner(path.read_text(), ListErrorReporter()).scan_tokens())
+
+    elapsed = min(timings)
+    return {
+        "target": target,
+        "shape": shape,
+        "size": len(source),
+        "tokens": token_count,
+        "seconds": elapsed,
+        "tokens_per_second": token_count / elapsed,
+        "bytes_per_second": len(source) / elapsed,
+        "traced_peak_bytes": traced_peak,
+        "retained_blocks": retained_blocks,
+        "peak_rss_bytes": peak_rss,
+    }
+
+
+def _run_in_subprocess(
+    target: str,
+    shape: str,
+    size: int,
+    repeat: int,
+) -> dict[str, Any]:
+    output = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.run",
+            "--worker",
+            target,
+            shape,
+            str(size),
+            str(repeat),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results: list[dict[str, Any]], baseline_path: str) -> None:
+    baseline = {
+        (result["target"], result["shape"], result["size"]): result
+        for result in json.loads(pathlib.Path(baseline_path).read_text())["results"]
+    }
+
+    for result in results:
+        previous = baseline.get((result["target"], result["shape"], result["size"]))
+        if previous is None:
+            continue
+
+        speedup = result["tokens_per_second"] / previous["tokens_per_second"]
+        memory = result["peak_rss_bytes"] / previous["peak_rss_bytes"]
+        print(
+            f"{result['target']:<12} {result['shape']:<12} {result['size']:>12,}"
+            f"  speed x{speedup:.2f}  peak RSS x{memory:.2f}",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmarks.run")
+    parser.add_argument("--sizes", default=_DEFAULT_SIZES)
+    parser.add_argument("--shapes", default=",".join(SHAPES))
+    parser.add_argument("--targets", default=",".join(_TARGETS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output")
+    parser.add_argument("--compare", metavar="BASELINE")
+    parser.add_argument("--worker", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        target, shape, size, repeat = args.worker
+        print(json.dumps(_measure(target, shape, int(size), int(repeat))))
+        return
+
+    results = []
+    for target in args.targets.split(","):
+        for shape in args.shapes.split(","):
+            for size in args.sizes.split(","):
+                result = _run_in_subprocess(
+                    target,
+                    shape,
+                    parse_size(size),
+                    args.repeat,
+                )
+                results.append(result)
+                print(
+                    f"{target:<12} {shape:<12} {result['size']:>12,} "
+                    f"{result['tokens_per_second']:>14,.0f} tokens/s "
+                    f"{result['peak_rss_bytes'] / 1024**2:>10,.1f} MiB peak RSS",
+                )
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.datetime.now(tz=datetime.UTC).isoformat(),
+        "results": results,
+    }
+
+    output = (
+        pathlib.Path(args.output)
+        if args.output is not None
+        else _RESULTS_DIRECTORY / f"{commit or 'unknown'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results saved to {output}.")
+
+    if args.compare is not None:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
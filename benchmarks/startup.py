@@ -0,0 +1,57 @@
+"""Measure how long running a tiny script takes, next to a bare Python startup.
+
+Usage: python -m benchmarks.startup [--repeat N] [--budget MS]
+
+The difference between the two is what plox adds to every invocation: importing
+its modules and running the script. It is checked against a budget, and the
+command fails when the budget is exceeded.
+"""
+
+import argparse
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Final
+
+SCRIPT: Final = "var a = 1;\nprint a + 2;\n"
+
+# Milliseconds plox may add to a bare Python startup.
+DEFAULT_BUDGET: Final = 60.0
+
+
+def _best_of(command: list[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)  # noqa: S603
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmarks.startup")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "script.lox"
+        path.write_text(SCRIPT)
+
+        python = _best_of([sys.executable, "-c", "pass"], args.repeat)
+        plox = _best_of([sys.executable, "-m", "plox", str(path)], args.repeat)
+
+    overhead = (plox - python) * 1000
+    print(f"python -c pass  {python * 1000:>8.1f} ms")
+    print(f"python -m plox  {plox * 1000:>8.1f} ms")
+    print(f"overhead        {overhead:>8.1f} ms (budget {args.budget:.1f} ms)")
+
+    if overhead > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
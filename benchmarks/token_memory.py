@@ -0,0 +1,49 @@
+"""Compare the memory used by `list[Token]` and `TokenStream`.
+
+Usage: python -m benchmarks.token_memory [REPEAT]
+"""
+
+import sys
+import tracemalloc
+
+from plox.errors import ListErrorReporter
+from plox.scanner import Scanner, ScannerEngine
+
+_SNIPPET = """
+var greeting = "hello";
+fun add(first, second) {
+    // Adds two numbers.
+    return first + second * 12.5;
+}
+/* A loop
+   over ten numbers. */
+for (var i = 0; i <= 10; i = i + 1) {
+    print add(i, 2) != greeting;
+}
+"""
+
+
+def _measure(source: str, *, compact: bool) -> tuple[int, int]:
+    tracemalloc.start()
+    scanner = Scanner(source, ListErrorReporter(), ScannerEngine.REGEX)
+    tokens = scanner.scan_token_stream() if compact else scanner.scan_tokens()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(tokens), current
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    source = _SNIPPET * repeat
+
+    print(f"source: {len(source):,} characters")
+    for name, compact in (("list[Token]", False), ("TokenStream", True)):
+        count, size = _measure(source, compact=compact)
+        print(
+            f"{name:<12} {count:>10,} tokens {size:>14,} bytes "
+            f"{size / count:>7.1f} bytes/token",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare the tree-walking interpreter with the bytecode VM.
+
+Usage: python -m benchmarks.vm [--engines tree,vm] [--scripts fib,...]
+                               [--repeat N]
+"""
+
+import argparse
+import io
+import sys
+import time
+from collections.abc import Callable
+from typing import Final
+
+from plox.compiler import Compiler
+from plox.errors import ListErrorReporter
+from plox.interpreter import Interpreter
+from plox.parser import Parser
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+from plox.stmt import Stmt
+from plox.vm import VM
+
+SCRIPTS: Final = {
+    "fib": """
+fun fib(n) {
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}
+print fib(30);
+""",
+    "nested_loops": """
+var total = 0;
+for (var i = 0; i < 1000; i = i + 1) {
+    for (var j = 0; j < 1000; j = j + 1) {
+        total = total + i * j - j;
+    }
+}
+print total;
+""",
+    "string_concatenation": """
+var text = "";
+for (var i = 0; i < 100000; i = i + 1) {
+    text = text + "lox";
+    if (i == 50000) text = "";
+}
+print text == "";
+""",
+}
+
+
+def _parse(source: str) -> list[Stmt]:
+    error_reporter = ListErrorReporter()
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    if error_reporter.had_error:
+        raise SyntaxError(error_reporter.errors)
+
+    return statements
+
+
+def _run_tree(statements: list[Stmt]) -> str:
+    out = io.StringIO()
+    Interpreter(ListErrorReporter(), out).interpret(statements)
+    return out.getvalue()
+
+
+def _run_vm(statements: list[Stmt]) -> str:
+    out = io.StringIO()
+    function = Compiler(ListErrorReporter()).compile(statements)
+    VM(ListErrorReporter(), out).interpret(function)
+    return out.getvalue()
+
+
+ENGINES: Final[dict[str, Callable[[list[Stmt]], str]]] = {
+    "tree": _run_tree,
+    "vm": _run_vm,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("benchmarks.vm")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--scripts", default=",".join(SCRIPTS))
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    for name in args.scripts.split(","):
+        statements = _parse(SCRIPTS[name])
+
+        outputs = set()
+        for engine in args.engines.split(","):
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                outputs.add(ENGINES[engine](statements))
+                timings.append(time.perf_counter() - start)
+
+            print(f"{name:<22} {engine:<6} {min(timings):>8.3f} s")
+
+        if len(outputs) > 1:
+            print(f"{name}: outputs differ", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
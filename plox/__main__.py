@@ -1,18 +1,118 @@
-import argparse
+from __future__ import annotations
+
 import os
-import pathlib
 import sys
-from typing import Self
+from typing import TYPE_CHECKING, Final, Self
+
+from plox.errors import ErrorReporter, TextErrorReporter
+from plox.interner import Interner
+from plox.limits import DEFAULT_MAX_CALL_DEPTH, Limits
+from plox.optimizer import Optimizer
+from plox.pipeline import Engine, compile_program, run_phase
+from plox.scanner import Scanner, scan_file
+
+# Only what running a script needs is imported up front. The bytecode compiler,
+# the token cache, profiling, batch tokenizing and argument parsing pull in
+# modules that take longer to import than a small script takes to run, so they
+# are imported when they are used.
+if TYPE_CHECKING:
+    import argparse
+    from collections.abc import Iterable
 
-from plox.errors import ErrorReporter
+    from plox.chunk import CompiledFunction
+    from plox.interpreter import Interpreter
+    from plox.profiling import Profile
+    from plox.program_cache import ProgramCache
+    from plox.stmt import Stmt
+    from plox.token import Token
+    from plox.token_cache import TokenCache
+    from plox.vm import VM
+
+
+# Scanner errors reported before the command line gives up on a script, so that
+# a binary or corrupt file does not flood the terminal.
+DEFAULT_MAX_ERRORS: Final = 100
 
 
 class Lox:
-    def __init__(self: Self, error_reporter: ErrorReporter) -> None:
+    # The options are keyword-only and default to a plain run, so callers name
+    # just the few they change rather than filling in a group of them.
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        error_reporter: ErrorReporter,
+        *,
+        memory_map: bool = False,
+        token_cache: TokenCache | None = None,
+        program_cache: ProgramCache | None = None,
+        engine: Engine = Engine.TREE,
+        profile: Profile | None = None,
+        max_errors: int | None = None,
+        optimize: bool = True,
+        limits: Limits | None = None,
+    ) -> None:
         self._error_reporter = error_reporter
+        self._memory_map = memory_map
+        self._token_cache = token_cache
+        # Only bytecode is stored, so the cache is only used by the VM.
+        self._program_cache = program_cache if engine is Engine.VM else None
+        self._engine = engine
+        self._profile = profile
+        self._max_errors = max_errors
+        self._optimize = optimize
+        # Every run gets the same limits, reported as runtime errors.
+        self._limits = Limits() if limits is None else limits
+        self._optimizer = (
+            Optimizer(max_string_length=self._limits.max_string_length)
+            if optimize is True
+            else None
+        )
+        # Shared by every run, so the prompt reuses the names seen before.
+        self._interner = Interner()
+        self._runtime = self._create_runtime()
+
+    def _create_runtime(self: Self) -> Interpreter | VM:
+        if self._engine is Engine.VM:
+            from plox.vm import VM
+
+            return VM(self._error_reporter, limits=self._limits)
+
+        from plox.interpreter import Interpreter
+
+        return Interpreter(self._error_reporter, limits=self._limits)
 
     def run_file(self: Self, path: str) -> None:
-        self.run(pathlib.Path(path).read_text())
+        # Exits with a non-zero status if the script fails.
+        status = self._run_file(path)
+        if status != os.EX_OK:
+            sys.exit(status)
+
+    def _run_file(self: Self, path: str) -> int:
+        if self._program_cache is not None:
+            with open(path, errors="surrogateescape") as file:  # noqa: PTH123
+                return self._run_cached(file.read(), self._program_cache)
+
+        if self._token_cache is not None:
+            with open(path, errors="surrogateescape") as file:  # noqa: PTH123
+                source = file.read()
+            return self._run_tokens(
+                self._token_cache.scan(source, self._error_reporter),
+            )
+
+        if self._memory_map is True:
+            return self._run_tokens(
+                scan_file(
+                    path,
+                    self._error_reporter,
+                    self._profile,
+                    max_errors=self._max_errors,
+                ),
+            )
+
+        # The file is scanned as it is read, without loading it whole. A plain
+        # `open` keeps pathlib off the startup path. Bytes that are not valid
+        # UTF-8 are decoded into characters that the scanner reports.
+        with open(path, errors="surrogateescape") as file:  # noqa: PTH123
+            return self.run(file)
 
     def run_prompt(self: Self) -> None:
         while True:
@@ -21,25 +121,277 @@ class Lox:
             except EOFError:
                 break
 
+            # An error only ends the line it is on.
             self.run(line)
             self._error_reporter.had_error = False
+            self._error_reporter.had_runtime_error = False
+
+    def run(self: Self, source: str | Iterable[str]) -> int:
+        # Returns the status to exit with: EX_DATAERR if the source does not
+        # compile, EX_SOFTWARE if it fails at runtime and EX_OK otherwise.
+        return self._run_tokens(self._scan(source))
+
+    def _scan(self: Self, source: str | Iterable[str]) -> Iterable[Token]:
+        return Scanner(
+            source,
+            self._error_reporter,
+            interner=self._interner,
+            profile=self._profile,
+            max_errors=self._max_errors,
+        ).iter_tokens()
+
+    def _run_tokens(self: Self, tokens: Iterable[Token]) -> int:
+        try:
+            program = self._compile(tokens)
+            if program is None:
+                return os.EX_DATAERR
+
+            return self._execute(program)
+        finally:
+            self._error_reporter.flush()
+
+    def _run_cached(self: Self, source: str, program_cache: ProgramCache) -> int:
+        # Programs that fail to compile are not stored, and are compiled again
+        # on every run.
+        try:
+            function = run_phase(
+                self._profile,
+                "load",
+                program_cache.load,
+                source,
+                optimize=self._optimize,
+                max_string_length=self._limits.max_string_length,
+            )
+            if function is None:
+                tokens: Iterable[Token]
+                if self._token_cache is not None:
+                    tokens = self._token_cache.scan(source, self._error_reporter)
+                else:
+                    tokens = self._scan(source)
+                function = self._compile(tokens)
+                if function is None:
+                    return os.EX_DATAERR
+
+                program_cache.store(
+                    source,
+                    function,
+                    optimize=self._optimize,
+                    max_string_length=self._limits.max_string_length,
+                )
+
+            return self._execute(function)
+        finally:
+            self._error_reporter.flush()
+
+    def _compile(
+        self: Self,
+        tokens: Iterable[Token],
+    ) -> list[Stmt] | CompiledFunction | None:
+        return compile_program(
+            tokens,
+            self._error_reporter,
+            self._engine,
+            self._optimizer,
+            self._profile,
+        )
+
+    def _execute(self: Self, program: list[Stmt] | CompiledFunction) -> int:
+        run_phase(self._profile, "execute", self._runtime.interpret, program)
+        if self._error_reporter.had_runtime_error is True:
+            return os.EX_SOFTWARE
+
+        return os.EX_OK
 
-    def run(self: Self, _: str) -> None:
-        if self._error_reporter.had_error is True:
-            sys.exit(os.EX_DATAERR)
+
+def tokenize(path: str, jobs: int | None) -> None:
+    from plox.batch import find_scripts, tokenize_files
+
+    had_error = False
+    for result in tokenize_files(find_scripts(path), jobs):
+        print(f"{result.path}: {len(result.tokens)} tokens")
+        for error in result.errors:
+            print(f"{result.path}: {error}", file=sys.stderr)
+
+        had_error = had_error or len(result.errors) > 0
+
+    if had_error is True:
+        sys.exit(os.EX_DATAERR)
+
+
+def emit_tokens(path: str, max_errors: int | None) -> None:
+    from plox.token_format import dump_tokens
+
+    error_reporter = TextErrorReporter(sys.stderr)
+    with open(path, errors="surrogateescape") as file:  # noqa: PTH123
+        scanner = Scanner(file, error_reporter, max_errors=max_errors)
+        data = dump_tokens(scanner.iter_tokens())
+    error_reporter.flush()
+
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+
+    if error_reporter.had_error is True:
+        sys.exit(os.EX_DATAERR)
 
 
 def main() -> None:
+    # Running a single script with the default options is by far the most
+    # common invocation, and it does not need argparse.
+    if len(sys.argv) == 2 and not sys.argv[1].startswith("-"):  # noqa: PLR2004
+        lox = Lox(TextErrorReporter(sys.stderr), max_errors=DEFAULT_MAX_ERRORS)
+        lox.run_file(sys.argv[1])
+        return
+
+    _run(_parse_arguments())
+
+
+def _parse_arguments() -> argparse.Namespace:
+    import argparse
+
     parser = argparse.ArgumentParser("plox")
     parser.add_argument("script", nargs="?")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="scan the script through a memory map",
+    )
+    parser.add_argument(
+        "--token-cache",
+        metavar="DIR",
+        help="reuse the tokens of unchanged scripts stored in a directory",
+    )
+    parser.add_argument(
+        "--program-cache",
+        metavar="DIR",
+        help="reuse the bytecode of unchanged scripts stored in a directory (VM only)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=[engine.value for engine in Engine],
+        default=Engine.TREE.value,
+        help="execute scripts with the tree-walking interpreter or the bytecode VM",
+    )
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        help="stop a script after this many loop iterations and calls",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="stop a script that runs longer than this",
+    )
+    parser.add_argument(
+        "--max-string-length",
+        type=int,
+        help="fail on building strings longer than this many characters",
+    )
+    parser.add_argument(
+        "--max-call-depth",
+        type=int,
+        default=DEFAULT_MAX_CALL_DEPTH,
+        help=(
+            "fail with a stack overflow beyond this many nested calls "
+            f"(default: {DEFAULT_MAX_CALL_DEPTH})"
+        ),
+    )
+    parser.add_argument(
+        "--max-allocations",
+        type=int,
+        help="stop a script after it creates this many objects and strings",
+    )
+    parser.add_argument(
+        "--no-optimize",
+        dest="optimize",
+        action="store_false",
+        help="run scripts without folding constants and removing dead code",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print where the time went to stderr once the script has run",
+    )
+    parser.add_argument(
+        "--tokenize",
+        metavar="PATH",
+        help="only tokenize a script, or every .lox file in a directory",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="number of processes to tokenize with (default: CPU count)",
+    )
+    parser.add_argument(
+        "--emit-tokens",
+        metavar="PATH",
+        help="write the tokens of a script to stdout in the binary token format",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=DEFAULT_MAX_ERRORS,
+        help=(
+            "stop scanning after this many errors, or never with 0 "
+            f"(default: {DEFAULT_MAX_ERRORS})"
+        ),
+    )
+    return parser.parse_args()
+
+
+def _run(args: argparse.Namespace) -> None:
+    if args.tokenize is not None:
+        tokenize(args.tokenize, args.jobs)
+        return
+
+    if args.emit_tokens is not None:
+        emit_tokens(args.emit_tokens, args.max_errors or None)
+        return
+
+    profile = None
+    if args.profile is True:
+        from plox.profiling import Profile
+
+        profile = Profile()
+
+    token_cache = None
+    if args.token_cache is not None:
+        from plox.token_cache import TokenCache
+
+        token_cache = TokenCache(args.token_cache)
+
+    program_cache = None
+    if args.program_cache is not None:
+        from plox.program_cache import ProgramCache
+
+        program_cache = ProgramCache(args.program_cache)
 
-    lox = Lox()
+    lox = Lox(
+        TextErrorReporter(sys.stderr),
+        memory_map=args.mmap,
+        token_cache=token_cache,
+        program_cache=program_cache,
+        engine=Engine(args.engine),
+        profile=profile,
+        max_errors=args.max_errors or None,
+        optimize=args.optimize,
+        limits=Limits(
+            max_steps=args.max_steps,
+            timeout=args.timeout,
+            max_string_length=args.max_string_length,
+            max_call_depth=args.max_call_depth,
+            max_allocations=args.max_allocations,
+        ),
+    )
 
-    if args.script is not None:
-        lox.run_file(args.script)
-    else:
-        lox.run_prompt()
+    try:
+        if args.script is not None:
+            lox.run_file(args.script)
+        else:
+            lox.run_prompt()
+    finally:
+        if profile is not None:
+            print(profile.report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+import asyncio
+import functools
+import io
+from concurrent.futures import Executor, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Final, Self
+
+from plox.chunk import CompiledFunction
+from plox.embedded import RunResult
+from plox.errors import ListErrorReporter
+from plox.interner import Interner
+from plox.interpreter import Interpreter
+from plox.limits import Limits
+from plox.optimizer import Optimizer
+from plox.pipeline import Engine, compile_program
+from plox.runtime import Clock
+from plox.scanner import Scanner
+from plox.vm import VM
+
+_DEFAULT_MAX_WORKERS: Final = 4
+
+
+class LoxSession:
+    # A sequence of runs sharing global variables, like the lines of a prompt.
+    # Every run reports to its own error reporter, and runs of one session
+    # never overlap.
+    def __init__(
+        self: Self,
+        engine: Engine,
+        executor: Executor,
+        limits: Limits | None = None,
+    ) -> None:
+        self._engine = engine
+        self._executor = executor
+        self._limits = limits
+        self._optimizer = Optimizer(
+            max_string_length=None if limits is None else limits.max_string_length,
+        )
+        self._globals: dict[str, Any] = {"clock": Clock()}
+        self._interner = Interner()
+        self._lock = asyncio.Lock()
+
+    async def run_source(self: Self, source: str) -> RunResult:
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                functools.partial(self._run, source),
+            )
+
+    def _run(self: Self, source: str) -> RunResult:
+        error_reporter = ListErrorReporter()
+        out = io.StringIO()
+
+        tokens = Scanner(source, error_reporter, interner=self._interner).iter_tokens()
+        program = compile_program(tokens, error_reporter, self._engine, self._optimizer)
+        if type(program) is CompiledFunction:
+            vm = VM(error_reporter, out, limits=self._limits)
+            vm.globals = self._globals
+            vm.interpret(program)
+        elif program is not None:
+            interpreter = Interpreter(error_reporter, out, limits=self._limits)
+            interpreter.globals = self._globals
+            interpreter.interpret(program)
+
+        return RunResult(
+            output=out.getvalue(),
+            errors=error_reporter.errors,
+            had_error=error_reporter.had_error,
+            had_runtime_error=error_reporter.had_runtime_error,
+        )
+
+
+class AsyncLox:
+    # Runs Lox from asyncio code. Scanning and execution happen on a bounded
+    # pool of worker threads, so that long runs do not block the event loop,
+    # and at most `max_workers` runs are in progress at a time.
+    def __init__(
+        self: Self,
+        *,
+        engine: Engine = Engine.TREE,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        limits: Limits | None = None,
+    ) -> None:
+        self._engine = engine
+        # A worker stuck in a script can't be stopped from outside, so limits
+        # are what keeps one from hanging.
+        self._limits = limits
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="plox",
+        )
+
+    async def __aenter__(self: Self) -> Self:
+        return self
+
+    async def __aexit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self: Self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def session(self: Self) -> LoxSession:
+        return LoxSession(self._engine, self._executor, self._limits)
+
+    async def run_source(self: Self, source: str) -> RunResult:
+        # Runs `source` in a session of its own.
+        return await self.session().run_source(source)
+
+    async def serve_repl(
+        self: Self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        # Serves a prompt over a pair of streams, e.g. as the client callback
+        # of `asyncio.start_server`. Every connection gets its own session.
+        session = self.session()
+        try:
+            while True:
+                writer.write(b"> ")
+                await writer.drain()
+
+                line = await reader.readline()
+                if not line:
+                    break
+
+                result = await session.run_source(line.decode())
+                writer.write(result.output.encode())
+                for error in result.errors:
+                    writer.write(f"{error}\n".encode())
+        finally:
+            writer.close()
+            await writer.wait_closed()
@@ -0,0 +1,250 @@
+import itertools
+import os
+import pathlib
+import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Final
+
+from plox.errors import Diagnostic, ErrorReporter, ListErrorReporter
+from plox.scanner import Scanner, ScannerEngine
+from plox.span import LineIndex
+from plox.token_stream import TokenStream
+from plox.token_type import TokenType
+
+# Bytes a process scans at least when a single file is split between several.
+_MIN_CHUNK_SIZE: Final = 1 << 20
+
+# The errors a scan only reports at the end of its source, when it is in the
+# middle of a string or comment there.
+_UNTERMINATED: Final = frozenset({"Unterminated string.", "Unterminated comment."})
+
+# Skips text made of closed strings and comments and anything else. Where the
+# match ends, an unterminated string or comment begins.
+_CLOSED_LEXEMES: Final = re.compile(
+    r'(?:[^"/]++|"[^"]*"|//[^\n]*|/\*.*?\*/|/(?![/*]))*+',
+    re.DOTALL,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FileTokens:
+    path: pathlib.Path
+    tokens: TokenStream
+    errors: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class _ChunkTokens:
+    # The columns of a token stream, without EOF, and the errors of a chunk
+    # scanned on its own, as if it were a whole source.
+    columns: tuple[bytes, bytes, bytes, bytes]
+    diagnostics: list[Diagnostic]
+    length: int
+    newlines: int
+    # The offset and line of a string or comment still open at the end.
+    open_start: int | None
+    open_line: int
+
+
+def find_scripts(path: str | pathlib.Path) -> list[pathlib.Path]:
+    path = pathlib.Path(path)
+    if path.is_dir():
+        return sorted(path.rglob("*.lox"))
+
+    return [path]
+
+
+def tokenize_files(
+    paths: Iterable[str | pathlib.Path],
+    jobs: int | None = None,
+) -> list[FileTokens]:
+    # Results come in the order of `paths`, however many processes are used.
+    paths = [pathlib.Path(path) for path in paths]
+    if len(paths) == 1:
+        # A single file is split between the processes instead.
+        error_reporter = ListErrorReporter()
+        tokens = scan_file_parallel(paths[0], error_reporter, jobs)
+        return [FileTokens(paths[0], tokens, error_reporter.errors)]
+
+    jobs = min(jobs or os.cpu_count() or 1, len(paths))
+
+    if jobs <= 1:
+        return [_tokenize_file(path) for path in paths]
+
+    # Hand out several files at once to amortize the inter-process calls,
+    # while leaving enough batches to balance the load.
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_tokenize_file, paths, chunksize=chunksize))
+
+
+def _tokenize_file(path: pathlib.Path) -> FileTokens:
+    # The token stream travels back to the parent process as a handful of
+    # byte strings rather than one pickled `Token` per token.
+    error_reporter = ListErrorReporter()
+    tokens = Scanner(
+        source=path.read_text(errors="surrogateescape"),
+        error_reporter=error_reporter,
+        engine=ScannerEngine.REGEX,
+    ).scan_token_stream()
+    return FileTokens(path=path, tokens=tokens, errors=error_reporter.errors)
+
+
+def scan_file_parallel(
+    path: str | pathlib.Path,
+    error_reporter: ErrorReporter,
+    jobs: int | None = None,
+    *,
+    max_errors: int | None = None,
+    min_chunk_size: int = _MIN_CHUNK_SIZE,
+) -> TokenStream:
+    # Scans a UTF-8 file split into chunks, one per process, and returns the
+    # same tokens and reports the same errors as scanning it whole would. The
+    # file is read with universal newlines, like `Path.read_text`.
+    #
+    # Chunks start behind a newline, where no lexeme but a string or a comment
+    # can be in progress. Each is scanned as if none was, and lines and offsets
+    # are moved into place afterwards. A chunk that turns out to start inside a
+    # string or comment is scanned again from where that lexeme starts.
+    path = pathlib.Path(path)
+    data = path.read_bytes()
+    source = _decode(data)
+    bounds = _chunk_bounds(data, jobs or os.cpu_count() or 1, min_chunk_size)
+    if len(bounds) <= 2:  # noqa: PLR2004
+        return _scan_sequentially(source, error_reporter, max_errors)
+
+    with ProcessPoolExecutor(max_workers=len(bounds) - 1) as executor:
+        chunks = list(
+            executor.map(_scan_chunk, itertools.repeat(path), bounds, bounds[1:]),
+        )
+
+    tokens = TokenStream(source)
+    diagnostics: list[Diagnostic] = []
+    offset = 0
+    line = 1
+    open_start: int | None = None
+    open_line = 0
+    # Built once an error needs placing.
+    line_index: LineIndex | None = None
+    for chunk in chunks:
+        end = offset + chunk.length
+        if open_start is None:
+            result, start, start_line = chunk, offset, line
+        else:
+            # The unterminated error of the previous chunk was premature.
+            diagnostics.pop()
+            result = _scan_text(source[open_start:end])
+            start, start_line = open_start, open_line
+
+        chunk_tokens = TokenStream("", result.columns)
+        tokens.extend_from(
+            chunk_tokens,
+            0,
+            len(chunk_tokens),
+            offset_shift=start,
+            line_shift=start_line - 1,
+        )
+        for diagnostic in result.diagnostics:
+            span = diagnostic.span
+            if span is not None:
+                if line_index is None:
+                    line_index = LineIndex(source)
+                span = line_index.span(span.start + start, span.end + start)
+
+            diagnostics.append(
+                Diagnostic(
+                    diagnostic.line + start_line - 1,
+                    diagnostic.message,
+                    span=span,
+                ),
+            )
+
+        open_start = None
+        if result.open_start is not None:
+            open_start = start + result.open_start
+            open_line = start_line + result.open_line - 1
+
+        offset = end
+        line += chunk.newlines
+
+    if max_errors is not None and len(diagnostics) > max_errors:
+        # Where a capped scan stops depends on the errors before, so it is
+        # left to a sequential scan. Sources with that many errors are rare.
+        return _scan_sequentially(source, error_reporter, max_errors)
+
+    for diagnostic in diagnostics:
+        error_reporter.error(diagnostic.line, diagnostic.message, diagnostic.span)
+
+    tokens.append(TokenType.EOF, len(source), 0, line)
+    return tokens
+
+
+def _decode(data: bytes) -> str:
+    text = data.decode("utf-8", "surrogateescape")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _chunk_bounds(data: bytes, jobs: int, min_chunk_size: int) -> list[int]:
+    # Offsets of the first byte of every chunk, and of the end of the data.
+    # Chunks start behind a newline, which keeps `\r\n` together.
+    count = max(1, min(jobs, len(data) // max(1, min_chunk_size)))
+    bounds = [0]
+    for index in range(1, count):
+        newline = data.find(b"\n", max(len(data) * index // count, bounds[-1]))
+        if newline == -1 or newline + 1 == len(data):
+            break
+
+        bounds.append(newline + 1)
+
+    bounds.append(len(data))
+    return bounds
+
+
+def _scan_sequentially(
+    source: str,
+    error_reporter: ErrorReporter,
+    max_errors: int | None,
+) -> TokenStream:
+    return Scanner(
+        source,
+        error_reporter,
+        ScannerEngine.REGEX,
+        max_errors=max_errors,
+    ).scan_token_stream()
+
+
+def _scan_chunk(path: pathlib.Path, start: int, stop: int) -> _ChunkTokens:
+    with path.open("rb") as file:
+        file.seek(start)
+        data = file.read(stop - start)
+
+    return _scan_text(_decode(data))
+
+
+def _scan_text(text: str) -> _ChunkTokens:
+    error_reporter = ListErrorReporter()
+    tokens = Scanner(text, error_reporter, ScannerEngine.REGEX).scan_token_stream()
+    count = len(tokens) - 1
+
+    open_start = None
+    open_line = 0
+    diagnostics = error_reporter.diagnostics
+    if diagnostics and diagnostics[-1].message in _UNTERMINATED:
+        # Only closed comments and blanks can follow the last token.
+        end = tokens.start(count - 1) + tokens.length(count - 1) if count > 0 else 0
+        matched = _CLOSED_LEXEMES.match(text, end)
+        open_start = end if matched is None else matched.end()
+        open_line = text.count("\n", 0, open_start) + 1
+
+    stream = TokenStream(text)
+    stream.extend_from(tokens, 0, count)
+    return _ChunkTokens(
+        columns=stream.to_columns(),
+        diagnostics=diagnostics,
+        length=len(text),
+        newlines=text.count("\n"),
+        open_start=open_start,
+        open_line=open_line,
+    )
@@ -0,0 +1,84 @@
+import contextlib
+import os
+import pathlib
+import tempfile
+import time
+from typing import Final, Self
+
+_TEMPORARY_SUFFIX: Final = ".tmp"
+# Temporary files older than this are removed on eviction. Writing an entry
+# takes far less, so they were left behind by a process that died before
+# renaming them into place.
+_STALE_SECONDS: Final = 60 * 60
+
+
+class CacheDirectory:
+    # A directory of cache entries, one file per entry, shared by any number of
+    # processes. Entries are written to a temporary file and renamed into
+    # place, so readers only ever see complete entries. Reading an entry marks
+    # it as recently used, and the least recently used entries are evicted once
+    # the entries grow beyond `max_size` bytes, along with stale temporary
+    # files.
+    def __init__(
+        self: Self,
+        directory: str | pathlib.Path,
+        suffix: str,
+        max_size: int,
+    ) -> None:
+        self.path = pathlib.Path(directory)
+        self._suffix = suffix
+        self._max_size = max_size
+
+    def entry_path(self: Self, name: str) -> pathlib.Path:
+        return self.path / f"{name}{self._suffix}"
+
+    def read(self: Self, path: pathlib.Path) -> bytes | None:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        # Mark the entry as recently used, unless it has just been evicted.
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+
+        return data
+
+    def write(self: Self, path: pathlib.Path, data: bytes) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(
+            dir=self.path,
+            suffix=_TEMPORARY_SUFFIX,
+            delete=False,
+        ) as file:
+            file.write(data)
+
+        pathlib.Path(file.name).replace(path)
+        self._evict()
+
+    def _evict(self: Self) -> None:
+        entries = []
+        total_size = 0
+        stale_before = time.time() - _STALE_SECONDS
+        for entry in os.scandir(self.path):
+            is_temporary = entry.name.endswith(_TEMPORARY_SUFFIX)
+            if not is_temporary and not entry.name.endswith(self._suffix):
+                continue
+
+            # Another process may have evicted the entry in the meantime.
+            with contextlib.suppress(FileNotFoundError):
+                stat = entry.stat()
+                if not is_temporary:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+                elif stat.st_mtime < stale_before:
+                    pathlib.Path(entry.path).unlink(missing_ok=True)
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self._max_size:
+                break
+
+            pathlib.Path(path).unlink(missing_ok=True)
+            total_size -= size
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import struct
+from array import array
+from enum import IntEnum
+from typing import Any, Final, Self
+
+# Operands, like opcodes, take one 16-bit word of code.
+MAX_OPERAND: Final = 0xFFFF
+
+# Part of the key of stored programs. Bump it whenever compiled code for the
+# same source changes, so that programs compiled before are not run.
+BYTECODE_VERSION: Final = 3
+
+
+class OpCode(IntEnum):
+    CONSTANT = 0
+    NIL = 1
+    TRUE = 2
+    FALSE = 3
+    POP = 4
+    GET_LOCAL = 5
+    SET_LOCAL = 6
+    GET_GLOBAL = 7
+    DEFINE_GLOBAL = 8
+    SET_GLOBAL = 9
+    GET_UPVALUE = 10
+    SET_UPVALUE = 11
+    EQUAL = 12
+    NOT_EQUAL = 13
+    GREATER = 14
+    GREATER_EQUAL = 15
+    LESS = 16
+    LESS_EQUAL = 17
+    ADD = 18
+    SUBTRACT = 19
+    MULTIPLY = 20
+    DIVIDE = 21
+    NOT = 22
+    NEGATE = 23
+    PRINT = 24
+    JUMP = 25
+    JUMP_IF_FALSE = 26
+    JUMP_IF_TRUE = 27
+    POP_JUMP_IF_FALSE = 28
+    LOOP = 29
+    CALL = 30
+    CLOSURE = 31
+    CLOSE_UPVALUE = 32
+    RETURN = 33
+    CLASS = 34
+    INHERIT = 35
+    METHOD = 36
+    GET_PROPERTY = 37
+    SET_PROPERTY = 38
+    INVOKE = 39
+    GET_SUPER = 40
+    SUPER_INVOKE = 41
+
+
+class Chunk:
+    # A sequence of instructions, each an opcode followed by its operands, with
+    # the source line of every word kept alongside for error messages.
+    __slots__ = ("_constant_indices", "code", "constants", "lines")
+
+    def __init__(self: Self) -> None:
+        self.code = array("H")
+        self.lines = array("I")
+        self.constants: list[Any] = []
+        self._constant_indices: dict[tuple[type, str | bytes], int] = {}
+
+    def write(self: Self, word: int, line: int) -> None:
+        self.code.append(word)
+        self.lines.append(line)
+
+    def add_constant(self: Self, value: Any) -> int:
+        # Numbers and strings are stored once per chunk, however often they
+        # appear in it.
+        if type(value) is not float and type(value) is not str:
+            self.constants.append(value)
+            return len(self.constants) - 1
+
+        # Numbers are keyed on their bits, since -0.0 == 0.0 but prints as -0.
+        key: tuple[type, str | bytes] = (str, value)
+        if type(value) is float:
+            key = (float, struct.pack("<d", value))
+        index = self._constant_indices.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self._constant_indices[key] = index
+
+        return index
+
+
+class CompiledFunction:
+    __slots__ = ("arity", "chunk", "name", "upvalue_count")
+
+    def __init__(self: Self, name: str | None, arity: int) -> None:
+        # The top-level script has no name.
+        self.name = name
+        self.arity = arity
+        self.chunk = Chunk()
+        self.upvalue_count = 0
+
+    def __str__(self: Self) -> str:
+        if self.name is None:
+            return "<script>"
+
+        return f"<fn {self.name}>"
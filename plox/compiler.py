@@ -0,0 +1,527 @@
+from typing import TYPE_CHECKING, Any, Self
+
+from plox.chunk import MAX_OPERAND, CompiledFunction, OpCode
+from plox.errors import ErrorReporter
+from plox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    Get,
+    Grouping,
+    Literal,
+    Logical,
+    Set,
+    Super,
+    This,
+    Unary,
+    Variable,
+)
+from plox.inline_cache import InlineCache
+from plox.stmt import (
+    Block,
+    Class,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
+from plox.token import Token
+from plox.token_type import TokenType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_BINARY_OPCODES = {
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+}
+
+
+class _Local:
+    __slots__ = ("depth", "is_captured", "name")
+
+    def __init__(self: Self, name: str, depth: int) -> None:
+        self.name = name
+        self.depth = depth
+        self.is_captured = False
+
+
+class _FunctionScope:
+    __slots__ = (
+        "enclosing",
+        "function",
+        "is_initializer",
+        "locals",
+        "scope_depth",
+        "upvalues",
+    )
+
+    def __init__(
+        self: Self,
+        enclosing: "_FunctionScope | None",
+        function: CompiledFunction,
+        *,
+        is_method: bool = False,
+        is_initializer: bool = False,
+    ) -> None:
+        self.enclosing = enclosing
+        self.function = function
+        self.is_initializer = is_initializer
+        # The first stack slot of every call holds the function itself, or the
+        # receiver of a method.
+        self.locals = [_Local("this" if is_method else "", 0)]
+        # Whether each upvalue captures a local of the enclosing function, or
+        # one of its upvalues, and the index of either.
+        self.upvalues: list[tuple[bool, int]] = []
+        self.scope_depth = 0
+
+
+class Compiler:
+    # Compiles resolved syntax trees to bytecode for the VM. Locals live on the
+    # VM stack, and locals captured by closures are reached through upvalues.
+    # Scoping errors are left to the resolver, which runs first.
+    def __init__(self: Self, error_reporter: ErrorReporter) -> None:
+        self._error_reporter = error_reporter
+        self._scope = _FunctionScope(None, CompiledFunction(None, 0))
+        self._line = 1
+
+        self._expression_compilers: dict[type[Expr], Callable[[Any], None]] = {
+            Assign: self._compile_assign,
+            Binary: self._compile_binary,
+            Call: self._compile_call,
+            Get: self._compile_get,
+            Grouping: self._compile_grouping,
+            Literal: self._compile_literal,
+            Logical: self._compile_logical,
+            Set: self._compile_set,
+            Super: self._compile_super,
+            This: self._compile_this,
+            Unary: self._compile_unary,
+            Variable: self._compile_variable,
+        }
+        self._statement_compilers: dict[type[Stmt], Callable[[Any], None]] = {
+            Block: self._compile_block,
+            Class: self._compile_class,
+            Expression: self._compile_expression_statement,
+            Function: self._compile_function_statement,
+            If: self._compile_if,
+            Print: self._compile_print,
+            Return: self._compile_return,
+            Var: self._compile_var,
+            While: self._compile_while,
+        }
+
+    def compile(self: Self, statements: list[Stmt]) -> CompiledFunction:
+        self._scope = _FunctionScope(None, CompiledFunction(None, 0))
+        for statement in statements:
+            self._compile_statement(statement)
+        self._emit_return()
+
+        return self._scope.function
+
+    def _compile_statement(self: Self, statement: Stmt) -> None:
+        self._statement_compilers[type(statement)](statement)
+
+    def _compile_expression(self: Self, expression: Expr) -> None:
+        self._expression_compilers[type(expression)](expression)
+
+    def _compile_block(self: Self, statement: Block) -> None:
+        self._scope.scope_depth += 1
+        for inner in statement.statements:
+            self._compile_statement(inner)
+        self._end_scope()
+
+    def _compile_class(self: Self, statement: Class) -> None:
+        name = statement.name
+        self._line = name.line
+        if self._scope.scope_depth > 0:
+            self._add_local(name)
+
+        self._emit(OpCode.CLASS, self._make_constant(name.lexeme))
+        self._define_variable(name)
+
+        superclass = statement.superclass
+        if superclass is not None:
+            # The superclass stays on the stack as a local named `super`, in
+            # a scope around the methods.
+            self._compile_variable(superclass)
+            self._scope.scope_depth += 1
+            self._add_local(Token(TokenType.SUPER, "super", None, superclass.name.line))
+
+            self._emit_get_variable(name.lexeme)
+            self._line = superclass.name.line
+            self._emit(OpCode.INHERIT)
+
+        self._emit_get_variable(name.lexeme)
+        for method in statement.methods:
+            self._compile_function(method, is_method=True)
+            self._emit(OpCode.METHOD, self._make_constant(method.name.lexeme))
+        self._emit(OpCode.POP)
+
+        if superclass is not None:
+            self._end_scope()
+
+    def _compile_expression_statement(self: Self, statement: Expression) -> None:
+        self._compile_expression(statement.expression)
+        self._emit(OpCode.POP)
+
+    def _compile_function_statement(self: Self, statement: Function) -> None:
+        self._line = statement.name.line
+        # A local function is visible in its own body, so it can recurse.
+        if self._scope.scope_depth > 0:
+            self._add_local(statement.name)
+
+        self._compile_function(statement)
+        self._define_variable(statement.name)
+
+    def _compile_function(
+        self: Self,
+        statement: Function,
+        *,
+        is_method: bool = False,
+    ) -> None:
+        function = CompiledFunction(statement.name.lexeme, len(statement.params))
+        scope = _FunctionScope(
+            self._scope,
+            function,
+            is_method=is_method,
+            is_initializer=is_method and statement.name.lexeme == "init",
+        )
+        scope.scope_depth = 1
+        self._scope = scope
+
+        for param in statement.params:
+            self._add_local(param)
+        for inner in statement.body:
+            self._compile_statement(inner)
+        self._emit_return()
+
+        function.upvalue_count = len(scope.upvalues)
+        self._scope = scope.enclosing  # type: ignore[assignment]
+
+        self._line = statement.name.line
+        self._emit(OpCode.CLOSURE, self._make_constant(function))
+        for is_local, index in scope.upvalues:
+            self._emit(int(is_local), index)
+
+    def _compile_if(self: Self, statement: If) -> None:
+        self._compile_expression(statement.condition)
+        then_jump = self._emit_jump(OpCode.POP_JUMP_IF_FALSE)
+        self._compile_statement(statement.then_branch)
+
+        if statement.else_branch is None:
+            self._patch_jump(then_jump)
+            return
+
+        else_jump = self._emit_jump(OpCode.JUMP)
+        self._patch_jump(then_jump)
+        self._compile_statement(statement.else_branch)
+        self._patch_jump(else_jump)
+
+    def _compile_print(self: Self, statement: Print) -> None:
+        self._compile_expression(statement.expression)
+        self._emit(OpCode.PRINT)
+
+    def _compile_return(self: Self, statement: Return) -> None:
+        self._line = statement.keyword.line
+        if statement.value is None:
+            self._emit_return()
+            return
+
+        self._compile_expression(statement.value)
+        self._emit(OpCode.RETURN)
+
+    def _compile_var(self: Self, statement: Var) -> None:
+        self._line = statement.name.line
+        if statement.initializer is None:
+            self._emit(OpCode.NIL)
+        else:
+            self._compile_expression(statement.initializer)
+
+        # A local's value is left on the stack, in the slot it is given.
+        if self._scope.scope_depth > 0:
+            self._add_local(statement.name)
+
+        self._define_variable(statement.name)
+
+    def _compile_while(self: Self, statement: While) -> None:
+        loop_start = len(self._scope.function.chunk.code)
+        self._compile_expression(statement.condition)
+        exit_jump = self._emit_jump(OpCode.POP_JUMP_IF_FALSE)
+
+        self._compile_statement(statement.body)
+        self._line = statement.keyword.line
+        self._emit_loop(loop_start)
+
+        self._patch_jump(exit_jump)
+
+    def _compile_assign(self: Self, expression: Assign) -> None:
+        self._compile_expression(expression.value)
+        self._line = expression.name.line
+        self._emit_variable(
+            expression.name.lexeme,
+            OpCode.SET_LOCAL,
+            OpCode.SET_UPVALUE,
+            OpCode.SET_GLOBAL,
+        )
+
+    def _compile_binary(self: Self, expression: Binary) -> None:
+        self._compile_expression(expression.left)
+        self._compile_expression(expression.right)
+        self._line = expression.operator.line
+        self._emit(_BINARY_OPCODES[expression.operator.type])
+
+    def _compile_call(self: Self, expression: Call) -> None:
+        callee = expression.callee
+        # Methods called right where they are accessed are invoked on their
+        # receiver, without a bound method.
+        if type(callee) is Get:
+            self._compile_expression(callee.object)
+            self._compile_arguments(expression)
+            self._line = callee.name.line
+            self._emit(
+                OpCode.INVOKE,
+                self._make_constant(InlineCache(callee.name.lexeme)),
+                len(expression.arguments),
+            )
+        elif type(callee) is Super:
+            self._line = callee.keyword.line
+            self._emit_get_variable("this")
+            self._compile_arguments(expression)
+            self._line = callee.keyword.line
+            self._emit_get_variable("super")
+            self._line = callee.method.line
+            self._emit(
+                OpCode.SUPER_INVOKE,
+                self._make_constant(callee.method.lexeme),
+                len(expression.arguments),
+            )
+        else:
+            self._compile_expression(callee)
+            self._compile_arguments(expression)
+            self._line = expression.paren.line
+            self._emit(OpCode.CALL, len(expression.arguments))
+
+    def _compile_arguments(self: Self, expression: Call) -> None:
+        for argument in expression.arguments:
+            self._compile_expression(argument)
+
+    def _compile_get(self: Self, expression: Get) -> None:
+        self._compile_expression(expression.object)
+        self._line = expression.name.line
+        self._emit(
+            OpCode.GET_PROPERTY,
+            self._make_constant(InlineCache(expression.name.lexeme)),
+        )
+
+    def _compile_grouping(self: Self, expression: Grouping) -> None:
+        self._compile_expression(expression.expression)
+
+    def _compile_literal(self: Self, expression: Literal) -> None:
+        self._line = expression.line
+        value = expression.value
+        if value is None:
+            self._emit(OpCode.NIL)
+        elif value is True:
+            self._emit(OpCode.TRUE)
+        elif value is False:
+            self._emit(OpCode.FALSE)
+        else:
+            self._emit(OpCode.CONSTANT, self._make_constant(value))
+
+    def _compile_logical(self: Self, expression: Logical) -> None:
+        # Leaves the left operand as the result if it decides the outcome.
+        self._compile_expression(expression.left)
+        self._line = expression.operator.line
+        end_jump = self._emit_jump(
+            OpCode.JUMP_IF_TRUE
+            if expression.operator.type is TokenType.OR
+            else OpCode.JUMP_IF_FALSE,
+        )
+
+        self._emit(OpCode.POP)
+        self._compile_expression(expression.right)
+        self._patch_jump(end_jump)
+
+    def _compile_set(self: Self, expression: Set) -> None:
+        self._compile_expression(expression.object)
+        self._compile_expression(expression.value)
+        self._line = expression.name.line
+        self._emit(
+            OpCode.SET_PROPERTY,
+            self._make_constant(InlineCache(expression.name.lexeme)),
+        )
+
+    def _compile_super(self: Self, expression: Super) -> None:
+        self._line = expression.keyword.line
+        self._emit_get_variable("this")
+        self._emit_get_variable("super")
+        self._line = expression.method.line
+        self._emit(OpCode.GET_SUPER, self._make_constant(expression.method.lexeme))
+
+    def _compile_this(self: Self, expression: This) -> None:
+        self._line = expression.keyword.line
+        self._emit_get_variable("this")
+
+    def _compile_unary(self: Self, expression: Unary) -> None:
+        self._compile_expression(expression.right)
+        self._line = expression.operator.line
+        if expression.operator.type is TokenType.MINUS:
+            self._emit(OpCode.NEGATE)
+        else:
+            self._emit(OpCode.NOT)
+
+    def _compile_variable(self: Self, expression: Variable) -> None:
+        self._line = expression.name.line
+        self._emit_get_variable(expression.name.lexeme)
+
+    def _emit_get_variable(self: Self, name: str) -> None:
+        self._emit_variable(
+            name,
+            OpCode.GET_LOCAL,
+            OpCode.GET_UPVALUE,
+            OpCode.GET_GLOBAL,
+        )
+
+    def _emit_variable(
+        self: Self,
+        name: str,
+        local_opcode: OpCode,
+        upvalue_opcode: OpCode,
+        global_opcode: OpCode,
+    ) -> None:
+        slot = self._resolve_local(self._scope, name)
+        if slot >= 0:
+            self._emit(local_opcode, slot)
+            return
+
+        index = self._resolve_upvalue(self._scope, name)
+        if index >= 0:
+            self._emit(upvalue_opcode, index)
+            return
+
+        self._emit(global_opcode, self._make_constant(name))
+
+    def _define_variable(self: Self, name: Token) -> None:
+        if self._scope.scope_depth == 0:
+            self._emit(OpCode.DEFINE_GLOBAL, self._make_constant(name.lexeme))
+
+    def _add_local(self: Self, name: Token) -> None:
+        if len(self._scope.locals) > MAX_OPERAND:
+            self._error_reporter.token_error(
+                name,
+                "Too many local variables in function.",
+            )
+            return
+
+        self._scope.locals.append(_Local(name.lexeme, self._scope.scope_depth))
+
+    def _end_scope(self: Self) -> None:
+        scope = self._scope
+        scope.scope_depth -= 1
+
+        while scope.locals and scope.locals[-1].depth > scope.scope_depth:
+            if scope.locals.pop().is_captured:
+                self._emit(OpCode.CLOSE_UPVALUE)
+            else:
+                self._emit(OpCode.POP)
+
+    def _resolve_local(self: Self, scope: _FunctionScope, name: str) -> int:
+        # The first slot is only ever found as `this`.
+        for slot in range(len(scope.locals) - 1, -1, -1):
+            if scope.locals[slot].name == name:
+                return slot
+
+        return -1
+
+    def _resolve_upvalue(self: Self, scope: _FunctionScope, name: str) -> int:
+        if scope.enclosing is None:
+            return -1
+
+        slot = self._resolve_local(scope.enclosing, name)
+        if slot >= 0:
+            scope.enclosing.locals[slot].is_captured = True
+            return self._add_upvalue(scope, is_local=True, index=slot)
+
+        index = self._resolve_upvalue(scope.enclosing, name)
+        if index >= 0:
+            return self._add_upvalue(scope, is_local=False, index=index)
+
+        return -1
+
+    def _add_upvalue(
+        self: Self,
+        scope: _FunctionScope,
+        *,
+        is_local: bool,
+        index: int,
+    ) -> int:
+        upvalue = (is_local, index)
+        if upvalue in scope.upvalues:
+            return scope.upvalues.index(upvalue)
+
+        if len(scope.upvalues) > MAX_OPERAND:
+            self._error("Too many closure variables in function.")
+            return 0
+
+        scope.upvalues.append(upvalue)
+        return len(scope.upvalues) - 1
+
+    def _emit(self: Self, *words: int) -> None:
+        chunk = self._scope.function.chunk
+        for word in words:
+            chunk.write(word, self._line)
+
+    def _emit_return(self: Self) -> None:
+        if self._scope.is_initializer:
+            self._emit(OpCode.GET_LOCAL, 0, OpCode.RETURN)
+        else:
+            self._emit(OpCode.NIL, OpCode.RETURN)
+
+    def _emit_jump(self: Self, opcode: OpCode) -> int:
+        # Returns the position of the offset, to be patched once the target is
+        # known.
+        self._emit(opcode, MAX_OPERAND)
+        return len(self._scope.function.chunk.code) - 1
+
+    def _patch_jump(self: Self, position: int) -> None:
+        code = self._scope.function.chunk.code
+        offset = len(code) - position - 1
+        if offset > MAX_OPERAND:
+            self._error("Too much code to jump over.")
+            return
+
+        code[position] = offset
+
+    def _emit_loop(self: Self, loop_start: int) -> None:
+        self._emit(OpCode.LOOP)
+        offset = len(self._scope.function.chunk.code) + 1 - loop_start
+        if offset > MAX_OPERAND:
+            self._error("Loop body too large.")
+            offset = 0
+
+        self._emit(offset)
+
+    def _make_constant(self: Self, value: Any) -> int:
+        index = self._scope.function.chunk.add_constant(value)
+        if index > MAX_OPERAND:
+            self._error("Too many constants in one chunk.")
+            return 0
+
+        return index
+
+    def _error(self: Self, message: str) -> None:
+        self._error_reporter.error(self._line, message)
@@ -0,0 +1,169 @@
+import io
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
+from typing import Final, Self
+
+from plox.chunk import CompiledFunction
+from plox.errors import ListErrorReporter
+from plox.expr import Expr
+from plox.inline_cache import InlineCache
+from plox.interner import Interner
+from plox.interpreter import Interpreter
+from plox.limits import Limits
+from plox.optimizer import Optimizer
+from plox.pipeline import Engine, compile_program
+from plox.runtime import Clock
+from plox.scanner import Scanner
+from plox.stmt import Stmt
+from plox.vm import VM
+
+_DEFAULT_CACHE_SIZE: Final = 256
+# Distinct lexemes and literals kept for later executions. Past that, they
+# start over, so that a host running endless different sources does not keep
+# every name it ever saw.
+_MAX_INTERNED: Final = 1 << 16
+
+
+@dataclass(frozen=True, slots=True)
+class RunResult:
+    output: str
+    errors: list[str]
+    had_error: bool
+    had_runtime_error: bool
+
+
+@dataclass(frozen=True, slots=True)
+class _Program:
+    # What a source compiled to, or None with the errors that stopped it.
+    code: list[Stmt] | CompiledFunction | None
+    errors: list[str]
+    caches: list[InlineCache]
+
+
+def _node_caches(node: Expr | Stmt) -> Iterator[InlineCache]:
+    for node_field in fields(node):
+        value = getattr(node, node_field.name)
+        if type(value) is InlineCache:
+            yield value
+        elif isinstance(value, Expr | Stmt):
+            yield from _node_caches(value)
+        elif type(value) is list:
+            for item in value:
+                if isinstance(item, Expr | Stmt):
+                    yield from _node_caches(item)
+
+
+def _function_caches(function: CompiledFunction) -> Iterator[InlineCache]:
+    for constant in function.chunk.constants:
+        if type(constant) is InlineCache:
+            yield constant
+        elif type(constant) is CompiledFunction:
+            yield from _function_caches(constant)
+
+
+class EmbeddedLox:
+    # Runs many scripts from a host program. Every execution gets fresh globals,
+    # its own output and errors, and a result instead of an exit status, while
+    # the names scanned so far, up to a bound, and the programs compiled from
+    # the most recent sources are kept for later executions. Programs are
+    # shared between executions, so an instance runs one script at a time.
+    def __init__(
+        self: Self,
+        *,
+        engine: Engine = Engine.TREE,
+        optimize: bool = True,
+        max_errors: int | None = None,
+        cache_size: int = _DEFAULT_CACHE_SIZE,
+        limits: Limits | None = None,
+    ) -> None:
+        self._engine = engine
+        self._optimizer = (
+            Optimizer(
+                max_string_length=None if limits is None else limits.max_string_length,
+            )
+            if optimize is True
+            else None
+        )
+        self._max_errors = max_errors
+        self._cache_size = cache_size
+        self._limits = limits
+        self._interner = Interner()
+        self._clock = Clock()
+        self._programs: OrderedDict[str, _Program] = OrderedDict()
+
+    def execute(self: Self, source: str) -> RunResult:
+        program = self._programs.get(source)
+        if program is None:
+            program = self._compile(source)
+            if self._cache_size > 0:
+                self._programs[source] = program
+                if len(self._programs) > self._cache_size:
+                    self._programs.popitem(last=False)
+        else:
+            self._programs.move_to_end(source)
+
+        if program.code is None:
+            return RunResult(
+                output="",
+                errors=list(program.errors),
+                had_error=True,
+                had_runtime_error=False,
+            )
+
+        # The classes of an earlier execution are gone, and what the caches
+        # remember about them would only push the call sites towards
+        # megamorphic.
+        for cache in program.caches:
+            cache.reset()
+
+        error_reporter = ListErrorReporter()
+        out = io.StringIO()
+        if type(program.code) is CompiledFunction:
+            vm = VM(error_reporter, out, limits=self._limits)
+            vm.globals = {"clock": self._clock}
+            vm.interpret(program.code)
+        else:
+            interpreter = Interpreter(error_reporter, out, limits=self._limits)
+            interpreter.globals = {"clock": self._clock}
+            interpreter.interpret(program.code)
+
+        return RunResult(
+            output=out.getvalue(),
+            errors=error_reporter.errors,
+            had_error=False,
+            had_runtime_error=error_reporter.had_runtime_error,
+        )
+
+    def clear_cache(self: Self) -> None:
+        self._programs.clear()
+        self._interner = Interner()
+
+    def _compile(self: Self, source: str) -> _Program:
+        if len(self._interner) > _MAX_INTERNED:
+            # Cached programs hold on to the objects they were compiled with.
+            self._interner = Interner()
+
+        error_reporter = ListErrorReporter()
+        scanner = Scanner(
+            source,
+            error_reporter,
+            interner=self._interner,
+            max_errors=self._max_errors,
+        )
+        program = compile_program(
+            scanner.iter_tokens(),
+            error_reporter,
+            self._engine,
+            self._optimizer,
+        )
+        if program is None:
+            return _Program(code=None, errors=error_reporter.errors, caches=[])
+
+        if type(program) is CompiledFunction:
+            caches = list(_function_caches(program))
+        else:
+            caches = [
+                cache for statement in program for cache in _node_caches(statement)
+            ]
+        return _Program(code=program, errors=[], caches=caches)
@@ -1,38 +1,137 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol, Self
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final, Protocol, Self
+
+from plox.token_type import TokenType
 
 if TYPE_CHECKING:
     from _typeshed import SupportsWrite
 
+    from plox.span import Span
+    from plox.token import Token
+
+
+# Number of reports a `TextErrorReporter` holds before writing them out.
+_BUFFER_SIZE: Final = 256
+
+
+class LoxRuntimeError(Exception):
+    def __init__(self: Self, line: int, message: str) -> None:
+        super().__init__(message)
+        self.line = line
+        self.message = message
+
 
 class ErrorReporter(Protocol):
     had_error: bool
+    had_runtime_error: bool
+
+    # Reporters that know where in the source an error is pass its span.
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        span: Span | None = None,
+    ) -> None: ...
+
+    def token_error(self: Self, token: Token, message: str) -> None: ...
+
+    def runtime_error(self: Self, error: LoxRuntimeError) -> None: ...
+
+    def flush(self: Self) -> None:
+        # Writes out whatever a reporter holds back, if anything.
+        return
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    line: int
+    message: str
+    # Where on the line a static error occurred, e.g. `at 'x'`.
+    where: str = ""
+    runtime: bool = False
+    span: Span | None = None
 
-    def error(self: Self, line: int, message: str) -> None: ...
+    def __str__(self: Self) -> str:
+        if self.runtime:
+            return f"{self.message}\n[line {self.line}]"
+
+        return f"[line {self.line}] Error {self.where}: {self.message}"
+
+
+def _where(token: Token) -> str:
+    if token.type is TokenType.EOF:
+        return "at end"
+
+    return f"at '{token.lexeme}'"
 
 
 class TextErrorReporter(ErrorReporter):
+    # Reports are buffered and written out together, either once the buffer
+    # fills up or on `flush`, rather than with a write each.
     def __init__(self: Self, out: SupportsWrite[str]) -> None:
         self.had_error = False
+        self.had_runtime_error = False
         self._out = out
+        self._buffer: list[str] = []
+
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        span: Span | None = None,
+    ) -> None:
+        self._report(Diagnostic(line, message, span=span))
+
+    def token_error(self: Self, token: Token, message: str) -> None:
+        self._report(Diagnostic(token.line, message, _where(token)))
 
-    def error(self: Self, line: int, message: str) -> None:
-        self._report(line=line, where="", message=message)
+    def runtime_error(self: Self, error: LoxRuntimeError) -> None:
+        self._write(str(Diagnostic(error.line, error.message, runtime=True)))
+        self.had_runtime_error = True
 
-    def _report(self: Self, line: int, where: str, message: str) -> None:
-        print(f"[line {line}] Error {where}: {message}", file=self._out)
+    def flush(self: Self) -> None:
+        if self._buffer:
+            self._buffer.append("")
+            self._out.write("\n".join(self._buffer))
+            self._buffer.clear()
+
+    def _report(self: Self, diagnostic: Diagnostic) -> None:
+        self._write(str(diagnostic))
         self.had_error = True
 
+    def _write(self: Self, text: str) -> None:
+        self._buffer.append(text)
+        if len(self._buffer) >= _BUFFER_SIZE:
+            self.flush()
+
 
 class ListErrorReporter(ErrorReporter):
+    # Keeps every report as a `Diagnostic`, and only formats them when
+    # `errors` is read.
     def __init__(self: Self) -> None:
         self.had_error = False
-        self.errors = []
+        self.had_runtime_error = False
+        self.diagnostics: list[Diagnostic] = []
 
-    def error(self: Self, line: int, message: str) -> None:
-        self._report(line=line, where="", message=message)
+    @property
+    def errors(self: Self) -> list[str]:
+        return [str(diagnostic) for diagnostic in self.diagnostics]
 
-    def _report(self: Self, line: int, where: str, message: str) -> None:
-        self.errors.append(f"[line {line}] Error {where}: {message}")
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        span: Span | None = None,
+    ) -> None:
+        self.diagnostics.append(Diagnostic(line, message, span=span))
         self.had_error = True
+
+    def token_error(self: Self, token: Token, message: str) -> None:
+        self.diagnostics.append(Diagnostic(token.line, message, _where(token)))
+        self.had_error = True
+
+    def runtime_error(self: Self, error: LoxRuntimeError) -> None:
+        self.diagnostics.append(Diagnostic(error.line, error.message, runtime=True))
+        self.had_runtime_error = True
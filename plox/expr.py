@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+from plox.inline_cache import InlineCache
+from plox.token import Token
+
+
+# Nodes are plain slotted records. The resolver fills in the `depth` and `slot`
+# of variable accesses: how many scopes up the variable lives and at which
+# index, or a depth of -1 for a global. Property accesses carry the inline
+# cache the tree-walking interpreter uses for them.
+@dataclass(slots=True, eq=False)
+class Expr:
+    pass
+
+
+@dataclass(slots=True, eq=False)
+class Assign(Expr):
+    name: Token
+    value: Expr
+    depth: int = -1
+    slot: int = -1
+
+
+@dataclass(slots=True, eq=False)
+class Binary(Expr):
+    left: Expr
+    operator: Token
+    right: Expr
+
+
+@dataclass(slots=True, eq=False)
+class Call(Expr):
+    callee: Expr
+    paren: Token
+    arguments: list[Expr]
+
+
+@dataclass(slots=True, eq=False)
+class Get(Expr):
+    object: Expr
+    name: Token
+    cache: InlineCache = field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        self.cache = InlineCache(self.name.lexeme)
+
+
+@dataclass(slots=True, eq=False)
+class Grouping(Expr):
+    expression: Expr
+
+
+@dataclass(slots=True, eq=False)
+class Literal(Expr):
+    value: Any
+    line: int
+
+
+@dataclass(slots=True, eq=False)
+class Logical(Expr):
+    left: Expr
+    operator: Token
+    right: Expr
+
+
+@dataclass(slots=True, eq=False)
+class Set(Expr):
+    object: Expr
+    name: Token
+    value: Expr
+    cache: InlineCache = field(init=False, repr=False)
+
+    def __post_init__(self: Self) -> None:
+        self.cache = InlineCache(self.name.lexeme)
+
+
+@dataclass(slots=True, eq=False)
+class Super(Expr):
+    keyword: Token
+    method: Token
+    depth: int = -1
+    slot: int = -1
+
+
+@dataclass(slots=True, eq=False)
+class This(Expr):
+    keyword: Token
+    depth: int = -1
+    slot: int = -1
+
+
+@dataclass(slots=True, eq=False)
+class Unary(Expr):
+    operator: Token
+    right: Expr
+
+
+@dataclass(slots=True, eq=False)
+class Variable(Expr):
+    name: Token
+    depth: int = -1
+    slot: int = -1
@@ -0,0 +1,193 @@
+import bisect
+from typing import Final, Self
+
+from plox.errors import ErrorReporter
+from plox.scanner import Scanner, ScannerEngine
+from plox.span import Span
+from plox.token_stream import TokenStream
+
+# Number of characters rescanned at once, doubled whenever a window turns out
+# to be too small to hold a single complete lexeme.
+_WINDOW_SIZE: Final = 256
+
+
+class _ErrorRecorder(ErrorReporter):
+    # Remembers every error together with the number of tokens scanned before
+    # it, which places the error between two tokens.
+    def __init__(self: Self, stream: TokenStream) -> None:
+        self.had_error = False
+        self.had_runtime_error = False
+        self.errors: list[tuple[int, int, str]] = []
+        self._stream = stream
+
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        _span: Span | None = None,
+    ) -> None:
+        # Windows are scanned on their own, so their spans are not kept.
+        self.errors.append((len(self._stream), line, message))
+        self.had_error = True
+
+
+class IncrementalScanner:
+    def __init__(
+        self: Self,
+        source: str,
+        engine: ScannerEngine = ScannerEngine.REGEX,
+    ) -> None:
+        self._source = source
+        self._engine = engine
+
+        self._tokens = TokenStream(source)
+        recorder = _ErrorRecorder(self._tokens)
+        Scanner(source, recorder, engine).scan_token_stream(self._tokens)
+        self._errors = recorder.errors
+
+    @property
+    def source(self: Self) -> str:
+        return self._source
+
+    @property
+    def tokens(self: Self) -> TokenStream:
+        return self._tokens
+
+    def report_errors(self: Self, error_reporter: ErrorReporter) -> None:
+        for _, line, message in self._errors:
+            error_reporter.error(line, message)
+
+    def edit(self: Self, offset: int, deleted: int, inserted: str) -> None:
+        if not 0 <= offset <= offset + deleted <= len(self._source):
+            msg = "Edit out of range."
+            raise ValueError(msg)
+
+        old_source = self._source
+        old_tokens = self._tokens
+        source = old_source[:offset] + inserted + old_source[offset + deleted :]
+        shift = len(inserted) - deleted
+
+        # Restart behind the last token that is known to be unaffected: one
+        # whose scanning did not look at the edited text. A step looks at most
+        # one character past its lexeme.
+        kept = self._count_tokens_before(offset - 1)
+        if kept > 0:
+            position = old_tokens.start(kept - 1) + old_tokens.length(kept - 1)
+            line = old_tokens.line(kept - 1)
+        else:
+            position = 0
+            line = 1
+
+        tokens = TokenStream(source)
+        tokens.extend_from(old_tokens, 0, kept)
+        errors = [error for error in self._errors if error[0] < kept]
+
+        # Rescan window by window until a token starts behind the edit exactly
+        # where an old token did. Both scans are then in the same state over
+        # the same text, so the old tokens can be reused from there on.
+        window_size = _WINDOW_SIZE
+        while True:
+            window_end = min(position + window_size, len(source))
+            window = TokenStream(source[position:window_end])
+            recorder = _ErrorRecorder(window)
+            Scanner(
+                source=window.source,
+                error_reporter=recorder,
+                engine=self._engine,
+                line=line,
+            ).scan_token_stream(window)
+
+            at_end = window_end == len(source)
+            accepted, resync = self._accept_window(
+                window,
+                position,
+                at_end=at_end,
+                edit_end=offset + len(inserted),
+                shift=shift,
+            )
+            if accepted == 0 and resync is None and not at_end:
+                window_size *= 2
+                continue
+
+            base = len(tokens)
+            tokens.extend_from(window, 0, accepted, offset_shift=position)
+            errors.extend(
+                (base + index, error_line, message)
+                for index, error_line, message in recorder.errors
+                if index < accepted or (index == accepted and resync is not None)
+            )
+
+            if resync is not None:
+                line_shift = window.line(accepted) - old_tokens.line(resync)
+                tokens.extend_from(
+                    old_tokens,
+                    resync,
+                    len(old_tokens),
+                    offset_shift=shift,
+                    line_shift=line_shift,
+                )
+                index_shift = base + accepted - resync
+                errors.extend(
+                    (index + index_shift, error_line + line_shift, message)
+                    for index, error_line, message in self._errors
+                    if index > resync
+                )
+                break
+
+            if at_end:
+                break
+
+            position += window.start(accepted - 1) + window.length(accepted - 1)
+            line = window.line(accepted - 1)
+            window_size = _WINDOW_SIZE
+
+        self._source = source
+        self._tokens = tokens
+        self._errors = errors
+
+    def _count_tokens_before(self: Self, offset: int) -> int:
+        # Counts the tokens, not including EOF, that end before `offset`.
+        tokens = self._tokens
+        return bisect.bisect_left(
+            range(len(tokens) - 1),
+            offset,
+            key=lambda index: tokens.start(index) + tokens.length(index),
+        )
+
+    def _accept_window(
+        self: Self,
+        window: TokenStream,
+        position: int,
+        *,
+        at_end: bool,
+        edit_end: int,
+        shift: int,
+    ) -> tuple[int, int | None]:
+        # Returns the number of window tokens to keep, and the index of the old
+        # token to resume from, if the scans resynchronized.
+        old_tokens = self._tokens
+        old_starts = range(len(old_tokens) - 1)
+
+        count = len(window) if at_end else len(window) - 1
+        for index in range(count):
+            end = window.start(index) + window.length(index)
+            if not at_end and end + 1 >= len(window.source):
+                # The lexeme may continue behind the window.
+                return index, None
+
+            start = position + window.start(index)
+            if start < edit_end:
+                continue
+
+            old_index = bisect.bisect_left(
+                old_starts,
+                start - shift,
+                key=old_tokens.start,
+            )
+            if (
+                old_index < len(old_starts)
+                and old_tokens.start(old_index) == start - shift
+            ):
+                return index, old_index
+
+        return count, None
@@ -0,0 +1,50 @@
+from collections.abc import Callable
+from typing import Any, Final, Self
+
+# Keys a call site remembers before it is megamorphic and stops caching.
+MAX_ENTRIES: Final = 4
+
+_MISSING: Final = object()
+
+
+class InlineCache:
+    # Remembers what a property name resolved to at one call site, keyed on
+    # the shape of the receiver. Shapes never change once created, so an entry
+    # stays valid for as long as the key is alive, and instances of a class
+    # that is declared again get new shapes, and miss.
+    #
+    # The last key seen and its entry are kept in `key` and `entry`, which is
+    # all a monomorphic site ever looks at; engines test `key` themselves and
+    # only call `miss` when it differs. Sites that see more keys keep them in
+    # `entries`, up to `MAX_ENTRIES`.
+    __slots__ = ("entries", "entry", "key", "megamorphic", "name")
+
+    def __init__(self: Self, name: str) -> None:
+        self.name = name
+        self.key: object = None
+        self.entry: Any = None
+        self.entries: dict[object, Any] | None = None
+        self.megamorphic = False
+
+    def miss(self: Self, key: object, resolve: Callable[[str], Any]) -> Any:
+        entries = self.entries
+        entry = _MISSING if entries is None else entries.get(key, _MISSING)
+        if entry is _MISSING:
+            entry = resolve(self.name)
+            if entries is not None:
+                if len(entries) < MAX_ENTRIES:
+                    entries[key] = entry
+                else:
+                    self.megamorphic = True
+            elif self.key is not None:
+                self.entries = {self.key: self.entry, key: entry}
+
+        self.key = key
+        self.entry = entry
+        return entry
+
+    def reset(self: Self) -> None:
+        self.key = None
+        self.entry = None
+        self.entries = None
+        self.megamorphic = False
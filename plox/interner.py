@@ -0,0 +1,26 @@
+from typing import Self
+
+
+class Interner:
+    # Makes equal lexemes and literals share a single object. A scanner
+    # creates its own interner unless it is given one, which lets several
+    # scans share the same objects.
+    __slots__ = ("_numbers", "_strings")
+
+    def __init__(self: Self) -> None:
+        self._strings: dict[str, str] = {}
+        # Maps number lexemes to their values.
+        self._numbers: dict[str, float] = {}
+
+    def __len__(self: Self) -> int:
+        return len(self._strings) + len(self._numbers)
+
+    def string(self: Self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def number(self: Self, lexeme: str) -> float:
+        value = self._numbers.get(lexeme)
+        if value is None:
+            value = self._numbers[lexeme] = float(lexeme)
+
+        return value
@@ -0,0 +1,637 @@
+from __future__ import annotations
+
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Final, Self
+
+from plox.errors import ErrorReporter, LoxRuntimeError
+from plox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    Get,
+    Grouping,
+    Literal,
+    Logical,
+    Set,
+    Super,
+    This,
+    Unary,
+    Variable,
+)
+from plox.limits import Budget, Limits
+from plox.runtime import (
+    BoundMethod,
+    Clock,
+    Environment,
+    LoxCallable,
+    LoxClass,
+    LoxFunction,
+    LoxInstance,
+    is_equal,
+    is_truthy,
+    stringify,
+)
+from plox.stmt import (
+    Block,
+    Class,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
+from plox.token_type import TokenType
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _typeshed import SupportsWrite
+
+    from plox.token import Token
+
+# Returned by a statement that executed `return`. The value itself is kept by
+# the interpreter, so unwinding allocates nothing.
+_RETURN: Final = object()
+
+# Python frames that a Lox call takes, with room for the statements nested in
+# a function. Expressions nested deeper still may run out of them, and are
+# reported as a stack overflow just the same.
+_FRAMES_PER_CALL: Final = 32
+
+
+class _RecursionLimit:
+    # Raises the recursion limit, which every thread shares, for as long as
+    # any interpreter runs, and restores it once the last one is done.
+    def __init__(self: Self) -> None:
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._saved = 0
+
+    def enter(self: Self, frames: int) -> None:
+        with self._lock:
+            if self._runs == 0:
+                self._saved = sys.getrecursionlimit()
+            self._runs += 1
+            sys.setrecursionlimit(max(sys.getrecursionlimit(), self._saved + frames))
+
+    def leave(self: Self) -> None:
+        with self._lock:
+            self._runs -= 1
+            if self._runs == 0:
+                sys.setrecursionlimit(self._saved)
+
+
+_recursion_limit = _RecursionLimit()
+
+
+def _check_number_operands(operator: Token, left: Any, right: Any) -> None:
+    if type(left) is not float or type(right) is not float:
+        raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+
+
+def _subtract(operator: Token, left: Any, right: Any) -> Any:
+    _check_number_operands(operator, left, right)
+    return left - right
+
+
+def _multiply(operator: Token, left: Any, right: Any) -> Any:
+    _check_number_operands(operator, left, right)
+    return left * right
+
+
+def _divide(operator: Token, left: Any, right: Any) -> Any:
+    _check_number_operands(operator, left, right)
+    if right == 0:
+        raise LoxRuntimeError(operator.line, "Division by zero.")
+
+    return left / right
+
+
+def _greater(operator: Token, left: Any, right: Any) -> Any:
+    _check_number_operands(operator, left, right)
+    return left > right
+
+
+def _greater_equal(operator: Token, left: Any, right: Any) -> Any:
+    _check_number_operands(operator, left, right)
+    return left >= right
+
+
+def _less(operator: Token, left: Any, right: Any) -> Any:
+    _check_number_operands(operator, left, right)
+    return left < right
+
+
+def _less_equal(operator: Token, left: Any, right: Any) -> Any:
+    _check_number_operands(operator, left, right)
+    return left <= right
+
+
+def _equal(_: Token, left: Any, right: Any) -> Any:
+    return is_equal(left, right)
+
+
+def _not_equal(_: Token, left: Any, right: Any) -> Any:
+    return not is_equal(left, right)
+
+
+# Addition is a method of the interpreter, which limits the strings it builds.
+_BINARY_OPERATORS: Final[dict[TokenType, Callable[[Token, Any, Any], Any]]] = {
+    TokenType.MINUS: _subtract,
+    TokenType.STAR: _multiply,
+    TokenType.SLASH: _divide,
+    TokenType.GREATER: _greater,
+    TokenType.GREATER_EQUAL: _greater_equal,
+    TokenType.LESS: _less,
+    TokenType.LESS_EQUAL: _less_equal,
+    TokenType.EQUAL_EQUAL: _equal,
+    TokenType.BANG_EQUAL: _not_equal,
+}
+
+
+class Interpreter:
+    # Evaluates resolved syntax trees. Nodes are dispatched on their type
+    # through tables built once, and local variables are read from the slots
+    # the resolver assigned them.
+    def __init__(
+        self: Self,
+        error_reporter: ErrorReporter,
+        out: SupportsWrite[str] | None = None,
+        *,
+        limits: Limits | None = None,
+    ) -> None:
+        self._error_reporter = error_reporter
+        self._out = sys.stdout if out is None else out
+
+        self.globals: dict[str, Any] = {"clock": Clock()}
+        self._environment: Environment | None = None
+        self._return_value: Any = None
+
+        # Loop iterations and calls are steps. Limits that are not checked where
+        # they apply are checked once the steps reach `_next_check`.
+        self._limits = Limits() if limits is None else limits
+        self._budget = Budget(self._limits)
+        self._steps = 0
+        self._next_check = 0
+        self._allocations = 0
+        self._depth = 0
+
+        self._binary_operators = {**_BINARY_OPERATORS, TokenType.PLUS: self._add}
+
+        self._expression_evaluators: dict[type[Expr], Callable[[Any], Any]] = {
+            Assign: self._evaluate_assign,
+            Binary: self._evaluate_binary,
+            Call: self._evaluate_call,
+            Get: self._evaluate_get,
+            Grouping: self._evaluate_grouping,
+            Literal: self._evaluate_literal,
+            Logical: self._evaluate_logical,
+            Set: self._evaluate_set,
+            Super: self._evaluate_super,
+            This: self._evaluate_this,
+            Unary: self._evaluate_unary,
+            Variable: self._evaluate_variable,
+        }
+        self._statement_executors: dict[type[Stmt], Callable[[Any], object]] = {
+            Block: self._execute_block,
+            Class: self._execute_class,
+            Expression: self._execute_expression,
+            Function: self._execute_function,
+            If: self._execute_if,
+            Print: self._execute_print,
+            Return: self._execute_return,
+            Var: self._execute_var,
+            While: self._execute_while,
+        }
+
+    def interpret(self: Self, statements: list[Stmt]) -> None:
+        self._budget = Budget(self._limits)
+        self._steps = 0
+        self._next_check = self._budget.next_check(self._steps)
+        self._allocations = 0
+        self._depth = 0
+        # Calls recurse in Python, so a script could otherwise only go a couple
+        # of hundred calls deep.
+        _recursion_limit.enter(self._budget.max_call_depth * _FRAMES_PER_CALL)
+        try:
+            for statement in statements:
+                self._execute(statement)
+        except LoxRuntimeError as error:
+            self._environment = None
+            self._error_reporter.runtime_error(error)
+        finally:
+            _recursion_limit.leave()
+
+    def call_function(self: Self, function: LoxFunction, arguments: list[Any]) -> Any:
+        declaration = function.declaration
+
+        # The arguments become the first slots of the function's scope.
+        slots = arguments
+        if declaration.size > len(slots):
+            slots = slots + [None] * (declaration.size - len(slots))
+
+        previous = self._environment
+        self._environment = Environment(function.closure, slots)
+
+        value = None
+        execute = self._execute
+        for statement in declaration.body:
+            if execute(statement) is _RETURN:
+                value = self._return_value
+                self._return_value = None
+                break
+
+        self._environment = previous
+        return value
+
+    def call_method(
+        self: Self,
+        method: LoxFunction,
+        receiver: LoxInstance,
+        arguments: list[Any],
+    ) -> Any:
+        # `this` takes the first slot of a method's scope, ahead of the
+        # arguments. Initializers always return their instance.
+        value = self.call_function(method, [receiver, *arguments])
+        if method.declaration.name.lexeme == "init":
+            return receiver
+
+        return value
+
+    def execute_block(
+        self: Self,
+        statements: list[Stmt],
+        environment: Environment,
+    ) -> object:
+        previous = self._environment
+        self._environment = environment
+
+        execute = self._execute
+        for statement in statements:
+            if execute(statement) is _RETURN:
+                self._environment = previous
+                return _RETURN
+
+        self._environment = previous
+        return None
+
+    def _execute(self: Self, statement: Stmt) -> object:
+        return self._statement_executors[type(statement)](statement)
+
+    def _evaluate(self: Self, expression: Expr) -> Any:
+        return self._expression_evaluators[type(expression)](expression)
+
+    def _execute_block(self: Self, statement: Block) -> object:
+        return self.execute_block(
+            statement.statements,
+            Environment(self._environment, [None] * statement.size),
+        )
+
+    def _execute_class(self: Self, statement: Class) -> None:
+        klass = LoxClass(statement.name.lexeme)
+
+        # Methods close over a scope holding the superclass, if any.
+        closure = self._environment
+        if statement.superclass is not None:
+            superclass = self._evaluate(statement.superclass)
+            if type(superclass) is not LoxClass:
+                raise LoxRuntimeError(
+                    statement.superclass.name.line,
+                    "Superclass must be a class.",
+                )
+
+            klass.inherit(superclass)
+            closure = Environment(closure, [superclass])
+
+        self._allocations += 1 + len(statement.methods)
+        for method in statement.methods:
+            klass.methods[method.name.lexeme] = LoxFunction(
+                method,
+                closure if method.captures else None,
+            )
+
+        self._define(statement.name, statement.slot, klass)
+
+    def _execute_expression(self: Self, statement: Expression) -> None:
+        self._evaluate(statement.expression)
+
+    def _execute_function(self: Self, statement: Function) -> None:
+        # A closure is only kept when it is used, since a function declared in
+        # a scope and that scope refer to each other, which leaves a cycle for
+        # the garbage collector.
+        closure = self._environment if statement.captures else None
+        function = LoxFunction(statement, closure)
+        self._allocations += 1
+        self._define(statement.name, statement.slot, function)
+
+    def _execute_if(self: Self, statement: If) -> object:
+        if is_truthy(self._evaluate(statement.condition)):
+            return self._execute(statement.then_branch)
+        if statement.else_branch is not None:
+            return self._execute(statement.else_branch)
+
+        return None
+
+    def _execute_print(self: Self, statement: Print) -> None:
+        value = self._evaluate(statement.expression)
+        print(stringify(value), file=self._out)
+
+    def _execute_return(self: Self, statement: Return) -> object:
+        if statement.value is not None:
+            self._return_value = self._evaluate(statement.value)
+
+        return _RETURN
+
+    def _execute_var(self: Self, statement: Var) -> None:
+        value = None
+        if statement.initializer is not None:
+            value = self._evaluate(statement.initializer)
+
+        self._define(statement.name, statement.slot, value)
+
+    def _execute_while(self: Self, statement: While) -> object:
+        evaluate = self._evaluate
+        execute = self._execute
+        condition = statement.condition
+        body = statement.body
+
+        line = statement.keyword.line
+        while is_truthy(evaluate(condition)):
+            if execute(body) is _RETURN:
+                return _RETURN
+
+            self._steps += 1
+            if self._steps == self._next_check:
+                self._next_check = self._budget.check(
+                    line,
+                    self._steps,
+                    self._allocations,
+                )
+
+        return None
+
+    def _evaluate_assign(self: Self, expression: Assign) -> Any:
+        value = self._evaluate(expression.value)
+
+        if expression.depth < 0:
+            name = expression.name.lexeme
+            if name not in self.globals:
+                raise LoxRuntimeError(
+                    expression.name.line,
+                    f"Undefined variable '{name}'.",
+                )
+
+            self.globals[name] = value
+        else:
+            environment = self._environment.ancestor(  # type: ignore[union-attr]
+                expression.depth,
+            )
+            environment.slots[expression.slot] = value
+
+        return value
+
+    def _evaluate_binary(self: Self, expression: Binary) -> Any:
+        # The hottest node, so it dispatches its operands itself.
+        evaluators = self._expression_evaluators
+        left = evaluators[type(expression.left)](expression.left)
+        right = evaluators[type(expression.right)](expression.right)
+
+        operator = expression.operator
+        return self._binary_operators[operator.type](operator, left, right)
+
+    def _add(self: Self, operator: Token, left: Any, right: Any) -> Any:
+        if type(left) is float and type(right) is float:
+            return left + right
+        if type(left) is str and type(right) is str:
+            self._budget.check_string_length(operator.line, len(left) + len(right))
+            self._allocations += 1
+            return left + right
+
+        raise LoxRuntimeError(
+            operator.line,
+            "Operands must be two numbers or two strings.",
+        )
+
+    def _evaluate_call(self: Self, expression: Call) -> Any:
+        callee_expression = expression.callee
+        # Methods called right where they are accessed are called on their
+        # receiver, without a bound method.
+        if type(callee_expression) is Get:
+            instance = self._evaluate(callee_expression.object)
+            entry = self._lookup(instance, callee_expression)
+            if type(entry) is int:
+                callee = instance.fields[entry]
+            else:
+                return self._call_method(expression, entry, instance)
+        elif type(callee_expression) is Super:
+            method, instance = self._lookup_super(callee_expression)
+            return self._call_method(expression, method, instance)
+        else:
+            callee = self._evaluate(callee_expression)
+
+        evaluate = self._evaluate
+        arguments = [evaluate(argument) for argument in expression.arguments]
+
+        if not isinstance(callee, LoxCallable):
+            raise LoxRuntimeError(
+                expression.paren.line,
+                "Can only call functions and classes.",
+            )
+
+        if len(arguments) != callee.arity():
+            raise LoxRuntimeError(
+                expression.paren.line,
+                f"Expected {callee.arity()} arguments but got {len(arguments)}.",
+            )
+
+        self._enter_call(expression.paren.line)
+        try:
+            if type(callee) is LoxFunction:
+                return self.call_function(callee, arguments)
+            if type(callee) is LoxClass:
+                self._allocations += 1
+
+            return callee.call(self, arguments)
+        except RecursionError:
+            raise LoxRuntimeError(
+                expression.paren.line,
+                "Stack overflow.",
+            ) from None
+        finally:
+            self._depth -= 1
+
+    def _call_method(
+        self: Self,
+        expression: Call,
+        method: LoxFunction,
+        instance: LoxInstance,
+    ) -> Any:
+        evaluate = self._evaluate
+        arguments = [evaluate(argument) for argument in expression.arguments]
+
+        arity = len(method.declaration.params)
+        if len(arguments) != arity:
+            raise LoxRuntimeError(
+                expression.paren.line,
+                f"Expected {arity} arguments but got {len(arguments)}.",
+            )
+
+        self._enter_call(expression.paren.line)
+        try:
+            return self.call_method(method, instance, arguments)
+        except RecursionError:
+            raise LoxRuntimeError(
+                expression.paren.line,
+                "Stack overflow.",
+            ) from None
+        finally:
+            self._depth -= 1
+
+    def _enter_call(self: Self, line: int) -> None:
+        # Counts a call as a step and as a level of depth, which the caller
+        # leaves once the call is over.
+        self._steps += 1
+        if self._steps == self._next_check:
+            self._next_check = self._budget.check(
+                line,
+                self._steps,
+                self._allocations,
+            )
+
+        if self._depth == self._budget.max_call_depth:
+            raise LoxRuntimeError(line, "Stack overflow.")
+        self._depth += 1
+
+    def _evaluate_get(self: Self, expression: Get) -> Any:
+        instance = self._evaluate(expression.object)
+        entry = self._lookup(instance, expression)
+        if type(entry) is int:
+            return instance.fields[entry]
+
+        self._allocations += 1
+        return BoundMethod(entry, instance)
+
+    def _lookup(self: Self, instance: Any, expression: Get) -> Any:
+        # Returns the index of a field of `instance`, or a method.
+        if type(instance) is not LoxInstance:
+            raise LoxRuntimeError(
+                expression.name.line,
+                "Only instances have properties.",
+            )
+
+        shape = instance.shape
+        cache = expression.cache
+        entry = cache.entry if shape is cache.key else cache.miss(shape, shape.lookup)
+
+        if entry is None:
+            raise LoxRuntimeError(
+                expression.name.line,
+                f"Undefined property '{expression.name.lexeme}'.",
+            )
+
+        return entry
+
+    def _evaluate_grouping(self: Self, expression: Grouping) -> Any:
+        return self._evaluate(expression.expression)
+
+    def _evaluate_literal(self: Self, expression: Literal) -> Any:
+        return expression.value
+
+    def _evaluate_logical(self: Self, expression: Logical) -> Any:
+        left = self._evaluate(expression.left)
+
+        if expression.operator.type is TokenType.OR:
+            if is_truthy(left):
+                return left
+        elif not is_truthy(left):
+            return left
+
+        return self._evaluate(expression.right)
+
+    def _evaluate_set(self: Self, expression: Set) -> Any:
+        instance = self._evaluate(expression.object)
+        if type(instance) is not LoxInstance:
+            raise LoxRuntimeError(expression.name.line, "Only instances have fields.")
+
+        value = self._evaluate(expression.value)
+
+        shape = instance.shape
+        cache = expression.cache
+        entry = cache.entry if shape is cache.key else cache.miss(shape, shape.setter)
+
+        if type(entry) is int:
+            instance.fields[entry] = value
+        else:
+            instance.shape = entry
+            instance.fields.append(value)
+
+        return value
+
+    def _evaluate_super(self: Self, expression: Super) -> Any:
+        method, instance = self._lookup_super(expression)
+        self._allocations += 1
+        return BoundMethod(method, instance)
+
+    def _lookup_super(self: Self, expression: Super) -> tuple[LoxFunction, Any]:
+        # `super` lives in the scope enclosing the method's, which starts with
+        # `this`.
+        environment = self._environment.ancestor(  # type: ignore[union-attr]
+            expression.depth - 1,
+        )
+        superclass = environment.ancestor(1).slots[expression.slot]
+        method = superclass.methods.get(expression.method.lexeme)
+        if method is None:
+            raise LoxRuntimeError(
+                expression.method.line,
+                f"Undefined property '{expression.method.lexeme}'.",
+            )
+
+        return method, environment.slots[0]
+
+    def _evaluate_this(self: Self, expression: This) -> Any:
+        environment = self._environment.ancestor(  # type: ignore[union-attr]
+            expression.depth,
+        )
+        return environment.slots[expression.slot]
+
+    def _evaluate_unary(self: Self, expression: Unary) -> Any:
+        right = self._evaluate(expression.right)
+
+        if expression.operator.type is TokenType.MINUS:
+            if type(right) is not float:
+                raise LoxRuntimeError(
+                    expression.operator.line,
+                    "Operand must be a number.",
+                )
+
+            return -right
+
+        return not is_truthy(right)
+
+    def _evaluate_variable(self: Self, expression: Variable) -> Any:
+        depth = expression.depth
+        if depth == 0:
+            return self._environment.slots[expression.slot]  # type: ignore[union-attr]
+        if depth > 0:
+            environment = self._environment.ancestor(depth)  # type: ignore[union-attr]
+            return environment.slots[expression.slot]
+
+        try:
+            return self.globals[expression.name.lexeme]
+        except KeyError:
+            name = expression.name
+            raise LoxRuntimeError(
+                name.line,
+                f"Undefined variable '{name.lexeme}'.",
+            ) from None
+
+    def _define(self: Self, name: Token, slot: int, value: Any) -> None:
+        if slot < 0:
+            self.globals[name.lexeme] = value
+        else:
+            self._environment.slots[slot] = value  # type: ignore[union-attr]
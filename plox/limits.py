@@ -0,0 +1,90 @@
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Final, Self
+
+from plox.errors import LoxRuntimeError
+
+# Calls that may be in progress at once before a script fails with a stack
+# overflow. The tree-walking interpreter raises the recursion limit of Python to
+# fit them.
+DEFAULT_MAX_CALL_DEPTH: Final = 4096
+
+# Steps between checks of the limits that are not checked where they apply.
+_CHECK_INTERVAL: Final = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class Limits:
+    # What a single run may use, with None for no limit. Steps are the loop
+    # iterations and calls a script makes, which bound how long any script
+    # runs. Allocations count the instances, functions, classes, bound methods
+    # and concatenated strings a script creates, which, with strings capped
+    # at `max_string_length` characters, roughly bounds its memory.
+    max_steps: int | None = None
+    timeout: float | None = None
+    max_string_length: int | None = None
+    max_call_depth: int = DEFAULT_MAX_CALL_DEPTH
+    max_allocations: int | None = None
+
+
+class Budget:
+    # Tracks a run against its limits. Engines count steps and allocations
+    # themselves, and only call `check` once the step count reaches the one it
+    # last returned, so that limits cost next to nothing while they are far.
+    __slots__ = (
+        "_deadline",
+        "_limits",
+        "_max_allocations",
+        "_max_steps",
+        "_max_string_length",
+        "max_call_depth",
+    )
+
+    def __init__(self: Self, limits: Limits) -> None:
+        self._limits = limits
+        self._max_steps = sys.maxsize if limits.max_steps is None else limits.max_steps
+        self._max_allocations = (
+            sys.maxsize if limits.max_allocations is None else limits.max_allocations
+        )
+        self._deadline = (
+            math.inf if limits.timeout is None else time.monotonic() + limits.timeout
+        )
+        self.max_call_depth = limits.max_call_depth
+        self._max_string_length = (
+            sys.maxsize
+            if limits.max_string_length is None
+            else limits.max_string_length
+        )
+
+    def next_check(self: Self, steps: int) -> int:
+        # The step count at which to check next. The step limit is checked
+        # right as it is exceeded.
+        return min(steps + _CHECK_INTERVAL, self._max_steps + 1)
+
+    def check(self: Self, line: int, steps: int, allocations: int) -> int:
+        if steps > self._max_steps:
+            raise LoxRuntimeError(
+                line,
+                f"Exceeded the limit of {self._max_steps} steps.",
+            )
+        if allocations > self._max_allocations:
+            raise LoxRuntimeError(
+                line,
+                f"Exceeded the limit of {self._max_allocations} allocations.",
+            )
+        if time.monotonic() > self._deadline:
+            raise LoxRuntimeError(
+                line,
+                f"Timed out after {self._limits.timeout} seconds.",
+            )
+
+        return self.next_check(steps)
+
+    def check_string_length(self: Self, line: int, length: int) -> None:
+        if length > self._max_string_length:
+            raise LoxRuntimeError(
+                line,
+                f"Strings can't be longer than {self._max_string_length} characters.",
+            )
@@ -0,0 +1,283 @@
+import operator
+import sys
+from collections.abc import Callable
+from typing import Any, Final, Self
+
+from plox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    Get,
+    Grouping,
+    Literal,
+    Logical,
+    Set,
+    Super,
+    This,
+    Unary,
+    Variable,
+)
+from plox.runtime import is_equal, is_truthy
+from plox.stmt import (
+    Block,
+    Class,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
+from plox.token_type import TokenType
+
+# Operators on two numbers. Division is left out when the divisor is zero, and
+# operands of any other type are never folded, so that the error they raise
+# still happens at runtime.
+_NUMBER_OPERATORS: Final[dict[TokenType, Callable[[float, float], Any]]] = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+# Returned by `_fold_binary` for operands it must not fold.
+_NOT_FOLDED: Final = object()
+
+
+def _fold_binary(
+    operator_type: TokenType,
+    left: Any,
+    right: Any,
+    max_string_length: int,
+) -> Any:
+    if operator_type is TokenType.EQUAL_EQUAL:
+        return is_equal(left, right)
+    if operator_type is TokenType.BANG_EQUAL:
+        return not is_equal(left, right)
+
+    if type(left) is float and type(right) is float:
+        if operator_type is TokenType.SLASH and right == 0:
+            return _NOT_FOLDED
+
+        return _NUMBER_OPERATORS[operator_type](left, right)
+
+    # A string beyond the length limit is left for the engine to reject.
+    if (
+        operator_type is TokenType.PLUS
+        and type(left) is str
+        and type(right) is str
+        and len(left) + len(right) <= max_string_length
+    ):
+        return left + right
+
+    return _NOT_FOLDED
+
+
+class Optimizer:
+    # A pass over resolved syntax trees that folds constant expressions and
+    # drops code that can never run. It only ever replaces nodes with
+    # equivalent ones or removes statements, so the scopes and slots the
+    # resolver assigned stay valid, and expressions that would raise a runtime
+    # error are kept as they are.
+    def __init__(self: Self, *, max_string_length: int | None = None) -> None:
+        self._max_string_length = (
+            sys.maxsize if max_string_length is None else max_string_length
+        )
+        self._expression_optimizers: dict[type[Expr], Callable[[Any], Expr]] = {
+            Assign: self._optimize_assign,
+            Binary: self._optimize_binary,
+            Call: self._optimize_call,
+            Get: self._optimize_get,
+            Grouping: self._optimize_grouping,
+            Literal: self._optimize_leaf,
+            Logical: self._optimize_logical,
+            Set: self._optimize_set,
+            Super: self._optimize_leaf,
+            This: self._optimize_leaf,
+            Unary: self._optimize_unary,
+            Variable: self._optimize_leaf,
+        }
+        self._statement_optimizers: dict[type[Stmt], Callable[[Any], Stmt | None]] = {
+            Block: self._optimize_block,
+            Class: self._optimize_class,
+            Expression: self._optimize_expression_statement,
+            Function: self._optimize_function,
+            If: self._optimize_if,
+            Print: self._optimize_print,
+            Return: self._optimize_return,
+            Var: self._optimize_var,
+            While: self._optimize_while,
+        }
+
+    def optimize(self: Self, statements: list[Stmt]) -> list[Stmt]:
+        optimized = []
+        for statement in statements:
+            result = self._optimize_statement(statement)
+            if result is not None:
+                optimized.append(result)
+            # Nothing after a return runs.
+            if type(result) is Return:
+                break
+
+        return optimized
+
+    def _optimize_statement(self: Self, statement: Stmt) -> Stmt | None:
+        # Returns None for a statement that can be removed.
+        return self._statement_optimizers[type(statement)](statement)
+
+    def _optimize_expression(self: Self, expression: Expr) -> Expr:
+        return self._expression_optimizers[type(expression)](expression)
+
+    def _optimize_branch(self: Self, statement: Stmt) -> Stmt:
+        # A branch of an `if` or the body of a loop cannot be removed, only
+        # emptied.
+        result = self._optimize_statement(statement)
+        return Block(statements=[]) if result is None else result
+
+    def _optimize_block(self: Self, statement: Block) -> Stmt | None:
+        statement.statements = self.optimize(statement.statements)
+        if not statement.statements:
+            return None
+
+        return statement
+
+    def _optimize_class(self: Self, statement: Class) -> Stmt:
+        for method in statement.methods:
+            self._optimize_function(method)
+
+        return statement
+
+    def _optimize_expression_statement(
+        self: Self,
+        statement: Expression,
+    ) -> Stmt | None:
+        statement.expression = self._optimize_expression(statement.expression)
+        if type(statement.expression) is Literal:
+            return None
+
+        return statement
+
+    def _optimize_function(self: Self, statement: Function) -> Stmt:
+        statement.body = self.optimize(statement.body)
+        return statement
+
+    def _optimize_if(self: Self, statement: If) -> Stmt | None:
+        condition = self._optimize_expression(statement.condition)
+        if type(condition) is Literal:
+            if is_truthy(condition.value):
+                return self._optimize_statement(statement.then_branch)
+            if statement.else_branch is not None:
+                return self._optimize_statement(statement.else_branch)
+
+            return None
+
+        statement.condition = condition
+        statement.then_branch = self._optimize_branch(statement.then_branch)
+        if statement.else_branch is not None:
+            statement.else_branch = self._optimize_statement(statement.else_branch)
+
+        return statement
+
+    def _optimize_print(self: Self, statement: Print) -> Stmt:
+        statement.expression = self._optimize_expression(statement.expression)
+        return statement
+
+    def _optimize_return(self: Self, statement: Return) -> Stmt:
+        if statement.value is not None:
+            statement.value = self._optimize_expression(statement.value)
+
+        return statement
+
+    def _optimize_var(self: Self, statement: Var) -> Stmt:
+        if statement.initializer is not None:
+            statement.initializer = self._optimize_expression(statement.initializer)
+
+        return statement
+
+    def _optimize_while(self: Self, statement: While) -> Stmt | None:
+        statement.condition = self._optimize_expression(statement.condition)
+        if type(statement.condition) is Literal and not is_truthy(
+            statement.condition.value,
+        ):
+            return None
+
+        statement.body = self._optimize_branch(statement.body)
+        return statement
+
+    def _optimize_assign(self: Self, expression: Assign) -> Expr:
+        expression.value = self._optimize_expression(expression.value)
+        return expression
+
+    def _optimize_binary(self: Self, expression: Binary) -> Expr:
+        left = expression.left = self._optimize_expression(expression.left)
+        right = expression.right = self._optimize_expression(expression.right)
+
+        if type(left) is Literal and type(right) is Literal:
+            value = _fold_binary(
+                expression.operator.type,
+                left.value,
+                right.value,
+                self._max_string_length,
+            )
+            if value is not _NOT_FOLDED:
+                return Literal(value=value, line=expression.operator.line)
+
+        return expression
+
+    def _optimize_call(self: Self, expression: Call) -> Expr:
+        expression.callee = self._optimize_expression(expression.callee)
+        expression.arguments = [
+            self._optimize_expression(argument) for argument in expression.arguments
+        ]
+        return expression
+
+    def _optimize_get(self: Self, expression: Get) -> Expr:
+        expression.object = self._optimize_expression(expression.object)
+        return expression
+
+    def _optimize_grouping(self: Self, expression: Grouping) -> Expr:
+        # Parentheses only matter to the parser.
+        return self._optimize_expression(expression.expression)
+
+    def _optimize_leaf(self: Self, expression: Expr) -> Expr:
+        return expression
+
+    def _optimize_logical(self: Self, expression: Logical) -> Expr:
+        left = self._optimize_expression(expression.left)
+        right = self._optimize_expression(expression.right)
+
+        if type(left) is Literal:
+            # The right operand is only evaluated when the left one does not
+            # decide the result, and its value is the result then.
+            if is_truthy(left.value) is (expression.operator.type is TokenType.OR):
+                return left
+
+            return right
+
+        expression.left = left
+        expression.right = right
+        return expression
+
+    def _optimize_set(self: Self, expression: Set) -> Expr:
+        expression.object = self._optimize_expression(expression.object)
+        expression.value = self._optimize_expression(expression.value)
+        return expression
+
+    def _optimize_unary(self: Self, expression: Unary) -> Expr:
+        right = expression.right = self._optimize_expression(expression.right)
+
+        if type(right) is Literal:
+            line = expression.operator.line
+            if expression.operator.type is TokenType.BANG:
+                return Literal(value=not is_truthy(right.value), line=line)
+            if type(right.value) is float:
+                return Literal(value=-right.value, line=line)
+
+        return expression
@@ -0,0 +1,474 @@
+from collections.abc import Callable, Iterable
+from typing import Final, Self
+
+from plox.errors import ErrorReporter
+from plox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    Get,
+    Grouping,
+    Literal,
+    Logical,
+    Set,
+    Super,
+    This,
+    Unary,
+    Variable,
+)
+from plox.stmt import (
+    Block,
+    Class,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
+from plox.token import Token
+from plox.token_type import TokenType
+
+_MAX_ARGUMENTS: Final = 255
+
+# Operator sets, built once rather than on every match.
+_EQUALITY_OPERATORS: Final = frozenset({TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL})
+_COMPARISON_OPERATORS: Final = frozenset(
+    {
+        TokenType.GREATER,
+        TokenType.GREATER_EQUAL,
+        TokenType.LESS,
+        TokenType.LESS_EQUAL,
+    },
+)
+_TERM_OPERATORS: Final = frozenset({TokenType.MINUS, TokenType.PLUS})
+_FACTOR_OPERATORS: Final = frozenset({TokenType.SLASH, TokenType.STAR})
+_UNARY_OPERATORS: Final = frozenset({TokenType.BANG, TokenType.MINUS})
+_LITERALS: Final = frozenset({TokenType.NUMBER, TokenType.STRING})
+_KEYWORD_LITERALS: Final = {
+    TokenType.FALSE: False,
+    TokenType.TRUE: True,
+    TokenType.NIL: None,
+}
+# Tokens that start a statement, where parsing resumes after an error.
+_STATEMENT_STARTS: Final = frozenset(
+    {
+        TokenType.CLASS,
+        TokenType.FUN,
+        TokenType.VAR,
+        TokenType.FOR,
+        TokenType.IF,
+        TokenType.WHILE,
+        TokenType.PRINT,
+        TokenType.RETURN,
+    },
+)
+
+
+class ParseError(Exception):
+    pass
+
+
+class Parser:
+    # Only ever looks at the current and the previous token, so tokens are
+    # pulled from `tokens` as parsing goes.
+    def __init__(
+        self: Self,
+        tokens: Iterable[Token],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        self._tokens = iter(tokens)
+        self._error_reporter = error_reporter
+
+        self._current = next(self._tokens)
+        self._previous = self._current
+
+        # Statements that start with a keyword, by that keyword.
+        self._statement_parsers: dict[TokenType, Callable[[], Stmt]] = {
+            TokenType.FOR: self._for_statement,
+            TokenType.IF: self._if_statement,
+            TokenType.PRINT: self._print_statement,
+            TokenType.RETURN: self._return_statement,
+            TokenType.WHILE: self._while_statement,
+            TokenType.LEFT_BRACE: self._block_statement,
+        }
+
+    def parse(self: Self) -> list[Stmt]:
+        statements = []
+        while not self._is_at_end():
+            statement = self._declaration()
+            if statement is not None:
+                statements.append(statement)
+
+        return statements
+
+    def _declaration(self: Self) -> Stmt | None:
+        try:
+            if self._match(TokenType.CLASS):
+                return self._class_declaration()
+            if self._match(TokenType.FUN):
+                return self._function("function")
+            if self._match(TokenType.VAR):
+                return self._var_declaration()
+
+            return self._statement()
+        except ParseError:
+            self._synchronize()
+            return None
+
+    def _class_declaration(self: Self) -> Class:
+        name = self._consume(TokenType.IDENTIFIER, "Expect class name.")
+
+        superclass = None
+        if self._match(TokenType.LESS):
+            self._consume(TokenType.IDENTIFIER, "Expect superclass name.")
+            superclass = Variable(name=self._previous)
+
+        self._consume(TokenType.LEFT_BRACE, "Expect '{' before class body.")
+
+        methods = []
+        while not self._check(TokenType.RIGHT_BRACE) and not self._is_at_end():
+            methods.append(self._function("method"))
+
+        self._consume(TokenType.RIGHT_BRACE, "Expect '}' after class body.")
+
+        return Class(name=name, superclass=superclass, methods=methods)
+
+    def _function(self: Self, kind: str) -> Function:
+        name = self._consume(TokenType.IDENTIFIER, f"Expect {kind} name.")
+        self._consume(TokenType.LEFT_PAREN, f"Expect '(' after {kind} name.")
+
+        params = []
+        if not self._check(TokenType.RIGHT_PAREN):
+            while True:
+                if len(params) >= _MAX_ARGUMENTS:
+                    self._error(
+                        self._peek(),
+                        f"Can't have more than {_MAX_ARGUMENTS} parameters.",
+                    )
+
+                params.append(
+                    self._consume(TokenType.IDENTIFIER, "Expect parameter name."),
+                )
+
+                if not self._match(TokenType.COMMA):
+                    break
+
+        self._consume(TokenType.RIGHT_PAREN, "Expect ')' after parameters.")
+        self._consume(TokenType.LEFT_BRACE, f"Expect '{{' before {kind} body.")
+
+        return Function(name=name, params=params, body=self._block())
+
+    def _var_declaration(self: Self) -> Var:
+        name = self._consume(TokenType.IDENTIFIER, "Expect variable name.")
+
+        initializer = None
+        if self._match(TokenType.EQUAL):
+            initializer = self._expression()
+
+        self._consume(TokenType.SEMICOLON, "Expect ';' after variable declaration.")
+
+        return Var(name=name, initializer=initializer)
+
+    def _statement(self: Self) -> Stmt:
+        parse = self._statement_parsers.get(self._current.type)
+        if parse is None:
+            return self._expression_statement()
+
+        self._advance()
+        return parse()
+
+    def _for_statement(self: Self) -> Stmt:
+        # Desugars into a while loop.
+        keyword = self._previous
+        self._consume(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
+
+        initializer: Stmt | None
+        if self._match(TokenType.SEMICOLON):
+            initializer = None
+        elif self._match(TokenType.VAR):
+            initializer = self._var_declaration()
+        else:
+            initializer = self._expression_statement()
+
+        condition = None
+        if not self._check(TokenType.SEMICOLON):
+            condition = self._expression()
+        self._consume(TokenType.SEMICOLON, "Expect ';' after loop condition.")
+
+        increment = None
+        if not self._check(TokenType.RIGHT_PAREN):
+            increment = self._expression()
+        self._consume(TokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
+
+        body = self._statement()
+
+        if increment is not None:
+            body = Block(statements=[body, Expression(expression=increment)])
+
+        if condition is None:
+            condition = Literal(value=True, line=keyword.line)
+        body = While(keyword=keyword, condition=condition, body=body)
+
+        if initializer is not None:
+            body = Block(statements=[initializer, body])
+
+        return body
+
+    def _if_statement(self: Self) -> If:
+        self._consume(TokenType.LEFT_PAREN, "Expect '(' after 'if'.")
+        condition = self._expression()
+        self._consume(TokenType.RIGHT_PAREN, "Expect ')' after if condition.")
+
+        then_branch = self._statement()
+        else_branch = None
+        if self._match(TokenType.ELSE):
+            else_branch = self._statement()
+
+        return If(
+            condition=condition,
+            then_branch=then_branch,
+            else_branch=else_branch,
+        )
+
+    def _print_statement(self: Self) -> Print:
+        value = self._expression()
+        self._consume(TokenType.SEMICOLON, "Expect ';' after value.")
+        return Print(expression=value)
+
+    def _return_statement(self: Self) -> Return:
+        keyword = self._previous
+
+        value = None
+        if not self._check(TokenType.SEMICOLON):
+            value = self._expression()
+
+        self._consume(TokenType.SEMICOLON, "Expect ';' after return value.")
+        return Return(keyword=keyword, value=value)
+
+    def _while_statement(self: Self) -> While:
+        keyword = self._previous
+        self._consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
+        condition = self._expression()
+        self._consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
+
+        return While(keyword=keyword, condition=condition, body=self._statement())
+
+    def _block_statement(self: Self) -> Block:
+        return Block(statements=self._block())
+
+    def _block(self: Self) -> list[Stmt]:
+        statements = []
+        while not self._check(TokenType.RIGHT_BRACE) and not self._is_at_end():
+            statement = self._declaration()
+            if statement is not None:
+                statements.append(statement)
+
+        self._consume(TokenType.RIGHT_BRACE, "Expect '}' after block.")
+        return statements
+
+    def _expression_statement(self: Self) -> Expression:
+        expression = self._expression()
+        self._consume(TokenType.SEMICOLON, "Expect ';' after expression.")
+        return Expression(expression=expression)
+
+    def _expression(self: Self) -> Expr:
+        return self._assignment()
+
+    def _assignment(self: Self) -> Expr:
+        expression = self._or()
+
+        if self._match(TokenType.EQUAL):
+            equals = self._previous
+            value = self._assignment()
+
+            if isinstance(expression, Variable):
+                return Assign(name=expression.name, value=value)
+            if isinstance(expression, Get):
+                return Set(object=expression.object, name=expression.name, value=value)
+
+            self._error(equals, "Invalid assignment target.")
+
+        return expression
+
+    def _or(self: Self) -> Expr:
+        expression = self._and()
+
+        while self._match(TokenType.OR):
+            operator = self._previous
+            right = self._and()
+            expression = Logical(left=expression, operator=operator, right=right)
+
+        return expression
+
+    def _and(self: Self) -> Expr:
+        expression = self._equality()
+
+        while self._match(TokenType.AND):
+            operator = self._previous
+            right = self._equality()
+            expression = Logical(left=expression, operator=operator, right=right)
+
+        return expression
+
+    def _equality(self: Self) -> Expr:
+        expression = self._comparison()
+
+        while self._match_any(_EQUALITY_OPERATORS):
+            operator = self._previous
+            right = self._comparison()
+            expression = Binary(left=expression, operator=operator, right=right)
+
+        return expression
+
+    def _comparison(self: Self) -> Expr:
+        expression = self._term()
+
+        while self._match_any(_COMPARISON_OPERATORS):
+            operator = self._previous
+            right = self._term()
+            expression = Binary(left=expression, operator=operator, right=right)
+
+        return expression
+
+    def _term(self: Self) -> Expr:
+        expression = self._factor()
+
+        while self._match_any(_TERM_OPERATORS):
+            operator = self._previous
+            right = self._factor()
+            expression = Binary(left=expression, operator=operator, right=right)
+
+        return expression
+
+    def _factor(self: Self) -> Expr:
+        expression = self._unary()
+
+        while self._match_any(_FACTOR_OPERATORS):
+            operator = self._previous
+            right = self._unary()
+            expression = Binary(left=expression, operator=operator, right=right)
+
+        return expression
+
+    def _unary(self: Self) -> Expr:
+        if self._match_any(_UNARY_OPERATORS):
+            operator = self._previous
+            right = self._unary()
+            return Unary(operator=operator, right=right)
+
+        return self._call()
+
+    def _call(self: Self) -> Expr:
+        expression = self._primary()
+
+        while True:
+            if self._match(TokenType.LEFT_PAREN):
+                expression = self._finish_call(expression)
+            elif self._match(TokenType.DOT):
+                name = self._consume(
+                    TokenType.IDENTIFIER,
+                    "Expect property name after '.'.",
+                )
+                expression = Get(object=expression, name=name)
+            else:
+                return expression
+
+    def _finish_call(self: Self, callee: Expr) -> Expr:
+        arguments = []
+        if not self._check(TokenType.RIGHT_PAREN):
+            while True:
+                if len(arguments) >= _MAX_ARGUMENTS:
+                    self._error(
+                        self._peek(),
+                        f"Can't have more than {_MAX_ARGUMENTS} arguments.",
+                    )
+
+                arguments.append(self._expression())
+
+                if not self._match(TokenType.COMMA):
+                    break
+
+        paren = self._consume(TokenType.RIGHT_PAREN, "Expect ')' after arguments.")
+
+        return Call(callee=callee, paren=paren, arguments=arguments)
+
+    def _primary(self: Self) -> Expr:
+        if self._current.type in _KEYWORD_LITERALS:
+            keyword = self._advance()
+            return Literal(value=_KEYWORD_LITERALS[keyword.type], line=keyword.line)
+        if self._match_any(_LITERALS):
+            return Literal(value=self._previous.literal, line=self._previous.line)
+        if self._match(TokenType.SUPER):
+            keyword = self._previous
+            self._consume(TokenType.DOT, "Expect '.' after 'super'.")
+            method = self._consume(
+                TokenType.IDENTIFIER,
+                "Expect superclass method name.",
+            )
+            return Super(keyword=keyword, method=method)
+        if self._match(TokenType.THIS):
+            return This(keyword=self._previous)
+        if self._match(TokenType.IDENTIFIER):
+            return Variable(name=self._previous)
+        if self._match(TokenType.LEFT_PAREN):
+            expression = self._expression()
+            self._consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
+            return Grouping(expression=expression)
+
+        raise self._error(self._peek(), "Expect expression.")
+
+    def _match(self: Self, token_type: TokenType) -> bool:
+        if self._current.type is token_type:
+            self._advance()
+            return True
+
+        return False
+
+    def _match_any(self: Self, token_types: frozenset[TokenType]) -> bool:
+        if self._current.type in token_types:
+            self._advance()
+            return True
+
+        return False
+
+    def _consume(self: Self, token_type: TokenType, message: str) -> Token:
+        if self._check(token_type):
+            return self._advance()
+
+        raise self._error(self._peek(), message)
+
+    def _check(self: Self, token_type: TokenType) -> bool:
+        return self._current.type is token_type
+
+    def _advance(self: Self) -> Token:
+        self._previous = self._current
+        if not self._is_at_end():
+            self._current = next(self._tokens)
+
+        return self._previous
+
+    def _is_at_end(self: Self) -> bool:
+        return self._current.type is TokenType.EOF
+
+    def _peek(self: Self) -> Token:
+        return self._current
+
+    def _error(self: Self, token: Token, message: str) -> ParseError:
+        self._error_reporter.token_error(token, message)
+        return ParseError()
+
+    def _synchronize(self: Self) -> None:
+        self._advance()
+
+        while not self._is_at_end():
+            if self._previous.type is TokenType.SEMICOLON:
+                return
+
+            if self._current.type in _STATEMENT_STARTS:
+                return
+
+            self._advance()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+from plox.parser import Parser
+from plox.resolver import Resolver
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from plox.chunk import CompiledFunction
+    from plox.errors import ErrorReporter
+    from plox.optimizer import Optimizer
+    from plox.profiling import Profile
+    from plox.stmt import Stmt
+    from plox.token import Token
+
+
+class Engine(Enum):
+    TREE = "tree"
+    VM = "vm"
+
+
+def compile_program(
+    tokens: Iterable[Token],
+    error_reporter: ErrorReporter,
+    engine: Engine,
+    optimizer: Optimizer | None = None,
+    profile: Profile | None = None,
+) -> list[Stmt] | CompiledFunction | None:
+    # Turns tokens into a program for `engine`: parses and resolves them,
+    # optimizes the statements unless there is no optimizer, and compiles them
+    # for the VM. Returns None as soon as a phase reports errors, since what
+    # follows would only trip over them.
+    statements = run_phase(profile, "parse", Parser(tokens, error_reporter).parse)
+    if error_reporter.had_error is True:
+        return None
+
+    run_phase(profile, "resolve", Resolver(error_reporter).resolve, statements)
+    if error_reporter.had_error is True:
+        return None
+
+    if optimizer is not None:
+        statements = run_phase(profile, "optimize", optimizer.optimize, statements)
+
+    if engine is Engine.TREE:
+        return statements
+
+    # The compiler takes longer to import than a small script takes to run on
+    # the tree-walking interpreter.
+    from plox.compiler import Compiler
+
+    function = run_phase(
+        profile,
+        "compile",
+        Compiler(error_reporter).compile,
+        statements,
+    )
+    return None if error_reporter.had_error is True else function
+
+
+def run_phase(
+    profile: Profile | None,
+    name: str,
+    function: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    # Calls `function`, adding the time it took to `profile` as phase `name`.
+    if profile is None:
+        return function(*args, **kwargs)
+
+    scan_seconds = profile.scan_seconds
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    # Tokens are scanned lazily, while they are parsed.
+    scanning = profile.scan_seconds - scan_seconds
+    profile.add_phase(name, elapsed - scanning)
+    return result
@@ -0,0 +1,95 @@
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+from plox.token_type import TokenType
+
+
+@dataclass(slots=True)
+class Profile:
+    # Collects what scanners and Lox do while they are given a profile. Code
+    # that is not profiled does not look at it at all.
+    token_counts: Counter[TokenType] = field(default_factory=Counter)
+    # Time spent in each step of the classic scanner. The regex engine only
+    # gets there for lexemes its pattern does not cover.
+    sub_scanner_seconds: dict[str, float] = field(default_factory=dict)
+    error_count: int = 0
+    # Characters scanned, or bytes of byte sources.
+    scanned: int = 0
+    scan_seconds: float = 0.0
+    # Time spent in each phase of running a script, not including scanning.
+    phase_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def scanned_per_second(self: Self) -> float:
+        if self.scan_seconds == 0:
+            return 0.0
+
+        return self.scanned / self.scan_seconds
+
+    def timed(
+        self: Self,
+        name: str,
+        function: Callable[..., Any],
+    ) -> Callable[..., Any]:
+        # Wraps `function` to add the time spent in it to a sub-scanner.
+        seconds = self.sub_scanner_seconds
+        seconds.setdefault(name, 0.0)
+        perf_counter = time.perf_counter
+
+        def timed_function(*args: Any) -> Any:
+            start = perf_counter()
+            try:
+                return function(*args)
+            finally:
+                seconds[name] += perf_counter() - start
+
+        return timed_function
+
+    def add_phase(self: Self, name: str, seconds: float) -> None:
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+
+    def as_dict(self: Self) -> dict[str, Any]:
+        return {
+            "token_counts": {
+                token_type.name: count
+                for token_type, count in self.token_counts.most_common()
+            },
+            "sub_scanner_seconds": dict(self.sub_scanner_seconds),
+            "error_count": self.error_count,
+            "scanned": self.scanned,
+            "scan_seconds": self.scan_seconds,
+            "scanned_per_second": self.scanned_per_second,
+            "phase_seconds": dict(self.phase_seconds),
+        }
+
+    def report(self: Self) -> str:
+        lines = [
+            f"scanned {self.scanned:,} characters in {self.scan_seconds:.6f} s "
+            f"({self.scanned_per_second:,.0f}/s), {self.error_count} errors",
+        ]
+
+        if self.sub_scanner_seconds:
+            lines.append("sub-scanners:")
+            lines.extend(
+                f"  {name:<20} {seconds:.6f} s"
+                for name, seconds in self.sub_scanner_seconds.items()
+            )
+
+        if self.phase_seconds:
+            lines.append("phases:")
+            lines.extend(
+                f"  {name:<20} {seconds:.6f} s"
+                for name, seconds in self.phase_seconds.items()
+            )
+
+        if self.token_counts:
+            lines.append("tokens:")
+            lines.extend(
+                f"  {token_type.name:<20} {count:>10,}"
+                for token_type, count in self.token_counts.most_common()
+            )
+
+        return "\n".join(lines)
@@ -0,0 +1,220 @@
+import hashlib
+import pathlib
+import struct
+import sys
+from array import array
+from typing import Final, Self
+
+from plox.cache_directory import CacheDirectory
+from plox.chunk import BYTECODE_VERSION, CompiledFunction
+from plox.inline_cache import InlineCache
+
+_MAGIC: Final = b"PLXC"
+_FORMAT_VERSION: Final = 1
+# Magic and format version.
+_HEADER: Final = struct.Struct("<4sH")
+# Arity, upvalue count, code length and constant count of a function.
+_FUNCTION: Final = struct.Struct("<IIII")
+_LENGTH: Final = struct.Struct("<I")
+_NUMBER: Final = struct.Struct("<d")
+# The length that marks a missing function name.
+_NO_NAME: Final = 0xFFFFFFFF
+
+# Tags of constants.
+_NUMBER_TAG: Final = 0
+_STRING_TAG: Final = 1
+_FUNCTION_TAG: Final = 2
+_INLINE_CACHE_TAG: Final = 3
+
+_DEFAULT_MAX_SIZE: Final = 256 * 1024 * 1024
+
+
+class ProgramCache:
+    # Persists compiled programs in a directory, one .loxc file per source,
+    # named by a hash of the source, the bytecode version and whether the
+    # program was optimized. A source that changes gets a new entry, and stale
+    # ones are evicted like any other.
+    def __init__(
+        self: Self,
+        directory: str | pathlib.Path,
+        max_size: int = _DEFAULT_MAX_SIZE,
+    ) -> None:
+        self._directory = CacheDirectory(directory, ".loxc", max_size)
+
+    def load(
+        self: Self,
+        source: str,
+        *,
+        optimize: bool,
+        max_string_length: int | None = None,
+    ) -> CompiledFunction | None:
+        path = self._entry_path(
+            source,
+            optimize=optimize,
+            max_string_length=max_string_length,
+        )
+        data = self._directory.read(path)
+        if data is None:
+            return None
+
+        function = _decode(data)
+        if function is None:
+            # A corrupt entry is simply replaced.
+            path.unlink(missing_ok=True)
+
+        return function
+
+    def store(
+        self: Self,
+        source: str,
+        function: CompiledFunction,
+        *,
+        optimize: bool,
+        max_string_length: int | None = None,
+    ) -> None:
+        path = self._entry_path(
+            source,
+            optimize=optimize,
+            max_string_length=max_string_length,
+        )
+        self._directory.write(path, _encode(function))
+
+    def _entry_path(
+        self: Self,
+        source: str,
+        *,
+        optimize: bool,
+        max_string_length: int | None,
+    ) -> pathlib.Path:
+        digest = hashlib.sha256()
+        # Code and lines are stored in the native byte order and item sizes.
+        # The optimizer only folds strings up to the length limit.
+        digest.update(
+            f"{BYTECODE_VERSION}:{optimize}:{max_string_length}:{sys.byteorder}:"
+            f"{array('H').itemsize}:{array('I').itemsize}:".encode(),
+        )
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return self._directory.entry_path(digest.hexdigest())
+
+
+def _encode_string(value: str, parts: list[bytes]) -> None:
+    encoded = value.encode("utf-8", "surrogatepass")
+    parts.append(_LENGTH.pack(len(encoded)))
+    parts.append(encoded)
+
+
+def _encode_function(function: CompiledFunction, parts: list[bytes]) -> None:
+    if function.name is None:
+        parts.append(_LENGTH.pack(_NO_NAME))
+    else:
+        _encode_string(function.name, parts)
+
+    chunk = function.chunk
+    parts.append(
+        _FUNCTION.pack(
+            function.arity,
+            function.upvalue_count,
+            len(chunk.code),
+            len(chunk.constants),
+        ),
+    )
+    parts.append(chunk.code.tobytes())
+    parts.append(chunk.lines.tobytes())
+
+    for constant in chunk.constants:
+        if type(constant) is float:
+            parts.append(bytes([_NUMBER_TAG]))
+            parts.append(_NUMBER.pack(constant))
+        elif type(constant) is str:
+            parts.append(bytes([_STRING_TAG]))
+            _encode_string(constant, parts)
+        elif type(constant) is CompiledFunction:
+            parts.append(bytes([_FUNCTION_TAG]))
+            _encode_function(constant, parts)
+        else:
+            # Caches start out empty in every process.
+            parts.append(bytes([_INLINE_CACHE_TAG]))
+            _encode_string(constant.name, parts)
+
+
+def _encode(function: CompiledFunction) -> bytes:
+    parts = [_HEADER.pack(_MAGIC, _FORMAT_VERSION)]
+    _encode_function(function, parts)
+    return b"".join(parts)
+
+
+class _CorruptEntryError(Exception):
+    pass
+
+
+class _Reader:
+    __slots__ = ("_data", "_offset")
+
+    def __init__(self: Self, data: bytes, offset: int) -> None:
+        self._data = data
+        self._offset = offset
+
+    def at_end(self: Self) -> bool:
+        return self._offset == len(self._data)
+
+    def take(self: Self, size: int) -> bytes:
+        if len(self._data) < self._offset + size:
+            raise _CorruptEntryError
+
+        data = self._data[self._offset : self._offset + size]
+        self._offset += size
+        return data
+
+    def unpack(self: Self, structure: struct.Struct) -> tuple[int, ...]:
+        return structure.unpack(self.take(structure.size))
+
+    def string(self: Self, length: int) -> str:
+        return self.take(length).decode("utf-8", "surrogatepass")
+
+
+def _decode_function(reader: _Reader) -> CompiledFunction:
+    (name_length,) = reader.unpack(_LENGTH)
+    name = None if name_length == _NO_NAME else reader.string(name_length)
+    arity, upvalue_count, code_length, constant_count = reader.unpack(_FUNCTION)
+
+    function = CompiledFunction(name, arity)
+    function.upvalue_count = upvalue_count
+    chunk = function.chunk
+    chunk.code.frombytes(reader.take(code_length * chunk.code.itemsize))
+    chunk.lines.frombytes(reader.take(code_length * chunk.lines.itemsize))
+
+    constants = chunk.constants
+    for _ in range(constant_count):
+        (tag,) = reader.take(1)
+        if tag == _NUMBER_TAG:
+            constants.append(reader.unpack(_NUMBER)[0])
+        elif tag == _STRING_TAG:
+            constants.append(reader.string(reader.unpack(_LENGTH)[0]))
+        elif tag == _FUNCTION_TAG:
+            constants.append(_decode_function(reader))
+        elif tag == _INLINE_CACHE_TAG:
+            constants.append(InlineCache(reader.string(reader.unpack(_LENGTH)[0])))
+        else:
+            raise _CorruptEntryError
+
+    return function
+
+
+def _decode(data: bytes) -> CompiledFunction | None:
+    if len(data) < _HEADER.size:
+        return None
+
+    magic, version = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        return None
+
+    reader = _Reader(data, _HEADER.size)
+    try:
+        function = _decode_function(reader)
+    except (_CorruptEntryError, UnicodeDecodeError):
+        return None
+
+    if not reader.at_end():
+        return None
+
+    return function
@@ -0,0 +1,317 @@
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Self
+
+from plox.errors import ErrorReporter
+from plox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    Get,
+    Grouping,
+    Literal,
+    Logical,
+    Set,
+    Super,
+    This,
+    Unary,
+    Variable,
+)
+from plox.stmt import (
+    Block,
+    Class,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
+from plox.token import Token
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class FunctionType(Enum):
+    NONE = "none"
+    FUNCTION = "function"
+    METHOD = "method"
+    INITIALIZER = "initializer"
+
+
+class ClassType(Enum):
+    NONE = "none"
+    CLASS = "class"
+    SUBCLASS = "subclass"
+
+
+class _Scope:
+    __slots__ = ("defined", "slots")
+
+    def __init__(self: Self) -> None:
+        # Maps variable names to their slots.
+        self.slots: dict[str, int] = {}
+        # Names whose initializer has been resolved.
+        self.defined: set[str] = set()
+
+
+class Resolver:
+    # A static pass over the syntax tree that binds every local variable
+    # access to a scope depth and a slot index, so the interpreter can address
+    # variables without looking up names.
+    def __init__(self: Self, error_reporter: ErrorReporter) -> None:
+        self._error_reporter = error_reporter
+        self._scopes: list[_Scope] = []
+        # The functions being resolved, with the index of their own scope.
+        self._functions: list[tuple[Function, int]] = []
+        self._current_function = FunctionType.NONE
+        self._current_class = ClassType.NONE
+
+        self._expression_resolvers: dict[type[Expr], Callable[[Any], None]] = {
+            Assign: self._resolve_assign,
+            Binary: self._resolve_binary,
+            Call: self._resolve_call,
+            Get: self._resolve_get,
+            Grouping: self._resolve_grouping,
+            Literal: self._resolve_literal,
+            Logical: self._resolve_binary,
+            Set: self._resolve_set,
+            Super: self._resolve_super,
+            This: self._resolve_this,
+            Unary: self._resolve_unary,
+            Variable: self._resolve_variable,
+        }
+        self._statement_resolvers: dict[type[Stmt], Callable[[Any], None]] = {
+            Block: self._resolve_block,
+            Class: self._resolve_class,
+            Expression: self._resolve_expression_statement,
+            Function: self._resolve_function_statement,
+            If: self._resolve_if,
+            Print: self._resolve_expression_statement,
+            Return: self._resolve_return,
+            Var: self._resolve_var,
+            While: self._resolve_while,
+        }
+
+    def resolve(self: Self, statements: list[Stmt]) -> None:
+        for statement in statements:
+            self._resolve_statement(statement)
+
+    def _resolve_statement(self: Self, statement: Stmt) -> None:
+        self._statement_resolvers[type(statement)](statement)
+
+    def _resolve_expression(self: Self, expression: Expr) -> None:
+        self._expression_resolvers[type(expression)](expression)
+
+    def _resolve_block(self: Self, statement: Block) -> None:
+        self._scopes.append(_Scope())
+        self.resolve(statement.statements)
+        statement.size = len(self._scopes.pop().slots)
+
+    def _resolve_class(self: Self, statement: Class) -> None:
+        enclosing_class = self._current_class
+        self._current_class = ClassType.CLASS
+
+        statement.slot = self._declare(statement.name)
+        self._define(statement.name)
+
+        superclass = statement.superclass
+        if superclass is not None:
+            if superclass.name.lexeme == statement.name.lexeme:
+                self._error_reporter.token_error(
+                    superclass.name,
+                    "A class can't inherit from itself.",
+                )
+
+            self._current_class = ClassType.SUBCLASS
+            self._resolve_expression(superclass)
+
+            # Methods close over a scope holding the superclass.
+            scope = _Scope()
+            scope.slots["super"] = 0
+            scope.defined.add("super")
+            self._scopes.append(scope)
+
+        for method in statement.methods:
+            kind = FunctionType.METHOD
+            if method.name.lexeme == "init":
+                kind = FunctionType.INITIALIZER
+            self._resolve_function(method, kind)
+
+        if superclass is not None:
+            self._scopes.pop()
+
+        self._current_class = enclosing_class
+
+    def _resolve_expression_statement(
+        self: Self,
+        statement: Expression | Print,
+    ) -> None:
+        self._resolve_expression(statement.expression)
+
+    def _resolve_function_statement(self: Self, statement: Function) -> None:
+        statement.slot = self._declare(statement.name)
+        self._define(statement.name)
+
+        self._resolve_function(statement, FunctionType.FUNCTION)
+
+    def _resolve_function(self: Self, function: Function, kind: FunctionType) -> None:
+        enclosing_function = self._current_function
+        self._current_function = kind
+
+        # Parameters and the top-level declarations of the body share a scope,
+        # which in methods starts with `this`.
+        scope = _Scope()
+        if kind is FunctionType.METHOD or kind is FunctionType.INITIALIZER:
+            scope.slots["this"] = 0
+            scope.defined.add("this")
+        self._functions.append((function, len(self._scopes)))
+        self._scopes.append(scope)
+        for param in function.params:
+            self._declare(param)
+            self._define(param)
+        self.resolve(function.body)
+        function.size = len(self._scopes.pop().slots)
+        self._functions.pop()
+
+        self._current_function = enclosing_function
+
+    def _resolve_if(self: Self, statement: If) -> None:
+        self._resolve_expression(statement.condition)
+        self._resolve_statement(statement.then_branch)
+        if statement.else_branch is not None:
+            self._resolve_statement(statement.else_branch)
+
+    def _resolve_return(self: Self, statement: Return) -> None:
+        if self._current_function is FunctionType.NONE:
+            self._error_reporter.token_error(
+                statement.keyword,
+                "Can't return from top-level code.",
+            )
+
+        if statement.value is not None:
+            if self._current_function is FunctionType.INITIALIZER:
+                self._error_reporter.token_error(
+                    statement.keyword,
+                    "Can't return a value from an initializer.",
+                )
+
+            self._resolve_expression(statement.value)
+
+    def _resolve_var(self: Self, statement: Var) -> None:
+        statement.slot = self._declare(statement.name)
+        if statement.initializer is not None:
+            self._resolve_expression(statement.initializer)
+        self._define(statement.name)
+
+    def _resolve_while(self: Self, statement: While) -> None:
+        self._resolve_expression(statement.condition)
+        self._resolve_statement(statement.body)
+
+    def _resolve_assign(self: Self, expression: Assign) -> None:
+        self._resolve_expression(expression.value)
+        expression.depth, expression.slot = self._resolve_local(expression.name)
+
+    def _resolve_binary(self: Self, expression: Binary | Logical) -> None:
+        self._resolve_expression(expression.left)
+        self._resolve_expression(expression.right)
+
+    def _resolve_call(self: Self, expression: Call) -> None:
+        self._resolve_expression(expression.callee)
+        for argument in expression.arguments:
+            self._resolve_expression(argument)
+
+    def _resolve_get(self: Self, expression: Get) -> None:
+        self._resolve_expression(expression.object)
+
+    def _resolve_grouping(self: Self, expression: Grouping) -> None:
+        self._resolve_expression(expression.expression)
+
+    def _resolve_literal(self: Self, _: Literal) -> None:
+        pass
+
+    def _resolve_set(self: Self, expression: Set) -> None:
+        self._resolve_expression(expression.value)
+        self._resolve_expression(expression.object)
+
+    def _resolve_super(self: Self, expression: Super) -> None:
+        if self._current_class is ClassType.NONE:
+            self._error_reporter.token_error(
+                expression.keyword,
+                "Can't use 'super' outside of a class.",
+            )
+        elif self._current_class is not ClassType.SUBCLASS:
+            self._error_reporter.token_error(
+                expression.keyword,
+                "Can't use 'super' in a class with no superclass.",
+            )
+
+        expression.depth, expression.slot = self._resolve_local(expression.keyword)
+
+    def _resolve_this(self: Self, expression: This) -> None:
+        if self._current_class is ClassType.NONE:
+            self._error_reporter.token_error(
+                expression.keyword,
+                "Can't use 'this' outside of a class.",
+            )
+
+        expression.depth, expression.slot = self._resolve_local(expression.keyword)
+
+    def _resolve_unary(self: Self, expression: Unary) -> None:
+        self._resolve_expression(expression.right)
+
+    def _resolve_variable(self: Self, expression: Variable) -> None:
+        if self._scopes:
+            scope = self._scopes[-1]
+            name = expression.name.lexeme
+            if name in scope.slots and name not in scope.defined:
+                self._error_reporter.token_error(
+                    expression.name,
+                    "Can't read local variable in its own initializer.",
+                )
+
+        expression.depth, expression.slot = self._resolve_local(expression.name)
+
+    def _declare(self: Self, name: Token) -> int:
+        # Returns the slot of the new variable, or -1 for a global.
+        if not self._scopes:
+            return -1
+
+        scope = self._scopes[-1]
+        if name.lexeme in scope.slots:
+            self._error_reporter.token_error(
+                name,
+                "Already a variable with this name in this scope.",
+            )
+            return scope.slots[name.lexeme]
+
+        slot = len(scope.slots)
+        scope.slots[name.lexeme] = slot
+        return slot
+
+    def _define(self: Self, name: Token) -> None:
+        if self._scopes:
+            self._scopes[-1].defined.add(name.lexeme)
+
+    def _resolve_local(self: Self, name: Token) -> tuple[int, int]:
+        # Returns the depth and slot of a local variable, or -1 and -1 for
+        # a global.
+        for depth, scope in enumerate(reversed(self._scopes)):
+            slot = scope.slots.get(name.lexeme)
+            if slot is not None:
+                self._capture(len(self._scopes) - 1 - depth)
+                return depth, slot
+
+        return -1, -1
+
+    def _capture(self: Self, index: int) -> None:
+        # Marks the functions that reach out of their own scopes to the scope
+        # at `index`.
+        for function, function_index in reversed(self._functions):
+            if function_index <= index:
+                break
+
+            function.captures = True
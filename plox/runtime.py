@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from plox.interpreter import Interpreter
+    from plox.stmt import Function
+
+# Lox values are represented by native Python objects: nil is `None`, booleans
+# are `bool`, numbers are `float` and strings are `str`. Only callables, classes
+# and instances get their own classes.
+
+
+class Environment:
+    # A scope of local variables, addressed by the slots the resolver assigned.
+    __slots__ = ("enclosing", "slots")
+
+    def __init__(self: Self, enclosing: Environment | None, slots: list[Any]) -> None:
+        self.enclosing = enclosing
+        self.slots = slots
+
+    def ancestor(self: Self, depth: int) -> Environment:
+        environment = self
+        for _ in range(depth):
+            environment = environment.enclosing  # type: ignore[assignment]
+
+        return environment
+
+
+class LoxCallable(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def arity(self: Self) -> int: ...
+
+    @abstractmethod
+    def call(self: Self, interpreter: Interpreter, arguments: list[Any]) -> Any: ...
+
+
+class LoxFunction(LoxCallable):
+    __slots__ = ("closure", "declaration")
+
+    def __init__(
+        self: Self,
+        declaration: Function,
+        closure: Environment | None,
+    ) -> None:
+        self.declaration = declaration
+        self.closure = closure
+
+    def arity(self: Self) -> int:
+        return len(self.declaration.params)
+
+    def call(self: Self, interpreter: Interpreter, arguments: list[Any]) -> Any:
+        return interpreter.call_function(self, arguments)
+
+    def __str__(self: Self) -> str:
+        return f"<fn {self.declaration.name.lexeme}>"
+
+
+class Shape:
+    # The layout of the fields of an instance: the index of every field's
+    # value. Instances of a class that got the same fields in the same order
+    # share a shape, and shapes never change, so inline caches can key what a
+    # name resolves to on them. Adding a field moves an instance to another
+    # shape.
+    __slots__ = ("indices", "klass", "transitions")
+
+    def __init__(self: Self, klass: LoxClass, indices: dict[str, int]) -> None:
+        self.klass = klass
+        self.indices = indices
+        self.transitions: dict[str, Shape] = {}
+
+    def lookup(self: Self, name: str) -> Any:
+        # Returns the index of a field, the method of that name, which fields
+        # shadow, or None.
+        index = self.indices.get(name)
+        if index is not None:
+            return index
+
+        return self.klass.methods.get(name)
+
+    def setter(self: Self, name: str) -> int | Shape:
+        # Returns the index of a field, or the shape an instance moves to when
+        # the field is added.
+        index = self.indices.get(name)
+        if index is not None:
+            return index
+
+        shape = self.transitions.get(name)
+        if shape is None:
+            shape = Shape(self.klass, {**self.indices, name: len(self.indices)})
+            self.transitions[name] = shape
+
+        return shape
+
+
+class LoxClass(LoxCallable):
+    # Methods are functions of whichever engine created the class. Inherited
+    # ones are copied down when the class is created, so finding a method
+    # never walks the chain of superclasses.
+    __slots__ = ("methods", "name", "shape", "superclass")
+
+    def __init__(self: Self, name: str) -> None:
+        self.name = name
+        self.superclass: LoxClass | None = None
+        self.methods: dict[str, Any] = {}
+        # The shape of instances without fields.
+        self.shape = Shape(self, {})
+
+    def inherit(self: Self, superclass: LoxClass) -> None:
+        self.superclass = superclass
+        self.methods.update(superclass.methods)
+
+    def arity(self: Self) -> int:
+        initializer = self.methods.get("init")
+        return 0 if initializer is None else initializer.arity()
+
+    def call(self: Self, interpreter: Interpreter, arguments: list[Any]) -> Any:
+        instance = LoxInstance(self)
+        initializer = self.methods.get("init")
+        if initializer is not None:
+            interpreter.call_method(initializer, instance, arguments)
+
+        return instance
+
+    def __str__(self: Self) -> str:
+        return self.name
+
+
+class LoxInstance:
+    # Field values are kept in a list, in the order of the instance's shape.
+    __slots__ = ("fields", "shape")
+
+    def __init__(self: Self, klass: LoxClass) -> None:
+        self.shape = klass.shape
+        self.fields: list[Any] = []
+
+    def __str__(self: Self) -> str:
+        return f"{self.shape.klass.name} instance"
+
+
+class BoundMethod(LoxCallable):
+    # A method read as a value. Engines call methods on their receiver without
+    # one when the call immediately follows the property access.
+    __slots__ = ("method", "receiver")
+
+    def __init__(self: Self, method: Any, receiver: LoxInstance) -> None:
+        self.method = method
+        self.receiver = receiver
+
+    def arity(self: Self) -> int:
+        return self.method.arity()
+
+    def call(self: Self, interpreter: Interpreter, arguments: list[Any]) -> Any:
+        return interpreter.call_method(self.method, self.receiver, arguments)
+
+    def __str__(self: Self) -> str:
+        return str(self.method)
+
+
+class Clock(LoxCallable):
+    __slots__ = ()
+
+    def arity(self: Self) -> int:
+        return 0
+
+    def call(self: Self, _interpreter: Interpreter, _arguments: list[Any]) -> Any:
+        return time.time()
+
+    def __str__(self: Self) -> str:
+        return "<native fn>"
+
+
+def is_truthy(value: Any) -> bool:
+    return value is not None and value is not False
+
+
+def is_equal(left: Any, right: Any) -> bool:
+    # `True == 1.0` holds in Python, but not in Lox.
+    return type(left) is type(right) and left == right
+
+
+def stringify(value: Any) -> str:
+    if value is None:
+        return "nil"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if type(value) is float:
+        text = repr(value)
+        return text.removesuffix(".0")
+
+    return str(value)
@@ -1,9 +1,31 @@
-from typing import Any, Final, Self
+from __future__ import annotations
+
+import contextlib
+import functools
+import mmap
+import re
+import time
+from enum import Enum
+from io import TextIOBase
+from typing import TYPE_CHECKING, Any, Final, Self
 
 from plox.errors import ErrorReporter
+from plox.interner import Interner
+from plox.span import LineIndex, Span
 from plox.token import Token
+from plox.token_stream import TokenStream
 from plox.token_type import TokenType
 
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Iterator
+
+    from plox.profiling import Profile
+
+# Bump whenever the tokens or errors produced for some source change, so that
+# stored scanner output is no longer reused.
+SCANNER_VERSION: Final = 2
+
 _KEYWORDS: Final[dict[str, TokenType]] = {
     "and": TokenType.AND,
     "class": TokenType.CLASS,
@@ -24,74 +46,493 @@ _KEYWORDS: Final[dict[str, TokenType]] = {
 }
 
 
+_OPERATORS: Final[dict[str, TokenType]] = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "/": TokenType.SLASH,
+    "*": TokenType.STAR,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+}
+
+# Operators that a single character decides, for the classic scanner.
+_SINGLE_CHARACTER_TOKENS: Final[dict[str, TokenType]] = {
+    operator: token_type
+    for operator, token_type in _OPERATORS.items()
+    if len(operator) == 1 and operator not in "!=<>/"
+}
+# Operators that may be followed by `=`, without and with it.
+_EQUAL_SUFFIXED_TOKENS: Final[dict[str, tuple[TokenType, TokenType]]] = {
+    operator: (_OPERATORS[operator], _OPERATORS[f"{operator}="]) for operator in "!=<>"
+}
+
+# Matches a whole lexeme of the ASCII subset of the language at once, together
+# with the blanks preceding it. Anything it does not cover (non-ASCII
+# characters, unterminated strings and comments, invalid characters) is left to
+# the character-by-character scanner, so both engines always agree. Numbers and
+# identifiers must not be followed by a non-ASCII character, because
+# `str.isdigit` and `str.isalpha` could extend them, hence the possessive
+# quantifiers.
+_LEXEME_REGEX: Final = r"""
+    [ \r\t]*
+    (?:
+        (?P<identifier>[A-Za-z]++)(?![^\x00-\x7f])
+      | (?P<operator>[!=<>]=?|[(){},.\-+;*]|/(?![/*]))
+      | (?P<number>[0-9]++(?:\.[0-9]++)?+)(?![^\x00-\x7f]|\.[^\x00-\x7f])
+      | (?P<string>"[^"]*")
+      | (?P<newline>\n+)
+      | (?P<comment>//[^\n]*)
+      | (?P<multiline_comment>/\*.*?\*/)
+      | (?P<whitespace>[ \r\t]+)
+    )
+    """
+# The indices of the groups above.
+_IDENTIFIER: Final = 1
+_OPERATOR: Final = 2
+_NUMBER: Final = 3
+_STRING: Final = 4
+_NEWLINE: Final = 5
+_MULTILINE_COMMENT: Final = 7
+
+# The patterns are compiled on first use, which keeps them out of the startup
+# of runs that only use the classic engine.
+
+
+@functools.cache
+def _lexeme_pattern() -> re.Pattern[str]:
+    return re.compile(_LEXEME_REGEX, re.VERBOSE | re.DOTALL)
+
+
+@functools.cache
+def _byte_lexeme_pattern() -> re.Pattern[bytes]:
+    return re.compile(_LEXEME_REGEX.encode(), re.VERBOSE | re.DOTALL)
+
+
+@functools.cache
+def _byte_word_pattern() -> re.Pattern[bytes]:
+    # The bytes a failed lexeme of a byte source may consist of: everything
+    # that the classic scanner could read as part of an identifier, a number or
+    # a run of unexpected characters, which is anything but whitespace and the
+    # characters that start operators, strings and comments.
+    return re.compile(rb'[^(){},\-+;*!=<>/" \r\t\n]+')
+
+
+_BYTE_KEYWORDS: Final[dict[bytes, TokenType]] = {
+    keyword.encode(): token_type for keyword, token_type in _KEYWORDS.items()
+}
+_BYTE_OPERATORS: Final[dict[bytes, TokenType]] = {
+    operator.encode(): token_type for operator, token_type in _OPERATORS.items()
+}
+
+# Characters that start a lexeme, or are skipped, other than digits and
+# letters.
+_LEXEME_STARTS: Final = frozenset('(){},.-+;*!=<>/" \r\t\n')
+# Number of unexpected characters quoted in an error.
+_MAX_RUN_PREVIEW: Final = 16
+
+# Number of characters read from a chunked source, or scanned from a string
+# source, before the tokens found so far are handed out.
+_CHUNK_SIZE: Final = 1 << 16
+
+
+class ScannerEngine(Enum):
+    # Handles one character per step.
+    CLASSIC = "classic"
+    # Matches whole lexemes with a single compiled regex.
+    REGEX = "regex"
+
+
+class _DeferredErrorReporter(ErrorReporter):
+    # Keeps errors along with the number of tokens scanned before them.
+    def __init__(self: Self, tokens: list[Token]) -> None:
+        self.had_error = False
+        self.had_runtime_error = False
+        self._tokens = tokens
+        self._errors: list[tuple[int, int, str, Span | None]] = []
+
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        span: Span | None = None,
+    ) -> None:
+        self._errors.append((len(self._tokens), line, message, span))
+        self.had_error = True
+
+    def replay(self: Self, error_reporter: ErrorReporter) -> None:
+        for token_count, line, message, span in self._errors:
+            try:
+                error_reporter.error(line, message, span)
+            except _TooManyErrorsError:
+                # Like a scanner stopped right there, keep only the tokens
+                # scanned before the error.
+                del self._tokens[token_count:]
+                self.discard()
+                raise
+
+        self.discard()
+
+    def discard(self: Self) -> None:
+        self._errors.clear()
+        self.had_error = False
+
+
+class _TooManyErrorsError(Exception):
+    pass
+
+
+class _CappedErrorReporter(ErrorReporter):
+    # Passes on the first `max_errors` errors. The one after that is replaced
+    # by a note, and stops the scanner.
+    def __init__(self: Self, error_reporter: ErrorReporter, max_errors: int) -> None:
+        self.had_error = False
+        self.had_runtime_error = False
+        self._error_reporter = error_reporter
+        self._remaining = max_errors
+
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        span: Span | None = None,
+    ) -> None:
+        self.had_error = True
+        if self._remaining == 0:
+            self._error_reporter.error(line, "Too many errors.", span)
+            raise _TooManyErrorsError
+
+        self._remaining -= 1
+        self._error_reporter.error(line, message, span)
+
+
+class _CountingErrorReporter(ErrorReporter):
+    def __init__(self: Self, error_reporter: ErrorReporter, profile: Profile) -> None:
+        self.had_error = False
+        self.had_runtime_error = False
+        self._error_reporter = error_reporter
+        self._profile = profile
+
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        span: Span | None = None,
+    ) -> None:
+        self._profile.error_count += 1
+        self._error_reporter.error(line, message, span)
+        self.had_error = True
+
+
+class _ByteWindowErrorReporter(ErrorReporter):
+    # Moves the spans of errors found in a decoded window of a byte source from
+    # character offsets within the window to byte offsets within the source.
+    def __init__(
+        self: Self,
+        error_reporter: ErrorReporter,
+        scanner: Scanner,
+        window: str,
+        offset: int,
+    ) -> None:
+        self.had_error = False
+        self.had_runtime_error = False
+        # Whether the scanner of the window was stopped by too many errors,
+        # which must stop the scanner of the whole source as well.
+        self.stopped = False
+        self._error_reporter = error_reporter
+        self._scanner = scanner
+        self._window = window
+        self._offset = offset
+
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        span: Span | None = None,
+    ) -> None:
+        if span is not None:
+            start = self._offset + len(_encode(self._window[: span.start]))
+            end = start + len(_encode(self._window[span.start : span.end]))
+            span = self._scanner.span(start, end)
+
+        self.had_error = True
+        try:
+            self._error_reporter.error(line, message, span)
+        except _TooManyErrorsError:
+            self.stopped = True
+            raise
+
+
+ByteSource = bytes | memoryview | mmap.mmap
+
+
 class Scanner:
-    def __init__(self: Self, source: str, error_reporter: ErrorReporter) -> None:
-        self._source = source
+    # Every option past the error reporter has a default that suits most
+    # callers, so they are passed one by one rather than grouped.
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        source: str | ByteSource | Iterable[str],
+        error_reporter: ErrorReporter,
+        engine: ScannerEngine = ScannerEngine.CLASSIC,
+        line: int = 1,
+        interner: Interner | None = None,
+        profile: Profile | None = None,
+        max_errors: int | None = None,
+    ) -> None:
+        self._chunks: Iterator[str] | None
+        self._bytes = isinstance(source, bytes | memoryview | mmap.mmap)
+        if isinstance(source, str) or self._bytes:
+            self._source = source
+            self._chunks = None
+        elif isinstance(source, TextIOBase):
+            self._source = ""
+            self._chunks = iter(functools.partial(source.read, _CHUNK_SIZE), "")
+        else:
+            self._source = ""
+            self._chunks = iter(source)
+
         self._error_reporter = error_reporter
+        if max_errors is not None:
+            self._error_reporter = _CappedErrorReporter(error_reporter, max_errors)
+        # Byte sources can only be scanned a lexeme at a time.
+        self._engine = ScannerEngine.REGEX if self._bytes else engine
+        self._interner = Interner() if interner is None else interner
 
         self._tokens: list[Token] = []
+        self._stream: TokenStream | None = None
         self._start = 0
         self._current = 0
-        self._line = 1
+        self._stop = 0
+        self._line = line
+        self._first_line = line
+        # Built on first use, only to place errors.
+        self._line_index: LineIndex | None = None
+        # The line, start, length and first characters of a run of unexpected
+        # characters that has not been reported yet, and whether it has bytes
+        # that are not valid UTF-8.
+        self._run: tuple[int, int, int, str, bool] | None = None
+
+        self._profile = profile
+        if profile is not None:
+            self._instrument(profile)
 
     def scan_tokens(self: Self) -> list[Token]:
-        while not self._is_at_end():
+        self._check_not_bytes()
+
+        if self._chunks is not None:
+            return list(self.iter_tokens())
+
+        with contextlib.suppress(_TooManyErrorsError):
+            self._scan_until(len(self._source))
+        self._tokens.append(self._eof_token())
+
+        if self._profile is not None:
+            self._profile.token_counts.update(token.type for token in self._tokens)
+
+        return self._tokens
+
+    def scan_token_stream(self: Self, stream: TokenStream | None = None) -> TokenStream:
+        # Tokens are appended to `stream`, if given, which must be over the
+        # same source.
+        if self._chunks is not None:
+            msg = "A token stream cannot be scanned from a chunked source."
+            raise TypeError(msg)
+
+        self._stream = TokenStream(self._source) if stream is None else stream
+        first = len(self._stream)
+        with contextlib.suppress(_TooManyErrorsError):
+            self._scan_until(len(self._source))
+        self._stream.append(TokenType.EOF, len(self._source), 0, self._line)
+
+        if self._profile is not None:
+            self._profile.token_counts.update(
+                self._stream.type(index) for index in range(first, len(self._stream))
+            )
+
+        return self._stream
+
+    def iter_tokens(self: Self) -> Iterator[Token]:
+        self._check_not_bytes()
+
+        if self._profile is not None:
+            return self._count_tokens(self._iter_tokens(), self._profile)
+
+        return self._iter_tokens()
+
+    def _iter_tokens(self: Self) -> Iterator[Token]:
+        try:
+            if self._chunks is not None:
+                yield from self._iter_chunked_tokens(self._chunks)
+            else:
+                while not self._is_at_end():
+                    self._scan_until(
+                        min(self._current + _CHUNK_SIZE, len(self._source)),
+                    )
+                    yield from self._tokens
+                    self._tokens.clear()
+        except _TooManyErrorsError:
+            # The tokens scanned before the last error are kept, as they are by
+            # `scan_tokens`.
+            yield from self._tokens
+            self._tokens.clear()
+
+        yield self._eof_token()
+
+    def _instrument(self: Self, profile: Profile) -> None:
+        # Wraps methods of this instance only, so that scanners without
+        # a profile run exactly the code they would otherwise.
+        self._error_reporter = _CountingErrorReporter(self._error_reporter, profile)
+        for name in ("string", "number", "identifier", "multiline_comment"):
+            method = f"_scan_{name}"
+            setattr(self, method, profile.timed(name, getattr(self, method)))
+
+        scan_until = self._scan_until
+
+        def profiled_scan_until(stop: int) -> None:
+            current = self._current
+            start = time.perf_counter()
+            scan_until(stop)
+            profile.scan_seconds += time.perf_counter() - start
+            profile.scanned += self._current - current
+
+        self._scan_until = profiled_scan_until  # type: ignore[method-assign]
+
+    def _count_tokens(
+        self: Self,
+        tokens: Iterator[Token],
+        profile: Profile,
+    ) -> Iterator[Token]:
+        counts = profile.token_counts
+        for token in tokens:
+            counts[token.type] += 1
+            yield token
+
+    def _check_not_bytes(self: Self) -> None:
+        if self._bytes:
+            msg = "A byte source can only be scanned into a token stream."
+            raise TypeError(msg)
+
+    def _iter_chunked_tokens(self: Self, chunks: Iterator[str]) -> Iterator[Token]:
+        # Errors are held back until the tokens scanned along with them are
+        # known not to continue in the next chunk.
+        error_reporter = self._error_reporter
+        deferred_error_reporter = _DeferredErrorReporter(self._tokens)
+        self._error_reporter = deferred_error_reporter
+
+        # Chunks not yet added to the buffer.
+        pending: list[str] = []
+        pending_length = 0
+        try:
+            for chunk in chunks:
+                pending.append(chunk)
+                pending_length += len(chunk)
+                # A batch that was put back is only scanned again once the
+                # buffer has at least doubled, so that a string or comment
+                # spanning many chunks is not rescanned for every one of them.
+                if pending_length < len(self._source) - self._current:
+                    continue
+
+                # Drop the consumed part of the buffer.
+                self._source = self._source[self._current :] + "".join(pending)
+                self._current = 0
+                pending.clear()
+                pending_length = 0
+                line = self._line
+                run = self._run
+
+                # A step looks at most one character past the lexeme it
+                # scans. If that character is beyond the buffer, the lexeme
+                # may continue in the next chunk, so the whole batch is
+                # scanned again once it arrives.
+                self._scan_until(len(self._source) - 2)
+                if self._current + 1 < len(self._source):
+                    deferred_error_reporter.replay(error_reporter)
+                    yield from self._tokens
+                else:
+                    self._current = 0
+                    self._line = line
+                    self._run = run
+                    deferred_error_reporter.discard()
+
+                self._tokens.clear()
+
+            self._source = self._source[self._current :] + "".join(pending)
+            self._current = 0
+            self._scan_until(len(self._source))
+            deferred_error_reporter.replay(error_reporter)
+            yield from self._tokens
+            self._tokens.clear()
+        finally:
+            self._error_reporter = error_reporter
+
+    def _scan_until(self: Self, stop: int) -> None:
+        # Scans every lexeme starting before `stop`.
+        self._stop = stop
+        if self._run is not None and not (
+            self._current < len(self._source)
+            and _is_unexpected(self._source[self._current])
+        ):
+            # The run of unexpected characters cut short by the last batch
+            # has ended.
+            self._report_run(self._run)
+
+        if self._engine is ScannerEngine.REGEX:
+            self._scan_lexemes(stop)
+            return
+
+        while self._current < stop:
             self._start = self._current
             self._scan_token()
 
-        self._tokens.append(
-            Token(
-                type=TokenType.EOF,
-                lexeme="",
-                literal=None,
-                line=self._line,
-            ),
-        )
+    def span(self: Self, start: int, end: int) -> Span | None:
+        # Offsets into a chunked source are only known within the buffer, so
+        # errors in one have no span.
+        if self._chunks is not None:
+            return None
 
-        return self._tokens
+        if self._line_index is None:
+            self._line_index = LineIndex(self._source, self._first_line)
+
+        return self._line_index.span(start, end)
+
+    def _eof_token(self: Self) -> Token:
+        return Token(
+            type=TokenType.EOF,
+            lexeme="",
+            literal=None,
+            line=self._line,
+        )
 
     def _is_at_end(self: Self) -> bool:
         return self._current >= len(self._source)
 
     def _scan_token(self: Self) -> None:
         char = self._advance()
+
+        # Operators are looked up in tables rather than matched one by one.
+        token_type = _SINGLE_CHARACTER_TOKENS.get(char)
+        if token_type is not None:
+            self._add_token(token_type)
+            return
+
+        token_types = _EQUAL_SUFFIXED_TOKENS.get(char)
+        if token_types is not None:
+            self._add_token(token_types[1] if self._match("=") else token_types[0])
+            return
+
         match char:
-            case "(":
-                self._add_token(TokenType.LEFT_PAREN)
-            case ")":
-                self._add_token(TokenType.RIGHT_PAREN)
-            case "{":
-                self._add_token(TokenType.LEFT_BRACE)
-            case "}":
-                self._add_token(TokenType.RIGHT_BRACE)
-            case ",":
-                self._add_token(TokenType.COMMA)
-            case ".":
-                self._add_token(TokenType.DOT)
-            case "-":
-                self._add_token(TokenType.MINUS)
-            case "+":
-                self._add_token(TokenType.PLUS)
-            case ";":
-                self._add_token(TokenType.SEMICOLON)
-            case "*":
-                self._add_token(TokenType.STAR)
-            case "!":
-                self._add_token(
-                    TokenType.BANG_EQUAL if self._match("=") else TokenType.BANG,
-                )
-            case "=":
-                self._add_token(
-                    TokenType.EQUAL_EQUAL if self._match("=") else TokenType.EQUAL,
-                )
-            case "<":
-                self._add_token(
-                    TokenType.LESS_EQUAL if self._match("=") else TokenType.LESS,
-                )
-            case ">":
-                self._add_token(
-                    TokenType.GREATER_EQUAL if self._match("=") else TokenType.GREATER,
-                )
             case "/":
                 # Ignore comments.
                 if self._match("/"):
@@ -113,12 +554,145 @@ class Scanner:
                 elif char.isalpha():
                     self._scan_identifier()
                 else:
-                    # TODO @kamilturek: Coalesce a run of invalid characters into
-                    # a single error.
-                    self._error_reporter.error(
-                        self._line,
-                        f"Unexpected character: {char!r}.",
-                    )
+                    self._scan_unexpected_characters()
+
+    def _scan_lexemes(self: Self, stop: int) -> None:
+        # Locals instead of attributes, as this loop runs once per lexeme.
+        source = self._source
+        tokens = self._tokens
+        stream = self._stream
+        if self._bytes:
+            match_lexeme = _byte_lexeme_pattern().match
+            keywords = _BYTE_KEYWORDS
+            operators = _BYTE_OPERATORS
+            newline = b"\n"
+        else:
+            match_lexeme = _lexeme_pattern().match
+            keywords = _KEYWORDS
+            operators = _OPERATORS
+            newline = "\n"
+        intern = self._interner.string
+        intern_number = self._interner.number
+        line = self._line
+        current = self._current
+
+        while current < stop:
+            matched = match_lexeme(source, current)
+            if matched is None and self._bytes and stream is not None:
+                current, line = self._scan_byte_window(stream, current, line)
+                continue
+
+            if matched is None:
+                # Let the classic scanner handle a single step.
+                self._start = self._current = current
+                self._line = line
+                self._scan_token()
+                current = self._current
+                line = self._line
+                continue
+
+            current = matched.end()
+            kind = matched.lastindex
+            if kind == _IDENTIFIER:
+                lexeme = matched.group(kind)
+                token_type = keywords.get(lexeme, TokenType.IDENTIFIER)
+                literal = None
+            elif kind == _OPERATOR:
+                lexeme = matched.group(kind)
+                token_type = operators[lexeme]
+                literal = None
+            elif kind == _NUMBER:
+                lexeme = matched.group(kind)
+                token_type = TokenType.NUMBER
+                literal = intern_number(lexeme) if stream is None else None
+            elif kind == _STRING:
+                lexeme = matched.group(kind)
+                line += lexeme.count(newline)
+                if not _is_valid_utf8(lexeme):
+                    self._start = self._current = current
+                    self._line = line
+                    self._report_invalid_utf8(matched.start(kind), current)
+                token_type = TokenType.STRING
+                # Trim the surrounding quotes.
+                literal = intern(lexeme[1:-1]) if stream is None else None
+            else:
+                if kind == _NEWLINE:
+                    line += current - matched.start(kind)
+                elif kind == _MULTILINE_COMMENT:
+                    line += matched.group(kind).count(newline)
+
+                continue
+
+            if stream is None:
+                tokens.append(
+                    Token(
+                        type=token_type,
+                        lexeme=intern(lexeme),
+                        literal=literal,
+                        line=line,
+                    ),
+                )
+            else:
+                stream.append(token_type, matched.start(kind), len(lexeme), line)
+
+        self._start = self._current = current
+        self._line = line
+
+    def _scan_byte_window(
+        self: Self,
+        stream: TokenStream,
+        current: int,
+        line: int,
+    ) -> tuple[int, int]:
+        # Decodes the part of a byte source that the regex could not handle
+        # and scans it with the classic scanner. The window ends where no
+        # lexeme scanned from inside of it could continue.
+        matched = _byte_word_pattern().match(self._source, current)
+        if matched is not None:
+            end = matched.end()
+        elif self._source[current : current + 1] in (b'"', b"/"):
+            # An unterminated string or comment runs until the end.
+            end = len(self._source)
+        else:
+            end = current + 1
+
+        window = str(self._source[current:end], "utf-8", "surrogateescape")
+        window_error_reporter = _ByteWindowErrorReporter(
+            self._error_reporter,
+            self,
+            window,
+            current,
+        )
+        window_stream = Scanner(
+            source=window,
+            error_reporter=window_error_reporter,
+            line=line,
+        ).scan_token_stream()
+
+        # Translate character offsets within the window into byte offsets.
+        char_offset = 0
+        byte_offset = current
+        for index in range(len(window_stream) - 1):
+            start = window_stream.start(index)
+            length = window_stream.length(index)
+            byte_offset += len(_encode(window[char_offset:start]))
+            byte_length = len(_encode(window[start : start + length]))
+            stream.append(
+                window_stream.type(index),
+                byte_offset,
+                byte_length,
+                window_stream.line(index),
+            )
+            char_offset = start + length
+            byte_offset += byte_length
+
+        line = window_stream.line(len(window_stream) - 1)
+        if window_error_reporter.stopped is True:
+            self._start = self._current = end
+            self._line = line
+            raise _TooManyErrorsError
+
+        return end, line
 
     def _advance(self: Self) -> str:
         char = self._source[self._current]
@@ -148,10 +722,20 @@ class Scanner:
         return self._source[self._current + 1]
 
     def _add_token(self: Self, token_type: TokenType, literal: Any = None) -> None:
+        if self._stream is not None:
+            # The stream resolves literals from the source on its own.
+            self._stream.append(
+                token_type,
+                self._start,
+                self._current - self._start,
+                self._line,
+            )
+            return
+
         self._tokens.append(
             Token(
                 type=token_type,
-                lexeme=self._source[self._start : self._current],
+                lexeme=self._interner.string(self._source[self._start : self._current]),
                 literal=literal,
                 line=self._line,
             ),
@@ -165,16 +749,24 @@ class Scanner:
             self._advance()
 
         if self._is_at_end():
-            self._error_reporter.error(self._line, "Unterminated string.")
+            self._error_reporter.error(
+                self._line,
+                "Unterminated string.",
+                self.span(self._start, self._current),
+            )
             return
 
         # Move behind the closing quote.
         self._advance()
 
+        # Trim the surrounding quotes.
+        value = self._source[self._start + 1 : self._current - 1]
+        if not _is_valid_utf8(value):
+            self._report_invalid_utf8(self._start, self._current)
+
         self._add_token(
             token_type=TokenType.STRING,
-            # Trim the surrounding quotes.
-            literal=self._source[self._start + 1 : self._current - 1],
+            literal=self._interner.string(value),
         )
 
     def _scan_multiline_comment(self: Self) -> None:
@@ -187,7 +779,11 @@ class Scanner:
             self._advance()
 
         if self._is_at_end():
-            self._error_reporter.error(self._line, "Unterminated comment.")
+            self._error_reporter.error(
+                self._line,
+                "Unterminated comment.",
+                self.span(self._start, self._current),
+            )
             return
 
         # Move behind `*/`.
@@ -208,7 +804,53 @@ class Scanner:
 
         self._add_token(
             token_type=TokenType.NUMBER,
-            literal=float(self._source[self._start : self._current]),
+            literal=self._interner.number(self._source[self._start : self._current]),
+        )
+
+    def _scan_unexpected_characters(self: Self) -> None:
+        # Reports a whole run of characters that start no lexeme as one error.
+        # A run that reaches the end of the batch being scanned may go on in
+        # the next one, so its error is held back until the run ends.
+        end = min(self._stop, len(self._source))
+        while self._current < end and _is_unexpected(self._source[self._current]):
+            self._current += 1
+
+        run = self._source[self._start : self._current]
+        if self._run is None:
+            line, start, length = self._line, self._start, len(run)
+            preview = run[:_MAX_RUN_PREVIEW]
+            invalid = False
+        else:
+            line, start, length, preview, invalid = self._run
+            preview = (preview + run[:_MAX_RUN_PREVIEW])[:_MAX_RUN_PREVIEW]
+            length += len(run)
+
+        invalid = invalid or not _is_valid_utf8(run)
+        self._run = (line, start, length, preview, invalid)
+        if not self._current == self._stop < len(self._source):
+            self._report_run(self._run)
+
+    def _report_run(self: Self, run: tuple[int, int, int, str, bool]) -> None:
+        line, start, length, preview, invalid = run
+        self._run = None
+
+        if invalid is True:
+            # Quoting the undecodable bytes would not help anyone.
+            message = "Invalid UTF-8."
+        elif length == 1:
+            message = f"Unexpected character: {preview!r}."
+        elif length <= _MAX_RUN_PREVIEW:
+            message = f"Unexpected characters: {preview!r}."
+        else:
+            message = f"Unexpected characters: {preview!r}... ({length} in total)."
+
+        self._error_reporter.error(line, message, self.span(start, start + length))
+
+    def _report_invalid_utf8(self: Self, start: int, end: int) -> None:
+        self._error_reporter.error(
+            self._line,
+            "Invalid UTF-8.",
+            self.span(start, end),
         )
 
     def _scan_identifier(self: Self) -> None:
@@ -220,3 +862,59 @@ class Scanner:
         self._add_token(
             token_type=_KEYWORDS.get(value, TokenType.IDENTIFIER),
         )
+
+
+def _is_unexpected(char: str) -> bool:
+    return char not in _LEXEME_STARTS and not char.isdigit() and not char.isalpha()
+
+
+def _is_valid_utf8(text: str | bytes) -> bool:
+    # Sources are decoded with the "surrogateescape" error handler, which turns
+    # every byte that is not valid UTF-8 into a lone surrogate, so that it is
+    # reported where it appears rather than failing the whole source.
+    if text.isascii():
+        return True
+
+    if isinstance(text, str):
+        return not any("\udc80" <= char <= "\udcff" for char in text)
+
+    try:
+        text.decode()
+    except UnicodeDecodeError:
+        return False
+
+    return True
+
+
+def _encode(text: str) -> bytes:
+    # Inverts the decoding of a window of a byte source, see `_is_valid_utf8`.
+    return text.encode("utf-8", "surrogateescape")
+
+
+def scan_file(
+    path: str | os.PathLike[str],
+    error_reporter: ErrorReporter,
+    profile: Profile | None = None,
+    *,
+    max_errors: int | None = None,
+) -> TokenStream:
+    # Scans a UTF-8 file through a read-only memory map. Nothing is decoded
+    # up front, and the resulting stream refers to lexemes by their byte
+    # offsets within the map.
+    with open(path, "rb") as file:  # noqa: PTH123
+        try:
+            source: ByteSource = mmap.mmap(
+                file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            )
+        except ValueError:
+            # An empty file cannot be mapped.
+            source = b""
+
+    return Scanner(
+        source,
+        error_reporter,
+        profile=profile,
+        max_errors=max_errors,
+    ).scan_token_stream()
@@ -0,0 +1,48 @@
+import bisect
+import mmap
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Final, Self
+
+_NEWLINE: Final = re.compile("\n")
+_BYTE_NEWLINE: Final = re.compile(b"\n")
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    # A range of source offsets, and the line and 1-based column of its start.
+    # Offsets and columns count characters of a string source and bytes of a
+    # byte source.
+    start: int
+    end: int
+    line: int
+    column: int
+
+
+class LineIndex:
+    # The offsets at which the lines of a source start, from which the line
+    # and column of any offset are found by binary search. The source is
+    # assumed to start at the beginning of line `line`.
+    __slots__ = ("_line", "_starts")
+
+    def __init__(
+        self: Self,
+        source: str | bytes | memoryview | mmap.mmap,
+        line: int = 1,
+    ) -> None:
+        self._line = line
+        pattern = _NEWLINE if isinstance(source, str) else _BYTE_NEWLINE
+        self._starts = array("Q", [0])
+        self._starts.extend(matched.end() for matched in pattern.finditer(source))
+
+    def __len__(self: Self) -> int:
+        return len(self._starts)
+
+    def locate(self: Self, offset: int) -> tuple[int, int]:
+        index = bisect.bisect_right(self._starts, offset) - 1
+        return self._line + index, offset - self._starts[index] + 1
+
+    def span(self: Self, start: int, end: int) -> Span:
+        line, column = self.locate(start)
+        return Span(start=start, end=end, line=line, column=column)
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+
+from plox.expr import Expr, Variable
+from plox.token import Token
+
+
+# The resolver fills in the `slot` of declarations, or leaves it at -1 for
+# globals, and the number of slots (`size`) that scopes need.
+@dataclass(slots=True, eq=False)
+class Stmt:
+    pass
+
+
+@dataclass(slots=True, eq=False)
+class Block(Stmt):
+    statements: list[Stmt]
+    size: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class Class(Stmt):
+    name: Token
+    superclass: Variable | None
+    methods: list["Function"]
+    slot: int = -1
+
+
+@dataclass(slots=True, eq=False)
+class Expression(Stmt):
+    expression: Expr
+
+
+@dataclass(slots=True, eq=False)
+class Function(Stmt):
+    name: Token
+    params: list[Token]
+    body: list[Stmt]
+    slot: int = -1
+    size: int = 0
+    # Whether the body uses local variables of enclosing scopes. Functions
+    # that do not are created without a closure.
+    captures: bool = False
+
+
+@dataclass(slots=True, eq=False)
+class If(Stmt):
+    condition: Expr
+    then_branch: Stmt
+    else_branch: Stmt | None
+
+
+@dataclass(slots=True, eq=False)
+class Print(Stmt):
+    expression: Expr
+
+
+@dataclass(slots=True, eq=False)
+class Return(Stmt):
+    keyword: Token
+    value: Expr | None
+
+
+@dataclass(slots=True, eq=False)
+class Var(Stmt):
+    name: Token
+    initializer: Expr | None
+    slot: int = -1
+
+
+@dataclass(slots=True, eq=False)
+class While(Stmt):
+    # The `while` or `for` keyword, where errors of every iteration are reported.
+    keyword: Token
+    condition: Expr
+    body: Stmt
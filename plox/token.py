@@ -4,7 +4,7 @@ from typing import Any, Self
 from plox.token_type import TokenType
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Token:
     type: TokenType
     lexeme: str
@@ -0,0 +1,146 @@
+import hashlib
+import pathlib
+import struct
+import sys
+from array import array
+from typing import Final, Self
+
+from plox.cache_directory import CacheDirectory
+from plox.errors import ErrorReporter
+from plox.scanner import SCANNER_VERSION, Scanner, ScannerEngine
+from plox.span import Span
+from plox.token_stream import COLUMN_TYPECODES, TokenStream
+
+_MAGIC: Final = b"PLXT"
+_FORMAT_VERSION: Final = 1
+# Magic, format version, token count, error count.
+_HEADER: Final = struct.Struct("<4sHII")
+# Line and message length of an error.
+_ERROR: Final = struct.Struct("<II")
+_COLUMN_ITEMSIZES: Final = tuple(
+    array(typecode).itemsize for typecode in COLUMN_TYPECODES
+)
+
+_DEFAULT_MAX_SIZE: Final = 256 * 1024 * 1024
+
+
+class _ErrorRecorder(ErrorReporter):
+    def __init__(self: Self) -> None:
+        self.had_error = False
+        self.had_runtime_error = False
+        self.errors: list[tuple[int, str]] = []
+
+    def error(
+        self: Self,
+        line: int,
+        message: str,
+        _span: Span | None = None,
+    ) -> None:
+        # Spans are not stored, so errors of cached tokens have none.
+        self.errors.append((line, message))
+        self.had_error = True
+
+
+class TokenCache:
+    # Persists scanner output in a directory, one file per source, named by a
+    # hash of the source and the scanner version.
+    def __init__(
+        self: Self,
+        directory: str | pathlib.Path,
+        max_size: int = _DEFAULT_MAX_SIZE,
+    ) -> None:
+        self._directory = CacheDirectory(directory, ".tokens", max_size)
+
+    def scan(self: Self, source: str, error_reporter: ErrorReporter) -> TokenStream:
+        path = self._entry_path(source)
+
+        entry = self._load(path, source)
+        if entry is None:
+            recorder = _ErrorRecorder()
+            tokens = Scanner(source, recorder, ScannerEngine.REGEX).scan_token_stream()
+            errors = recorder.errors
+            self._directory.write(path, _encode(tokens, errors))
+        else:
+            tokens, errors = entry
+
+        for line, message in errors:
+            error_reporter.error(line, message)
+
+        return tokens
+
+    def _entry_path(self: Self, source: str) -> pathlib.Path:
+        digest = hashlib.sha256()
+        # Columns are stored in the native byte order and item sizes.
+        digest.update(
+            f"{SCANNER_VERSION}:{sys.byteorder}:{_COLUMN_ITEMSIZES}:".encode(),
+        )
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return self._directory.entry_path(digest.hexdigest())
+
+    def _load(
+        self: Self,
+        path: pathlib.Path,
+        source: str,
+    ) -> tuple[TokenStream, list[tuple[int, str]]] | None:
+        data = self._directory.read(path)
+        if data is None:
+            return None
+
+        entry = _decode(data, source)
+        if entry is None:
+            # A corrupt entry is simply replaced.
+            path.unlink(missing_ok=True)
+
+        return entry
+
+
+def _encode(tokens: TokenStream, errors: list[tuple[int, str]]) -> bytes:
+    parts = [_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(tokens), len(errors))]
+    parts.extend(tokens.to_columns())
+
+    for line, message in errors:
+        encoded_message = message.encode("utf-8", "surrogatepass")
+        parts.append(_ERROR.pack(line, len(encoded_message)))
+        parts.append(encoded_message)
+
+    return b"".join(parts)
+
+
+def _decode(
+    data: bytes,
+    source: str,
+) -> tuple[TokenStream, list[tuple[int, str]]] | None:
+    if len(data) < _HEADER.size:
+        return None
+
+    magic, version, token_count, error_count = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+    if (
+        magic != _MAGIC
+        or version != _FORMAT_VERSION
+        or len(data) < offset + token_count * sum(_COLUMN_ITEMSIZES)
+    ):
+        return None
+
+    columns = []
+    for itemsize in _COLUMN_ITEMSIZES:
+        columns.append(data[offset : offset + token_count * itemsize])
+        offset += token_count * itemsize
+
+    errors = []
+    for _ in range(error_count):
+        if len(data) < offset + _ERROR.size:
+            return None
+
+        line, length = _ERROR.unpack_from(data, offset)
+        offset += _ERROR.size
+        if len(data) < offset + length:
+            return None
+
+        errors.append((line, data[offset : offset + length].decode()))
+        offset += length
+
+    if offset != len(data):
+        return None
+
+    return TokenStream(source, columns), errors
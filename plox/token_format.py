@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import itertools
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, Final, Self, overload
+
+from plox.token import Token
+from plox.token_type import TokenType
+
+# A portable binary encoding of a list of tokens, for handing scanner output
+# from one tool to another without scanning the source again.
+#
+# Layout, after the header:
+#
+#   - the string table: a count, then every string as a length and its UTF-8
+#     bytes. Lexemes and string literals are stored once and referred to by
+#     their index;
+#   - a token count, then one byte per token holding its type ordinal and the
+#     kind of its literal;
+#   - the line of every token, as the difference from the line of the token
+#     before it;
+#   - the string index of every lexeme;
+#   - the string index of every string literal;
+#   - every number literal that differs from the value of its lexeme, as a
+#     double.
+#
+# Counts, lengths and line differences are unsigned LEB128 varints, line
+# differences zigzag encoded. String indices are as wide as the size of the
+# string table requires, so that they can be read with `array` rather than one
+# by one. Everything is little-endian. The header holds the size and a CRC-32
+# of everything after it, so that truncated or corrupt data is rejected rather
+# than turned into wrong tokens.
+
+_MAGIC: Final = b"PLXS"
+FORMAT_VERSION: Final = 1
+# Magic, format version, size and CRC-32 of the payload.
+_HEADER: Final = struct.Struct("<4sHII")
+_DOUBLE: Final = struct.Struct("<d")
+
+_TOKEN_TYPES: Final[tuple[TokenType, ...]] = tuple(TokenType)
+_ORDINALS: Final[dict[TokenType, int]] = {
+    token_type: ordinal for ordinal, token_type in enumerate(_TOKEN_TYPES)
+}
+
+# Kinds of literals, stored in the low two bits of a token's type byte.
+_NONE: Final = 0
+_STRING: Final = 1
+# A number equal to the value of its lexeme, which is all the scanner produces.
+_LEXEME_NUMBER: Final = 2
+_NUMBER: Final = 3
+_KIND_BITS: Final = 2
+_KIND_MASK: Final = (1 << _KIND_BITS) - 1
+# Split type bytes into type ordinals and kinds of literals.
+_ORDINAL_TABLE: Final = bytes(byte >> _KIND_BITS for byte in range(256))
+_KIND_TABLE: Final = bytes(byte & _KIND_MASK for byte in range(256))
+
+# Longest varint that can hold a 64-bit value.
+_MAX_VARINT_SIZE: Final = 10
+
+_TRUNCATED: Final = "Truncated token stream."
+_CORRUPT: Final = "Corrupt token stream."
+
+
+class TokenFormatError(ValueError):
+    pass
+
+
+class LoadedTokens(Sequence[Token]):
+    # The tokens read by `load_tokens`. Like a `TokenStream`, it keeps the
+    # decoded columns and only creates `Token` objects when they are accessed,
+    # so tools that only look at some of the columns never pay for them.
+    def __init__(
+        self: Self,
+        types: bytes,
+        strings: list[str],
+        lexemes: array[int],
+        literals: list[Any],
+        lines: list[int],
+    ) -> None:
+        self._types = types
+        self._strings = strings
+        self._lexemes = lexemes
+        self._literals = literals
+        self._lines = lines
+
+    def type(self: Self, index: int) -> TokenType:
+        return _TOKEN_TYPES[self._types[index]]
+
+    def lexeme(self: Self, index: int) -> str:
+        return self._strings[self._lexemes[index]]
+
+    def literal(self: Self, index: int) -> Any:
+        return self._literals[index]
+
+    def line(self: Self, index: int) -> int:
+        return self._lines[index]
+
+    def __len__(self: Self) -> int:
+        return len(self._types)
+
+    @overload
+    def __getitem__(self: Self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self: Self, index: slice) -> list[Token]: ...
+
+    def __getitem__(self: Self, index: int | slice) -> Token | list[Token]:
+        if isinstance(index, slice):
+            return list(self._tokens(index))
+
+        return Token(
+            type=_TOKEN_TYPES[self._types[index]],
+            lexeme=self._strings[self._lexemes[index]],
+            literal=self._literals[index],
+            line=self._lines[index],
+        )
+
+    def __iter__(self: Self) -> Iterator[Token]:
+        return self._tokens(slice(None))
+
+    def _tokens(self: Self, index: slice) -> Iterator[Token]:
+        return map(
+            Token,
+            map(_TOKEN_TYPES.__getitem__, self._types[index]),
+            map(self._strings.__getitem__, self._lexemes[index]),
+            self._literals[index],
+            self._lines[index],
+        )
+
+
+def dump_tokens(tokens: Iterable[Token]) -> bytes:
+    strings: dict[str, int] = {}
+    type_bytes = bytearray()
+    lines = bytearray()
+    lexemes = []
+    string_literals = []
+    number_literals = bytearray()
+
+    previous_line = 0
+    for token in tokens:
+        literal = token.literal
+        if literal is None:
+            kind = _NONE
+        elif type(literal) is str:
+            kind = _STRING
+            string_literals.append(strings.setdefault(literal, len(strings)))
+        elif type(literal) is float:
+            if _parse_number(token.lexeme) == literal:
+                kind = _LEXEME_NUMBER
+            else:
+                kind = _NUMBER
+                number_literals += _DOUBLE.pack(literal)
+        else:
+            msg = f"Cannot encode literal {literal!r}."
+            raise TypeError(msg)
+
+        type_bytes.append(_ORDINALS[token.type] << _KIND_BITS | kind)
+        # Zigzag encoding keeps small differences in either direction short.
+        difference = token.line - previous_line
+        _write_varint(
+            lines,
+            difference << 1 if difference >= 0 else ~difference << 1 | 1,
+        )
+        previous_line = token.line
+        lexemes.append(strings.setdefault(token.lexeme, len(strings)))
+
+    payload = bytearray()
+    _write_varint(payload, len(strings))
+    for string in strings:
+        encoded = string.encode("utf-8", "surrogatepass")
+        _write_varint(payload, len(encoded))
+        payload += encoded
+
+    _write_varint(payload, len(type_bytes))
+    payload += type_bytes
+    payload += lines
+    typecode = _index_typecode(len(strings))
+    payload += _pack_indices(typecode, lexemes)
+    payload += _pack_indices(typecode, string_literals)
+    payload += number_literals
+
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, len(payload), zlib.crc32(payload))
+    return header + payload
+
+
+def load_tokens(data: bytes | bytearray | memoryview) -> LoadedTokens:
+    # Raises `TokenFormatError` unless `data` is exactly one stream written by
+    # `dump_tokens`.
+    view = memoryview(data).cast("B")
+    if len(view) < _HEADER.size:
+        raise TokenFormatError(_TRUNCATED)
+
+    magic, version, size, checksum = _HEADER.unpack_from(view)
+    if magic != _MAGIC:
+        msg = "Not a token stream."
+        raise TokenFormatError(msg)
+    if version != FORMAT_VERSION:
+        msg = f"Unsupported token stream version {version}."
+        raise TokenFormatError(msg)
+
+    payload = view[_HEADER.size :]
+    if len(payload) < size:
+        raise TokenFormatError(_TRUNCATED)
+    if len(payload) > size or zlib.crc32(payload) != checksum:
+        raise TokenFormatError(_CORRUPT)
+
+    try:
+        return _decode(payload)
+    except IndexError:
+        # A varint ran past the end of the data, which the checksum let
+        # through.
+        raise TokenFormatError(_CORRUPT) from None
+
+
+def _decode(payload: memoryview) -> LoadedTokens:
+    # Works a column at a time, so that most of the work happens in builtins
+    # rather than in a loop over the tokens.
+    string_count, offset = _read_varint(payload, 0)
+    # Every string takes at least a byte, which bounds the count before
+    # anything is allocated for it.
+    _check_size(payload, offset + string_count)
+    strings = []
+    for _ in range(string_count):
+        length, offset = _read_varint(payload, offset)
+        _check_size(payload, offset + length)
+        try:
+            string = str(payload[offset : offset + length], "utf-8", "surrogatepass")
+        except UnicodeDecodeError:
+            raise TokenFormatError(_CORRUPT) from None
+        strings.append(string)
+        offset += length
+
+    # Likewise, every token takes at least two bytes.
+    token_count, offset = _read_varint(payload, offset)
+    _check_size(payload, offset + 2 * token_count)
+    type_bytes = payload[offset : offset + token_count].tobytes()
+    offset += token_count
+    types = type_bytes.translate(_ORDINAL_TABLE)
+    kinds = type_bytes.translate(_KIND_TABLE)
+    if max(types, default=0) >= len(_TOKEN_TYPES):
+        raise TokenFormatError(_CORRUPT)
+
+    differences, offset = _read_varints(payload, offset, token_count)
+    lines = list(
+        itertools.accumulate(
+            [difference >> 1 ^ -(difference & 1) for difference in differences],
+        ),
+    )
+
+    typecode = _index_typecode(string_count)
+    lexemes, offset = _read_indices(payload, offset, typecode, token_count)
+
+    literals: list[Any] = [None] * token_count
+    string_positions = [index for index, kind in enumerate(kinds) if kind == _STRING]
+    string_indices, offset = _read_indices(
+        payload,
+        offset,
+        typecode,
+        len(string_positions),
+    )
+    if max(lexemes, default=-1) >= string_count or (
+        max(string_indices, default=-1) >= string_count
+    ):
+        raise TokenFormatError(_CORRUPT)
+    for position, string_index in zip(string_positions, string_indices, strict=True):
+        literals[position] = strings[string_index]
+
+    lexeme_number_positions = [
+        index for index, kind in enumerate(kinds) if kind == _LEXEME_NUMBER
+    ]
+    # Number literals are parsed once per distinct lexeme.
+    numbers = {
+        lexeme: _parse_number(strings[lexeme])
+        for lexeme in {lexemes[position] for position in lexeme_number_positions}
+    }
+    if None in numbers.values():
+        raise TokenFormatError(_CORRUPT)
+    for position in lexeme_number_positions:
+        literals[position] = numbers[lexemes[position]]
+
+    number_positions = [index for index, kind in enumerate(kinds) if kind == _NUMBER]
+    if len(payload) - offset != len(number_positions) * _DOUBLE.size:
+        raise TokenFormatError(_CORRUPT)
+    for position, (number,) in zip(
+        number_positions,
+        _DOUBLE.iter_unpack(payload[offset:]),
+        strict=True,
+    ):
+        literals[position] = number
+
+    return LoadedTokens(types, strings, lexemes, literals, lines)
+
+
+def _parse_number(lexeme: str) -> float | None:
+    try:
+        return float(lexeme)
+    except ValueError:
+        return None
+
+
+def _check_size(payload: memoryview, size: int) -> None:
+    if size > len(payload):
+        raise TokenFormatError(_CORRUPT)
+
+
+def _index_typecode(string_count: int) -> str:
+    if string_count <= 1 << 8:
+        return "B"
+    if string_count <= 1 << 16:
+        return "H"
+    return "I"
+
+
+def _pack_indices(typecode: str, indices: list[int]) -> bytes:
+    packed = array(typecode, indices)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _read_indices(
+    payload: memoryview,
+    offset: int,
+    typecode: str,
+    count: int,
+) -> tuple[array[int], int]:
+    indices = array(typecode)
+    end = offset + count * indices.itemsize
+    _check_size(payload, end)
+    indices.frombytes(payload[offset:end])
+    if sys.byteorder == "big":
+        indices.byteswap()
+    return indices, end
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:  # noqa: PLR2004
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(payload: memoryview, offset: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    for size in range(_MAX_VARINT_SIZE):
+        byte = payload[offset + size]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:  # noqa: PLR2004
+            return value, offset + size + 1
+        shift += 7
+
+    raise TokenFormatError(_CORRUPT)
+
+
+def _read_varints(
+    payload: memoryview,
+    offset: int,
+    count: int,
+) -> tuple[list[int], int]:
+    # Most varints are a single byte. If the next `count` bytes all are, they
+    # are the values themselves.
+    chunk = payload[offset : offset + count]
+    if len(chunk) == count and max(chunk, default=0) < 0x80:  # noqa: PLR2004
+        return chunk.tolist(), offset + count
+
+    values = []
+    append = values.append
+    for _ in range(count):
+        byte = payload[offset]
+        if byte < 0x80:  # noqa: PLR2004
+            append(byte)
+            offset += 1
+        else:
+            value, offset = _read_varint(payload, offset)
+            append(value)
+
+    return values, offset
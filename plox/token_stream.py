@@ -0,0 +1,194 @@
+import mmap
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import Any, Final, Self, overload
+
+from plox.span import LineIndex, Span
+from plox.token import Token
+from plox.token_type import TokenType
+
+# Type codes of the type, start, length and line columns.
+COLUMN_TYPECODES: Final = ("B", "Q", "I", "I")
+
+_TOKEN_TYPES: Final[tuple[TokenType, ...]] = tuple(TokenType)
+_ORDINALS: Final[dict[TokenType, int]] = {
+    token_type: ordinal for ordinal, token_type in enumerate(_TOKEN_TYPES)
+}
+
+
+# A compact, column-oriented sequence of tokens. Every token is stored as four
+# integers: its type ordinal, and the start offset, length and line of its
+# lexeme. Lexemes, literals and `Token` objects are only created when a token is
+# accessed. The source may also be UTF-8 encoded bytes, in which case offsets
+# and lengths count bytes, and lexemes are decoded on access. Columns are not
+# stored either: spans find them in an index of line starts, built the first
+# time a span is asked for.
+class TokenStream(Sequence[Token]):
+    def __init__(
+        self: Self,
+        source: str | bytes | memoryview | mmap.mmap,
+        columns: Sequence[bytes] = (b"", b"", b"", b""),
+    ) -> None:
+        # `columns` are the output of `to_columns`, in the native byte order.
+        self._source = source
+
+        types, starts, lengths, lines = COLUMN_TYPECODES
+        self._types = array(types, columns[0])
+        self._starts = array(starts, columns[1])
+        self._lengths = array(lengths, columns[2])
+        self._lines = array(lines, columns[3])
+        self._line_index: LineIndex | None = None
+
+        if not (
+            len(self._types)
+            == len(self._starts)
+            == len(self._lengths)
+            == len(self._lines)
+        ):
+            msg = "Token stream columns differ in length."
+            raise ValueError(msg)
+
+    def append(
+        self: Self,
+        token_type: TokenType,
+        start: int,
+        length: int,
+        line: int,
+    ) -> None:
+        self._types.append(_ORDINALS[token_type])
+        self._starts.append(start)
+        self._lengths.append(length)
+        self._lines.append(line)
+
+    def extend_from(
+        self: Self,
+        other: "TokenStream",
+        start: int,
+        stop: int,
+        *,
+        offset_shift: int = 0,
+        line_shift: int = 0,
+    ) -> None:
+        # Copies the tokens `start` to `stop` of `other`, moving their lexemes
+        # by `offset_shift` characters and `line_shift` lines.
+        starts = other._starts[start:stop]  # noqa: SLF001
+        if offset_shift != 0:
+            starts = array(starts.typecode, map(offset_shift.__add__, starts))
+
+        lines = other._lines[start:stop]  # noqa: SLF001
+        if line_shift != 0:
+            lines = array(lines.typecode, map(line_shift.__add__, lines))
+
+        self._types.extend(other._types[start:stop])  # noqa: SLF001
+        self._starts.extend(starts)
+        self._lengths.extend(other._lengths[start:stop])  # noqa: SLF001
+        self._lines.extend(lines)
+
+    def to_columns(self: Self) -> tuple[bytes, bytes, bytes, bytes]:
+        return (
+            self._types.tobytes(),
+            self._starts.tobytes(),
+            self._lengths.tobytes(),
+            self._lines.tobytes(),
+        )
+
+    def __reduce__(self: Self) -> tuple[Any, ...]:
+        # Pickles the columns as raw bytes, e.g. to pass a stream between
+        # processes. A memory-mapped source is copied.
+        source = self._source
+        if not isinstance(source, str | bytes):
+            source = bytes(source)
+
+        return (type(self), (source, self.to_columns()))
+
+    @property
+    def source(self: Self) -> str | bytes | memoryview | mmap.mmap:
+        return self._source
+
+    def type(self: Self, index: int) -> TokenType:
+        return _TOKEN_TYPES[self._types[index]]
+
+    def start(self: Self, index: int) -> int:
+        return self._starts[index]
+
+    def length(self: Self, index: int) -> int:
+        return self._lengths[index]
+
+    def lexeme(self: Self, index: int) -> str:
+        start = self._starts[index]
+        return self._text(start, start + self._lengths[index])
+
+    def literal(self: Self, index: int) -> Any:
+        match _TOKEN_TYPES[self._types[index]]:
+            case TokenType.NUMBER:
+                return float(self.lexeme(index))
+            case TokenType.STRING:
+                # Trim the surrounding quotes.
+                start = self._starts[index]
+                return self._text(start + 1, start + self._lengths[index] - 1)
+            case _:
+                return None
+
+    def line(self: Self, index: int) -> int:
+        return self._lines[index]
+
+    @property
+    def line_index(self: Self) -> LineIndex:
+        if self._line_index is None:
+            self._line_index = LineIndex(self._source)
+
+        return self._line_index
+
+    def span(self: Self, index: int) -> Span:
+        # Unlike `line`, which is where the token ends, the span is placed at
+        # its start.
+        start = self._starts[index]
+        return self.line_index.span(start, start + self._lengths[index])
+
+    def nbytes(self: Self) -> int:
+        return sum(
+            column.itemsize * len(column)
+            for column in (self._types, self._starts, self._lengths, self._lines)
+        )
+
+    def __len__(self: Self) -> int:
+        return len(self._types)
+
+    @overload
+    def __getitem__(self: Self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self: Self, index: slice) -> list[Token]: ...
+
+    def __getitem__(self: Self, index: int | slice) -> Token | list[Token]:
+        if isinstance(index, slice):
+            return [self._token(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            msg = "token index out of range"
+            raise IndexError(msg)
+
+        return self._token(index)
+
+    def __iter__(self: Self) -> Iterator[Token]:
+        for index in range(len(self)):
+            yield self._token(index)
+
+    def _text(self: Self, start: int, end: int) -> str:
+        text = self._source[start:end]
+        # Bytes that are not valid UTF-8 have been reported by the scanner.
+        if isinstance(text, str):
+            return text
+
+        return str(text, "utf-8", "surrogateescape")
+
+    def _token(self: Self, index: int) -> Token:
+        return Token(
+            type=self.type(index),
+            lexeme=self.lexeme(index),
+            literal=self.literal(index),
+            line=self._lines[index],
+        )
@@ -0,0 +1,525 @@
+from __future__ import annotations
+
+import bisect
+import sys
+from typing import TYPE_CHECKING, Any, Final, Self
+
+from plox.chunk import CompiledFunction, OpCode
+from plox.errors import ErrorReporter, LoxRuntimeError
+from plox.limits import Budget, Limits
+from plox.runtime import (
+    BoundMethod,
+    Clock,
+    LoxCallable,
+    LoxClass,
+    LoxInstance,
+    is_equal,
+    stringify,
+)
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsWrite
+
+# The dispatch loop compares opcodes with plain integers, which is cheaper
+# than going through the enum.
+_CONSTANT: Final = OpCode.CONSTANT.value
+_NIL: Final = OpCode.NIL.value
+_TRUE: Final = OpCode.TRUE.value
+_FALSE: Final = OpCode.FALSE.value
+_POP: Final = OpCode.POP.value
+_GET_LOCAL: Final = OpCode.GET_LOCAL.value
+_SET_LOCAL: Final = OpCode.SET_LOCAL.value
+_GET_GLOBAL: Final = OpCode.GET_GLOBAL.value
+_DEFINE_GLOBAL: Final = OpCode.DEFINE_GLOBAL.value
+_SET_GLOBAL: Final = OpCode.SET_GLOBAL.value
+_GET_UPVALUE: Final = OpCode.GET_UPVALUE.value
+_SET_UPVALUE: Final = OpCode.SET_UPVALUE.value
+_EQUAL: Final = OpCode.EQUAL.value
+_NOT_EQUAL: Final = OpCode.NOT_EQUAL.value
+_GREATER: Final = OpCode.GREATER.value
+_GREATER_EQUAL: Final = OpCode.GREATER_EQUAL.value
+_LESS: Final = OpCode.LESS.value
+_LESS_EQUAL: Final = OpCode.LESS_EQUAL.value
+_ADD: Final = OpCode.ADD.value
+_SUBTRACT: Final = OpCode.SUBTRACT.value
+_MULTIPLY: Final = OpCode.MULTIPLY.value
+_DIVIDE: Final = OpCode.DIVIDE.value
+_NOT: Final = OpCode.NOT.value
+_NEGATE: Final = OpCode.NEGATE.value
+_PRINT: Final = OpCode.PRINT.value
+_JUMP: Final = OpCode.JUMP.value
+_JUMP_IF_FALSE: Final = OpCode.JUMP_IF_FALSE.value
+_JUMP_IF_TRUE: Final = OpCode.JUMP_IF_TRUE.value
+_POP_JUMP_IF_FALSE: Final = OpCode.POP_JUMP_IF_FALSE.value
+_LOOP: Final = OpCode.LOOP.value
+_CALL: Final = OpCode.CALL.value
+_CLOSURE: Final = OpCode.CLOSURE.value
+_CLOSE_UPVALUE: Final = OpCode.CLOSE_UPVALUE.value
+_RETURN: Final = OpCode.RETURN.value
+_CLASS: Final = OpCode.CLASS.value
+_INHERIT: Final = OpCode.INHERIT.value
+_METHOD: Final = OpCode.METHOD.value
+_GET_PROPERTY: Final = OpCode.GET_PROPERTY.value
+_SET_PROPERTY: Final = OpCode.SET_PROPERTY.value
+_INVOKE: Final = OpCode.INVOKE.value
+_GET_SUPER: Final = OpCode.GET_SUPER.value
+_SUPER_INVOKE: Final = OpCode.SUPER_INVOKE.value
+# Instructions that call a function or a method, handled together.
+_CALLS: Final = frozenset({_CALL, _INVOKE, _SUPER_INVOKE})
+
+
+class Upvalue:
+    # Refers to a stack slot while the captured variable is alive on the
+    # stack, and holds its value once it is closed.
+    __slots__ = ("index", "value")
+
+    def __init__(self: Self, index: int) -> None:
+        self.index = index
+        self.value: Any = None
+
+
+class Closure:
+    __slots__ = ("function", "upvalues")
+
+    def __init__(
+        self: Self,
+        function: CompiledFunction,
+        upvalues: list[Upvalue],
+    ) -> None:
+        self.function = function
+        self.upvalues = upvalues
+
+    def __str__(self: Self) -> str:
+        return str(self.function)
+
+
+def _capture_upvalue(open_upvalues: list[Upvalue], index: int) -> Upvalue:
+    # Open upvalues are kept sorted by stack slot, and shared by all closures
+    # capturing the same variable.
+    for upvalue in reversed(open_upvalues):
+        if upvalue.index == index:
+            return upvalue
+        if upvalue.index < index:
+            break
+
+    upvalue = Upvalue(index)
+    bisect.insort(open_upvalues, upvalue, key=lambda upvalue: upvalue.index)
+    return upvalue
+
+
+def _close_upvalues(open_upvalues: list[Upvalue], stack: list[Any], last: int) -> None:
+    while open_upvalues and open_upvalues[-1].index >= last:
+        upvalue = open_upvalues.pop()
+        upvalue.value = stack[upvalue.index]
+        upvalue.index = -1
+
+
+class VM:
+    # Executes compiled bytecode on a value stack. Calls push frames onto an
+    # explicit frame stack instead of recursing in Python, so the depth of
+    # calls is only bounded by the call depth limit, and calls in tail position
+    # reuse the frame of their caller.
+    def __init__(
+        self: Self,
+        error_reporter: ErrorReporter,
+        out: SupportsWrite[str] | None = None,
+        *,
+        limits: Limits | None = None,
+    ) -> None:
+        self._error_reporter = error_reporter
+        self._out = sys.stdout if out is None else out
+        self._limits = Limits() if limits is None else limits
+        self.globals: dict[str, Any] = {"clock": Clock()}
+
+    def interpret(self: Self, function: CompiledFunction) -> None:
+        try:
+            self._run(Closure(function, []), Budget(self._limits))
+        except LoxRuntimeError as error:
+            self._error_reporter.runtime_error(error)
+
+    def _run(self: Self, closure: Closure, budget: Budget) -> None:
+        stack: list[Any] = [closure]
+        frames: list[tuple[Any, ...]] = []
+        open_upvalues: list[Upvalue] = []
+        globals_ = self.globals
+        out = self._out
+        push = stack.append
+        pop = stack.pop
+
+        # The state of the running frame is held in locals.
+        chunk = closure.function.chunk
+        code = chunk.code
+        constants = chunk.constants
+        lines = chunk.lines
+        upvalues = closure.upvalues
+        base = 0
+        ip = 0
+
+        # Loop iterations and calls are steps. Limits that are not checked where
+        # they apply are checked once the steps reach `next_check`.
+        max_call_depth = budget.max_call_depth
+        steps = 0
+        allocations = 0
+        next_check = budget.next_check(steps)
+
+        while True:
+            op = code[ip]
+            ip += 1
+
+            # The most frequent instructions are tested first.
+            if op == _GET_LOCAL:
+                push(stack[base + code[ip]])
+                ip += 1
+            elif op == _CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+            elif op == _ADD:
+                right = pop()
+                left = stack[-1]
+                kind = type(left)
+                if kind is not type(right) or (kind is not float and kind is not str):
+                    raise LoxRuntimeError(
+                        lines[ip - 1],
+                        "Operands must be two numbers or two strings.",
+                    )
+                if kind is str:
+                    budget.check_string_length(lines[ip - 1], len(left) + len(right))
+                    allocations += 1
+                stack[-1] = left + right
+            elif op == _SET_LOCAL:
+                stack[base + code[ip]] = stack[-1]
+                ip += 1
+            elif op == _POP:
+                pop()
+            elif op == _LESS:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise LoxRuntimeError(lines[ip - 1], "Operands must be numbers.")
+                stack[-1] = left < right
+            elif op == _POP_JUMP_IF_FALSE:
+                value = pop()
+                if value is None or value is False:
+                    ip += code[ip] + 1
+                else:
+                    ip += 1
+            elif op == _LOOP:
+                steps += 1
+                if steps == next_check:
+                    next_check = budget.check(lines[ip - 1], steps, allocations)
+                ip += 1 - code[ip]
+            elif op == _GET_GLOBAL:
+                try:
+                    push(globals_[constants[code[ip]]])
+                except KeyError:
+                    name = constants[code[ip]]
+                    raise LoxRuntimeError(
+                        lines[ip],
+                        f"Undefined variable '{name}'.",
+                    ) from None
+                ip += 1
+            elif op == _SET_GLOBAL:
+                name = constants[code[ip]]
+                if name not in globals_:
+                    raise LoxRuntimeError(lines[ip], f"Undefined variable '{name}'.")
+                globals_[name] = stack[-1]
+                ip += 1
+            elif op == _SUBTRACT:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise LoxRuntimeError(lines[ip - 1], "Operands must be numbers.")
+                stack[-1] = left - right
+            elif op == _MULTIPLY:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise LoxRuntimeError(lines[ip - 1], "Operands must be numbers.")
+                stack[-1] = left * right
+            elif op in _CALLS:
+                if op == _CALL:
+                    argument_count = code[ip]
+                    ip += 1
+                    callee = stack[-1 - argument_count]
+                elif op == _INVOKE:
+                    # A method called right where it is accessed. The
+                    # receiver already sits in the slot of the callee.
+                    cache = constants[code[ip]]
+                    argument_count = code[ip + 1]
+                    ip += 2
+                    instance = stack[-1 - argument_count]
+                    if type(instance) is not LoxInstance:
+                        raise LoxRuntimeError(
+                            lines[ip - 1],
+                            "Only instances have properties.",
+                        )
+
+                    shape = instance.shape
+                    if shape is cache.key:
+                        callee = cache.entry
+                    else:
+                        callee = cache.miss(shape, shape.lookup)
+
+                    if type(callee) is int:
+                        callee = instance.fields[callee]
+                        stack[-1 - argument_count] = callee
+                    elif callee is None:
+                        raise LoxRuntimeError(
+                            lines[ip - 1],
+                            f"Undefined property '{cache.name}'.",
+                        )
+                else:
+                    name = constants[code[ip]]
+                    argument_count = code[ip + 1]
+                    ip += 2
+                    callee = pop().methods.get(name)
+                    if callee is None:
+                        raise LoxRuntimeError(
+                            lines[ip - 1],
+                            f"Undefined property '{name}'.",
+                        )
+
+                steps += 1
+                if steps == next_check:
+                    next_check = budget.check(lines[ip - 1], steps, allocations)
+
+                if type(callee) is not Closure:
+                    if type(callee) is BoundMethod:
+                        stack[-1 - argument_count] = callee.receiver
+                        callee = callee.method
+                    elif type(callee) is LoxClass:
+                        stack[-1 - argument_count] = LoxInstance(callee)
+                        allocations += 1
+                        initializer = callee.methods.get("init")
+                        if initializer is None:
+                            if argument_count != 0:
+                                raise LoxRuntimeError(
+                                    lines[ip - 1],
+                                    f"Expected 0 arguments but got {argument_count}.",
+                                )
+                            continue
+                        callee = initializer
+                    elif isinstance(callee, LoxCallable):
+                        if argument_count != callee.arity():
+                            raise LoxRuntimeError(
+                                lines[ip - 1],
+                                f"Expected {callee.arity()} arguments "
+                                f"but got {argument_count}.",
+                            )
+
+                        arguments = stack[len(stack) - argument_count :]
+                        del stack[len(stack) - argument_count - 1 :]
+                        push(callee.call(self, arguments))  # type: ignore[arg-type]
+                        continue
+                    else:
+                        raise LoxRuntimeError(
+                            lines[ip - 1],
+                            "Can only call functions and classes.",
+                        )
+
+                # Methods and initializers are closures too.
+                function = callee.function
+                if argument_count != function.arity:
+                    raise LoxRuntimeError(
+                        lines[ip - 1],
+                        f"Expected {function.arity} arguments "
+                        f"but got {argument_count}.",
+                    )
+
+                if code[ip] == _RETURN:
+                    # The caller returns whatever the call does, so the callee
+                    # takes over its frame and tail calls run in constant space.
+                    if open_upvalues:
+                        _close_upvalues(open_upvalues, stack, base)
+                    stack[base:] = stack[len(stack) - argument_count - 1 :]
+                else:
+                    if len(frames) == max_call_depth:
+                        raise LoxRuntimeError(lines[ip - 1], "Stack overflow.")
+
+                    frames.append((code, constants, lines, upvalues, ip, base))
+                    base = len(stack) - argument_count - 1
+
+                chunk = function.chunk
+                code = chunk.code
+                constants = chunk.constants
+                lines = chunk.lines
+                upvalues = callee.upvalues
+                ip = 0
+            elif op == _RETURN:
+                result = pop()
+                if open_upvalues:
+                    _close_upvalues(open_upvalues, stack, base)
+
+                if not frames:
+                    return
+
+                del stack[base:]
+                push(result)
+                code, constants, lines, upvalues, ip, base = frames.pop()
+            elif op == _GET_PROPERTY:
+                cache = constants[code[ip]]
+                ip += 1
+                instance = stack[-1]
+                if type(instance) is not LoxInstance:
+                    raise LoxRuntimeError(
+                        lines[ip - 1],
+                        "Only instances have properties.",
+                    )
+
+                shape = instance.shape
+                if shape is cache.key:
+                    entry = cache.entry
+                else:
+                    entry = cache.miss(shape, shape.lookup)
+
+                if type(entry) is int:
+                    stack[-1] = instance.fields[entry]
+                elif entry is None:
+                    raise LoxRuntimeError(
+                        lines[ip - 1],
+                        f"Undefined property '{cache.name}'.",
+                    )
+                else:
+                    stack[-1] = BoundMethod(entry, instance)
+                    allocations += 1
+            elif op == _SET_PROPERTY:
+                cache = constants[code[ip]]
+                ip += 1
+                value = pop()
+                instance = stack[-1]
+                if type(instance) is not LoxInstance:
+                    raise LoxRuntimeError(lines[ip - 1], "Only instances have fields.")
+
+                shape = instance.shape
+                if shape is cache.key:
+                    entry = cache.entry
+                else:
+                    entry = cache.miss(shape, shape.setter)
+
+                if type(entry) is int:
+                    instance.fields[entry] = value
+                else:
+                    instance.shape = entry
+                    instance.fields.append(value)
+                stack[-1] = value
+            elif op == _DIVIDE:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise LoxRuntimeError(lines[ip - 1], "Operands must be numbers.")
+                if right == 0:
+                    raise LoxRuntimeError(lines[ip - 1], "Division by zero.")
+                stack[-1] = left / right
+            elif op == _GREATER:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise LoxRuntimeError(lines[ip - 1], "Operands must be numbers.")
+                stack[-1] = left > right
+            elif op == _LESS_EQUAL:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise LoxRuntimeError(lines[ip - 1], "Operands must be numbers.")
+                stack[-1] = left <= right
+            elif op == _GREATER_EQUAL:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise LoxRuntimeError(lines[ip - 1], "Operands must be numbers.")
+                stack[-1] = left >= right
+            elif op == _EQUAL:
+                right = pop()
+                stack[-1] = is_equal(stack[-1], right)
+            elif op == _NOT_EQUAL:
+                right = pop()
+                stack[-1] = not is_equal(stack[-1], right)
+            elif op == _GET_UPVALUE:
+                upvalue = upvalues[code[ip]]
+                ip += 1
+                push(stack[upvalue.index] if upvalue.index >= 0 else upvalue.value)
+            elif op == _SET_UPVALUE:
+                upvalue = upvalues[code[ip]]
+                ip += 1
+                if upvalue.index >= 0:
+                    stack[upvalue.index] = stack[-1]
+                else:
+                    upvalue.value = stack[-1]
+            elif op == _JUMP:
+                ip += code[ip] + 1
+            elif op == _JUMP_IF_FALSE:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip += code[ip] + 1
+                else:
+                    ip += 1
+            elif op == _JUMP_IF_TRUE:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip += 1
+                else:
+                    ip += code[ip] + 1
+            elif op == _NIL:
+                push(None)
+            elif op == _TRUE:
+                push(True)  # noqa: FBT003
+            elif op == _FALSE:
+                push(False)  # noqa: FBT003
+            elif op == _NOT:
+                value = stack[-1]
+                stack[-1] = value is None or value is False
+            elif op == _NEGATE:
+                value = stack[-1]
+                if type(value) is not float:
+                    raise LoxRuntimeError(lines[ip - 1], "Operand must be a number.")
+                stack[-1] = -value
+            elif op == _PRINT:
+                print(stringify(pop()), file=out)
+            elif op == _DEFINE_GLOBAL:
+                globals_[constants[code[ip]]] = pop()
+                ip += 1
+            elif op == _CLOSURE:
+                function = constants[code[ip]]
+                ip += 1
+
+                captured = []
+                for _ in range(function.upvalue_count):
+                    if code[ip]:
+                        slot = base + code[ip + 1]
+                        captured.append(_capture_upvalue(open_upvalues, slot))
+                    else:
+                        captured.append(upvalues[code[ip + 1]])
+                    ip += 2
+
+                push(Closure(function, captured))
+                allocations += 1
+            elif op == _CLOSE_UPVALUE:
+                _close_upvalues(open_upvalues, stack, len(stack) - 1)
+                pop()
+            elif op == _GET_SUPER:
+                name = constants[code[ip]]
+                ip += 1
+                method = pop().methods.get(name)
+                if method is None:
+                    raise LoxRuntimeError(
+                        lines[ip - 1],
+                        f"Undefined property '{name}'.",
+                    )
+                stack[-1] = BoundMethod(method, stack[-1])
+                allocations += 1
+            elif op == _CLASS:
+                push(LoxClass(constants[code[ip]]))
+                ip += 1
+                allocations += 1
+            elif op == _INHERIT:
+                superclass = stack[-2]
+                if type(superclass) is not LoxClass:
+                    raise LoxRuntimeError(lines[ip - 1], "Superclass must be a class.")
+                pop().inherit(superclass)
+            elif op == _METHOD:
+                method = pop()
+                stack[-1].methods[constants[code[ip]]] = method
+                ip += 1
+            else:
+                msg = f"Unknown opcode {op}."
+                raise RuntimeError(msg)
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Self
+
+import pytest
+
+from plox import async_lox
+from plox.async_lox import AsyncLox, RunResult
+from plox.limits import Limits
+from plox.optimizer import Optimizer
+from plox.pipeline import Engine
+from plox.stmt import Stmt
+
+
+class TestAsyncLox:
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_runs_sources_concurrently(self: Self, engine: Engine) -> None:
+        async def run() -> list[RunResult]:
+            async with AsyncLox(engine=engine, max_workers=2) as lox:
+                return await asyncio.gather(
+                    *(
+                        lox.run_source(f"var a = {index}; print a * 2;")
+                        for index in range(20)
+                    ),
+                    lox.run_source("print 1 +;"),
+                    lox.run_source("print nil + 1;"),
+                )
+
+        *results, syntax_error, runtime_error = asyncio.run(run())
+
+        for index, result in enumerate(results):
+            assert result == RunResult(
+                output=f"{index * 2}\n",
+                errors=[],
+                had_error=False,
+                had_runtime_error=False,
+            )
+        assert syntax_error == RunResult(
+            output="",
+            errors=["[line 1] Error at ';': Expect expression."],
+            had_error=True,
+            had_runtime_error=False,
+        )
+        assert runtime_error.errors == [
+            "Operands must be two numbers or two strings.\n[line 1]",
+        ]
+        assert runtime_error.had_runtime_error is True
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_keeps_session_globals(self: Self, engine: Engine) -> None:
+        async def run() -> list[RunResult]:
+            async with AsyncLox(engine=engine) as lox:
+                session = lox.session()
+                other_session = lox.session()
+                return [
+                    await session.run_source("fun f() { return 1; } var a = f();"),
+                    await session.run_source("print a + 1;"),
+                    await other_session.run_source("print a;"),
+                    await session.run_source("print a;"),
+                ]
+
+        results = asyncio.run(run())
+
+        assert [result.output for result in results] == ["", "2\n", "", "1\n"]
+        assert results[2].errors == ["Undefined variable 'a'.\n[line 1]"]
+        assert results[3].errors == []
+
+    def test_serves_prompt(self: Self) -> None:
+        async def run() -> bytes:
+            async with AsyncLox() as lox:
+                server = await asyncio.start_server(lox.serve_repl, "127.0.0.1", 0)
+                port = server.sockets[0].getsockname()[1]
+                async with server:
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                    writer.write(b"var a = 1;\nprint a;\nprint b;\n")
+                    writer.write_eof()
+                    output = await reader.read()
+                    writer.close()
+                    await writer.wait_closed()
+                    return output
+
+        assert asyncio.run(run()) == b"> > 1\n> Undefined variable 'b'.\n[line 1]\n> "
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_stops_runaway_scripts(self: Self, engine: Engine) -> None:
+        async def run() -> list[RunResult]:
+            limits = Limits(timeout=0.01)
+            async with AsyncLox(engine=engine, max_workers=1, limits=limits) as lox:
+                return [
+                    await lox.run_source("while (true) {}"),
+                    await lox.run_source("print 1;"),
+                ]
+
+        runaway, result = asyncio.run(run())
+
+        assert runaway.errors == ["Timed out after 0.01 seconds.\n[line 1]"]
+        assert result.output == "1\n"
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_skips_optimizing_after_errors(
+        self: Self,
+        engine: Engine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        optimized = []
+
+        class CountingOptimizer(Optimizer):
+            def optimize(self: Self, statements: list[Stmt]) -> list[Stmt]:
+                optimized.append(statements)
+                return super().optimize(statements)
+
+        monkeypatch.setattr(async_lox, "Optimizer", CountingOptimizer)
+
+        async def run() -> RunResult:
+            async with AsyncLox(engine=engine) as lox:
+                return await lox.run_source("return 1;")
+
+        result = asyncio.run(run())
+
+        assert result.errors == [
+            "[line 1] Error at 'return': Can't return from top-level code.",
+        ]
+        assert optimized == []
@@ -0,0 +1,115 @@
+import pathlib
+import pickle
+from typing import Self
+
+import pytest
+
+from plox.batch import FileTokens, find_scripts, scan_file_parallel, tokenize_files
+from plox.errors import ListErrorReporter
+from plox.scanner import Scanner
+
+SOURCES = {
+    "a.lox": "var a = 1;",
+    "b/c.lox": 'print "c";\n@',
+    "b/d.lox": "fun d() {}",
+}
+
+
+@pytest.fixture
+def scripts(tmp_path: pathlib.Path) -> pathlib.Path:
+    for name, source in SOURCES.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(source)
+
+    (tmp_path / "notes.txt").write_text("not a script")
+
+    return tmp_path
+
+
+class TestBatch:
+    def test_finds_scripts(self: Self, scripts: pathlib.Path) -> None:
+        assert find_scripts(scripts) == [scripts / name for name in SOURCES]
+        assert find_scripts(scripts / "a.lox") == [scripts / "a.lox"]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_tokenizes_files(self: Self, scripts: pathlib.Path, jobs: int) -> None:
+        results = tokenize_files(find_scripts(scripts), jobs)
+
+        assert [result.path for result in results] == find_scripts(scripts)
+        for result, source in zip(results, SOURCES.values(), strict=True):
+            self._assert_scanned(result, source)
+
+    def test_pickles_token_stream(self: Self) -> None:
+        tokens = Scanner('var a = "b";', ListErrorReporter()).scan_token_stream()
+
+        restored = pickle.loads(pickle.dumps(tokens))  # noqa: S301
+
+        assert list(restored) == list(tokens)
+
+    def _assert_scanned(self: Self, result: FileTokens, source: str) -> None:
+        error_reporter = ListErrorReporter()
+        tokens = Scanner(source, error_reporter).scan_tokens()
+
+        assert list(result.tokens) == tokens
+        assert result.errors == error_reporter.errors
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            pytest.param("var a = 1;\n" * 40, id="plain"),
+            pytest.param(
+                'print "a\nb";\n' * 5 + '"\n\n\n\n\n\n\n\n\n\n";\nprint 1;\n' * 3,
+                id="strings across chunks",
+            ),
+            pytest.param(
+                "/*\n\n\n\n\n\n\n\n\n\n\n\n\n*/ var a;\n" * 3 + '// c "\n@ b;\n' * 4,
+                id="comments across chunks",
+            ),
+            pytest.param(
+                "print 1;\n" * 4 + '"\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n\n',
+                id="unterminated string",
+            ),
+            pytest.param(
+                "@#\nvar b;\r\n" * 6 + "/*\n\n\n\n\n\n\n\n\n\n\n\n\n\n",
+                id="unterminated comment",
+            ),
+        ],
+    )
+    def test_scans_file_in_chunks(
+        self: Self,
+        tmp_path: pathlib.Path,
+        source: str,
+    ) -> None:
+        path = tmp_path / "script.lox"
+        path.write_bytes(source.encode())
+        expected_reporter = ListErrorReporter()
+        expected = Scanner(path.read_text(), expected_reporter).scan_tokens()
+        error_reporter = ListErrorReporter()
+
+        tokens = scan_file_parallel(path, error_reporter, 4, min_chunk_size=8)
+
+        assert list(tokens) == expected
+        assert error_reporter.diagnostics == expected_reporter.diagnostics
+
+    def test_caps_errors_of_chunked_scan(self: Self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "script.lox"
+        path.write_text("@ var a;\n" * 20)
+        expected_reporter = ListErrorReporter()
+        expected = Scanner(
+            path.read_text(),
+            expected_reporter,
+            max_errors=5,
+        ).scan_token_stream()
+        error_reporter = ListErrorReporter()
+
+        tokens = scan_file_parallel(
+            path,
+            error_reporter,
+            4,
+            max_errors=5,
+            min_chunk_size=8,
+        )
+
+        assert list(tokens) == list(expected)
+        assert error_reporter.errors == expected_reporter.errors
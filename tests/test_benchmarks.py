@@ -0,0 +1,27 @@
+from typing import Self
+
+import pytest
+
+from benchmarks.corpora import SHAPES, generate, parse_size
+from plox.errors import ListErrorReporter
+from plox.scanner import Scanner
+
+
+class TestCorpora:
+    @pytest.mark.parametrize("shape", list(SHAPES))
+    def test_generates_valid_source(self: Self, shape: str) -> None:
+        error_reporter = ListErrorReporter()
+
+        source = generate(shape, 4096)
+        Scanner(source, error_reporter).scan_tokens()
+
+        assert len(source) >= 4096  # noqa: PLR2004
+        assert source == generate(shape, 4096)
+        assert error_reporter.had_error is False
+
+    @pytest.mark.parametrize(
+        ("size", "expected"),
+        [("64", 64), ("16KB", 16 * 1024), ("256mb", 256 * 1024**2)],
+    )
+    def test_parses_size(self: Self, size: str, expected: int) -> None:
+        assert parse_size(size) == expected
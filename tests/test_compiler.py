@@ -0,0 +1,131 @@
+from typing import Self
+
+from plox.chunk import CompiledFunction, OpCode
+from plox.compiler import Compiler
+from plox.errors import ListErrorReporter
+from plox.inline_cache import InlineCache
+from plox.parser import Parser
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+
+
+def compile_source(source: str, error_reporter: ListErrorReporter) -> CompiledFunction:
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    return Compiler(error_reporter).compile(statements)
+
+
+class TestCompiler:
+    def test_compiles_globals(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        function = compile_source("var a = 1;\nprint a + 1;", error_reporter)
+
+        chunk = function.chunk
+        assert list(chunk.code) == [
+            OpCode.CONSTANT, 0,
+            OpCode.DEFINE_GLOBAL, 1,
+            OpCode.GET_GLOBAL, 1,
+            OpCode.CONSTANT, 0,
+            OpCode.ADD,
+            OpCode.PRINT,
+            OpCode.NIL,
+            OpCode.RETURN,
+        ]  # fmt: skip
+        assert list(chunk.lines) == [1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2]
+        assert chunk.constants == [1.0, "a"]
+        assert error_reporter.errors == []
+
+    def test_compiles_locals_and_jumps(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        function = compile_source(
+            "{ var a = true; while (a) a = false; }",
+            error_reporter,
+        )
+
+        assert list(function.chunk.code) == [
+            OpCode.TRUE,
+            OpCode.GET_LOCAL, 1,
+            OpCode.POP_JUMP_IF_FALSE, 6,
+            OpCode.FALSE,
+            OpCode.SET_LOCAL, 1,
+            OpCode.POP,
+            OpCode.LOOP, 10,
+            OpCode.POP,
+            OpCode.NIL,
+            OpCode.RETURN,
+        ]  # fmt: skip
+        assert error_reporter.errors == []
+
+    def test_compiles_closures(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        function = compile_source(
+            "fun outer() { var a; fun middle() { fun inner() { a; } } }",
+            error_reporter,
+        )
+
+        outer = function.chunk.constants[0]
+        assert isinstance(outer, CompiledFunction)
+        middle = outer.chunk.constants[0]
+        assert isinstance(middle, CompiledFunction)
+        inner = middle.chunk.constants[0]
+        assert isinstance(inner, CompiledFunction)
+
+        assert (outer.upvalue_count, middle.upvalue_count, inner.upvalue_count) == (
+            0,
+            1,
+            1,
+        )
+        # `middle` captures the local `a`, and `inner` the upvalue of `middle`.
+        assert list(outer.chunk.code[1:5]) == [OpCode.CLOSURE, 0, 1, 1]
+        assert list(middle.chunk.code[:4]) == [OpCode.CLOSURE, 0, 0, 0]
+        assert list(inner.chunk.code[:2]) == [OpCode.GET_UPVALUE, 0]
+        assert error_reporter.errors == []
+
+    def test_reports_too_many_constants(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        source = "".join(f"{number};\n" for number in range(70_000))
+        compile_source(source, error_reporter)
+
+        assert error_reporter.errors[0] == (
+            "[line 65537] Error : Too many constants in one chunk."
+        )
+
+    def test_compiles_method_calls_as_invokes(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        function = compile_source(
+            "class A { m() { return this.x; } }\nA().m(1);",
+            error_reporter,
+        )
+
+        chunk = function.chunk
+        assert list(chunk.code) == [
+            OpCode.CLASS, 0,
+            OpCode.DEFINE_GLOBAL, 0,
+            OpCode.GET_GLOBAL, 0,
+            OpCode.CLOSURE, 1,
+            OpCode.METHOD, 2,
+            OpCode.POP,
+            OpCode.GET_GLOBAL, 0,
+            OpCode.CALL, 0,
+            OpCode.CONSTANT, 3,
+            OpCode.INVOKE, 4, 1,
+            OpCode.POP,
+            OpCode.NIL,
+            OpCode.RETURN,
+        ]  # fmt: skip
+        assert isinstance(chunk.constants[4], InlineCache)
+        assert chunk.constants[4].name == "m"
+
+        method = chunk.constants[1]
+        assert isinstance(method, CompiledFunction)
+        assert list(method.chunk.code[:4]) == [
+            OpCode.GET_LOCAL, 0,
+            OpCode.GET_PROPERTY, 0,
+        ]  # fmt: skip
+        assert error_reporter.errors == []
@@ -0,0 +1,115 @@
+from typing import Self
+
+import pytest
+
+from plox import embedded, pipeline
+from plox.embedded import EmbeddedLox, RunResult
+from plox.interner import Interner
+from plox.parser import Parser
+from plox.pipeline import Engine
+from plox.stmt import Stmt
+
+
+class TestEmbeddedLox:
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_isolates_executions(self: Self, engine: Engine) -> None:
+        lox = EmbeddedLox(engine=engine)
+
+        results = [
+            lox.execute("var a = 1; print a;"),
+            lox.execute("print a;"),
+            lox.execute("print 1 +;"),
+            lox.execute("print 1 +;"),
+            lox.execute("print nil + 1;"),
+            lox.execute("var a = 1; print a;"),
+        ]
+
+        assert results[0] == RunResult(
+            output="1\n",
+            errors=[],
+            had_error=False,
+            had_runtime_error=False,
+        )
+        assert results[1] == RunResult(
+            output="",
+            errors=["Undefined variable 'a'.\n[line 1]"],
+            had_error=False,
+            had_runtime_error=True,
+        )
+        assert (
+            results[2]
+            == results[3]
+            == RunResult(
+                output="",
+                errors=["[line 1] Error at ';': Expect expression."],
+                had_error=True,
+                had_runtime_error=False,
+            )
+        )
+        assert results[4].had_runtime_error is True
+        assert results[5] == results[0]
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_reuses_compiled_programs(
+        self: Self,
+        engine: Engine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        parses = []
+
+        class CountingParser(Parser):
+            def parse(self: Self) -> list[Stmt]:
+                parses.append(self)
+                return super().parse()
+
+        monkeypatch.setattr(pipeline, "Parser", CountingParser)
+        lox = EmbeddedLox(engine=engine, cache_size=2)
+        source = """
+        class A { value() { return 1; } }
+        class B < A { value() { return 2; } }
+        class C < A { value() { return 3; } }
+        var total = 0;
+        for (var i = 0; i < 9; i = i + 1) {
+            var item = A();
+            if (i < 3) item = B(); else if (i < 6) item = C();
+            total = total + item.value();
+        }
+        print total;
+        """
+
+        outputs = [lox.execute(source).output for _ in range(6)]
+        lox.execute("print 1;")
+        lox.execute("print 2;")
+        lox.execute(source)
+
+        assert outputs == ["18\n"] * 6
+        assert len(parses) == 4  # noqa: PLR2004
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_bounds_interned_lexemes(
+        self: Self,
+        engine: Engine,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        interners = []
+
+        class RecordingInterner(Interner):
+            def __init__(self: Self) -> None:
+                super().__init__()
+                interners.append(self)
+
+        monkeypatch.setattr(embedded, "Interner", RecordingInterner)
+        monkeypatch.setattr(embedded, "_MAX_INTERNED", 100)
+        lox = EmbeddedLox(engine=engine)
+
+        # Every source adds a string lexeme and its literal.
+        results = [lox.execute(f'print "value {i}";') for i in range(200)]
+        interner_count = len(interners)
+        lox.clear_cache()
+
+        assert [result.output for result in results] == [
+            f"value {i}\n" for i in range(200)
+        ]
+        assert interner_count > 1
+        assert max(len(interner) for interner in interners) <= 100 + 2
+        assert len(interners) == interner_count + 1
@@ -0,0 +1,73 @@
+import io
+from typing import Self
+
+from plox.errors import (
+    _BUFFER_SIZE,
+    Diagnostic,
+    ListErrorReporter,
+    LoxRuntimeError,
+    TextErrorReporter,
+)
+from plox.token import Token
+from plox.token_type import TokenType
+
+
+class TestDiagnostic:
+    def test_formats_static_error(self: Self) -> None:
+        assert str(Diagnostic(3, "Oops.", "at 'x'")) == "[line 3] Error at 'x': Oops."
+
+    def test_formats_runtime_error(self: Self) -> None:
+        assert str(Diagnostic(3, "Oops.", runtime=True)) == "Oops.\n[line 3]"
+
+
+class TestListErrorReporter:
+    def test_keeps_diagnostics(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        error_reporter.error(1, "First.")
+        error_reporter.token_error(Token(TokenType.EOF, "", None, 2), "Second.")
+        error_reporter.runtime_error(LoxRuntimeError(3, "Third."))
+
+        assert error_reporter.diagnostics == [
+            Diagnostic(1, "First."),
+            Diagnostic(2, "Second.", "at end"),
+            Diagnostic(3, "Third.", runtime=True),
+        ]
+        assert error_reporter.errors == [
+            "[line 1] Error : First.",
+            "[line 2] Error at end: Second.",
+            "Third.\n[line 3]",
+        ]
+        assert error_reporter.had_error is True
+        assert error_reporter.had_runtime_error is True
+
+
+class TestTextErrorReporter:
+    def test_writes_on_flush(self: Self) -> None:
+        out = io.StringIO()
+        error_reporter = TextErrorReporter(out)
+
+        error_reporter.error(1, "First.")
+        error_reporter.token_error(Token(TokenType.IDENTIFIER, "a", None, 2), "Two.")
+
+        assert out.getvalue() == ""
+        assert error_reporter.had_error is True
+
+        error_reporter.flush()
+
+        assert out.getvalue() == (
+            "[line 1] Error : First.\n[line 2] Error at 'a': Two.\n"
+        )
+
+    def test_writes_when_buffer_fills_up(self: Self) -> None:
+        out = io.StringIO()
+        error_reporter = TextErrorReporter(out)
+
+        for line in range(_BUFFER_SIZE + 1):
+            error_reporter.error(line, "Oops.")
+
+        assert out.getvalue().count("\n") == _BUFFER_SIZE
+
+        error_reporter.flush()
+
+        assert out.getvalue().count("\n") == _BUFFER_SIZE + 1
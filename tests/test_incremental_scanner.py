@@ -0,0 +1,100 @@
+import random
+from typing import Self
+
+import pytest
+
+from plox.errors import ListErrorReporter
+from plox.incremental_scanner import IncrementalScanner
+from plox.scanner import Scanner, ScannerEngine
+from plox.token_stream import TokenStream
+
+FRAGMENTS = [
+    *'(){},.-+;*/!=<> \t\n\n""@',
+    "//",
+    "/*",
+    "*/",
+    "var",
+    "name",
+    "12",
+    "3.4",
+    "é",
+]
+
+
+class TestIncrementalScanner:
+    @pytest.mark.parametrize(
+        ("source", "offset", "deleted", "inserted"),
+        [
+            pytest.param("a + b", 5, 0, "c", id="extend identifier"),
+            pytest.param("1. + 2", 2, 0, "5", id="extend number"),
+            pytest.param('a "b\nc" d\ne', 2, 0, '"', id="close string early"),
+            pytest.param('a "b\nc" d\ne', 2, 1, "", id="unterminate string"),
+            pytest.param("a /* b\n */ c\nd", 2, 2, "", id="uncomment"),
+            pytest.param("a b\nc\nd", 1, 0, "/*", id="unterminate comment"),
+            pytest.param("a\nb\nc\nd", 2, 0, "\n\n", id="shift lines"),
+            pytest.param("a @ b @ c", 0, 1, "", id="keep errors"),
+            pytest.param("", 0, 0, "var a;", id="empty source"),
+        ],
+    )
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_matches_full_rescan(
+        self: Self,
+        source: str,
+        offset: int,
+        deleted: int,
+        inserted: str,
+        engine: ScannerEngine,
+    ) -> None:
+        scanner = IncrementalScanner(source, engine)
+
+        scanner.edit(offset, deleted, inserted)
+
+        self._assert_matches_full_rescan(scanner)
+
+    def test_matches_full_rescan_after_random_edits(self: Self) -> None:
+        rng = random.Random(2024)  # noqa: S311
+
+        for _ in range(100):
+            scanner = IncrementalScanner(self._random_text(rng, 200))
+
+            for _ in range(10):
+                offset = rng.randint(0, len(scanner.source))
+                deleted = rng.randint(0, min(5, len(scanner.source) - offset))
+                scanner.edit(offset, deleted, self._random_text(rng, 5))
+
+                self._assert_matches_full_rescan(scanner)
+
+    def test_rescans_long_lexemes(self: Self) -> None:
+        source = 'a "' + "x" * 1000 + '" b /* ' + "y\n" * 1000 + "*/ c"
+        scanner = IncrementalScanner(source)
+
+        scanner.edit(3, 0, "z")
+        scanner.edit(len(scanner.source) - 8, 0, "w")
+
+        self._assert_matches_full_rescan(scanner)
+
+    def test_rejects_edit_out_of_range(self: Self) -> None:
+        scanner = IncrementalScanner("var a;")
+
+        with pytest.raises(ValueError, match="out of range"):
+            scanner.edit(5, 2, "")
+
+    def _random_text(self: Self, rng: random.Random, size: int) -> str:
+        return "".join(rng.choices(FRAGMENTS, k=rng.randint(0, size)))
+
+    def _assert_matches_full_rescan(self: Self, scanner: IncrementalScanner) -> None:
+        expected_reporter = ListErrorReporter()
+        error_reporter = ListErrorReporter()
+        expected_tokens = Scanner(
+            source=scanner.source,
+            error_reporter=expected_reporter,
+        ).scan_token_stream()
+
+        scanner.report_errors(error_reporter)
+
+        assert list(scanner.tokens) == list(expected_tokens)
+        assert self._spans(scanner.tokens) == self._spans(expected_tokens)
+        assert error_reporter.errors == expected_reporter.errors
+
+    def _spans(self: Self, tokens: TokenStream) -> list[tuple[int, int]]:
+        return [(tokens.start(i), tokens.length(i)) for i in range(len(tokens))]
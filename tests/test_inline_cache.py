@@ -0,0 +1,37 @@
+from typing import Self
+
+from plox.inline_cache import MAX_ENTRIES, InlineCache
+
+
+class TestInlineCache:
+    def test_resolves_each_key_once(self: Self) -> None:
+        resolved = []
+        cache = InlineCache("x")
+
+        def resolve(name: str) -> str:
+            resolved.append(name)
+            return f"{name}{len(resolved)}"
+
+        assert cache.miss("a", resolve) == "x1"
+        assert (cache.key, cache.entry, cache.entries) == ("a", "x1", None)
+        assert cache.miss("b", resolve) == "x2"
+        assert cache.miss("a", resolve) == "x1"
+        assert cache.miss("b", resolve) == "x2"
+
+        assert resolved == ["x", "x"]
+        assert cache.entries == {"a": "x1", "b": "x2"}
+        assert (cache.key, cache.entry) == ("b", "x2")
+        assert cache.megamorphic is False
+
+    def test_becomes_megamorphic(self: Self) -> None:
+        cache = InlineCache("x")
+
+        for key in range(MAX_ENTRIES):
+            cache.miss(key, str)
+        assert cache.megamorphic is False
+
+        assert cache.miss(MAX_ENTRIES, lambda name: name * 2) == "xx"
+        assert cache.megamorphic is True
+        assert cache.entries is not None
+        assert len(cache.entries) == MAX_ENTRIES
+        assert (cache.key, cache.entry) == (MAX_ENTRIES, "xx")
@@ -0,0 +1,28 @@
+from typing import Self
+
+from plox.interner import Interner
+
+
+class TestInterner:
+    def test_interns_strings(self: Self) -> None:
+        interner = Interner()
+        # Slices are new string objects, like the lexemes of a scanner.
+        source = "var name = name;"
+        first = source[4:8]
+        second = source[11:15]
+
+        assert first is not second
+        assert interner.string(first) is first
+        assert interner.string(second) is first
+        assert len(interner) == 1
+
+    def test_interns_numbers(self: Self) -> None:
+        interner = Interner()
+        source = "var a = 1.5;"
+
+        value = interner.number("1.5")
+
+        assert value == 1.5  # noqa: PLR2004
+        assert interner.number(source[8:11]) is value
+        assert interner.number("1.50") == value
+        assert len(interner) == 2  # noqa: PLR2004
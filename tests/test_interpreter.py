@@ -0,0 +1,288 @@
+import gc
+import io
+import sys
+from typing import Self
+
+import pytest
+
+from plox.errors import ListErrorReporter
+from plox.interpreter import Interpreter
+from plox.parser import Parser
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+
+
+def interpret(source: str, error_reporter: ListErrorReporter) -> str:
+    out = io.StringIO()
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    Interpreter(error_reporter, out).interpret(statements)
+    return out.getvalue()
+
+
+class TestInterpreter:
+    @pytest.mark.parametrize(
+        ("source", "expected"),
+        [
+            ("print 1 + 2 * 3;", "7"),
+            ("print 7 / 2;", "3.5"),
+            ("print -(1 - 3);", "2"),
+            ('print "a" + "b";', "ab"),
+            ("print 1 < 2 and 2 <= 2;", "true"),
+            ("print 1 > 2 or 2 >= 3;", "false"),
+            ("print nil or 0;", "0"),
+            ("print !nil;", "true"),
+            ("print 1 == 1 and 1 != true;", "true"),
+            ("print nil == false;", "false"),
+            ("var a; print a;", "nil"),
+        ],
+    )
+    def test_evaluates_expressions(self: Self, source: str, expected: str) -> None:
+        error_reporter = ListErrorReporter()
+
+        assert interpret(source, error_reporter) == f"{expected}\n"
+        assert error_reporter.errors == []
+
+    def test_executes_control_flow(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        out = interpret(
+            """
+            var total = 0;
+            for (var i = 0; i < 5; i = i + 1) {
+                if (i == 3) total = total + 10; else total = total + i;
+            }
+            var j = 0;
+            while (j < 2) j = j + 1;
+            print total;
+            print j;
+            """,
+            error_reporter,
+        )
+
+        assert out == "17\n2\n"
+        assert error_reporter.errors == []
+
+    def test_calls_functions(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        out = interpret(
+            """
+            fun fib(n) {
+                if (n < 2) return n;
+                return fib(n - 1) + fib(n - 2);
+            }
+            fun nothing() {}
+            print fib(15);
+            print nothing();
+            print fib;
+            print clock;
+            """,
+            error_reporter,
+        )
+
+        assert out == "610\nnil\n<fn fib>\n<native fn>\n"
+        assert error_reporter.errors == []
+
+    def test_captures_closures(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        out = interpret(
+            """
+            fun counter() {
+                var count = 0;
+                fun increment() {
+                    count = count + 1;
+                    return count;
+                }
+                return increment;
+            }
+            var first = counter();
+            var second = counter();
+            first();
+            print first();
+            print second();
+
+            var a = "global";
+            {
+                fun show() { print a; }
+                show();
+                var a = "local";
+                show();
+                print a;
+            }
+            """,
+            error_reporter,
+        )
+
+        assert out == "2\n1\nglobal\nglobal\nlocal\n"
+        assert error_reporter.errors == []
+
+    def test_leaves_no_cycles_for_plain_functions(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+        source = """
+        fun norm(x, y) {
+            fun square(n) { return n * n; }
+            return square(x) + square(y);
+        }
+        var total = 0;
+        for (var i = 0; i < COUNT; i = i + 1) total = total + norm(i, 1);
+        print total;
+        """
+
+        collected = []
+        gc.collect()
+        gc.disable()
+        try:
+            for count in ("10", "100"):
+                interpret(source.replace("COUNT", count), error_reporter)
+                collected.append(gc.collect())
+        finally:
+            gc.enable()
+
+        # The interpreter and the program leave some cycles of their own, but
+        # none are left per call.
+        assert collected[0] == collected[1]
+        assert error_reporter.errors == []
+
+    def test_returns_from_loops(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        out = interpret(
+            """
+            fun find() {
+                for (var i = 0; i < 10; i = i + 1) {
+                    { if (i == 4) return i; }
+                }
+                return -1;
+            }
+            print find();
+            """,
+            error_reporter,
+        )
+
+        assert out == "4\n"
+        assert error_reporter.errors == []
+
+    def test_runs_classes(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        out = interpret(
+            """
+            class Point {
+                init(x, y) { this.x = x; this.y = y; }
+                sum() { return this.x + this.y; }
+                scaled(factor) { return Point(this.x * factor, this.y * factor); }
+            }
+            class Solid < Point {
+                init(x, y, z) { super.init(x, y); this.z = z; }
+                sum() { return super.sum() + this.z; }
+            }
+            var point = Solid(1, 2, 3);
+            print point.sum();
+            print point.scaled(2).sum();
+            var sum = point.sum;
+            point.z = 10;
+            print sum();
+            print point.init(0, 0, 0) == point;
+            print point;
+            print Solid;
+            print sum;
+            fun twice(n) { return n * 2; }
+            point.sum = twice;
+            print point.sum(4);
+            """,
+            error_reporter,
+        )
+
+        assert out == "6\n6\n13\ntrue\nSolid instance\nSolid\n<fn sum>\n8\n"
+        assert error_reporter.errors == []
+
+    def test_misses_caches_of_redeclared_classes(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        out = interpret(
+            """
+            fun make(n) {
+                class A { value() { return n; } }
+                return A();
+            }
+            fun value(instance) { return instance.value(); }
+            for (var i = 0; i < 6; i = i + 1) print value(make(i));
+            fun nothing() {}
+            class B { value() { return "b"; } }
+            class C { init() { this.value = nothing; } }
+            class D {}
+            print value(B());
+            print value(C());
+            print value(D());
+            """,
+            error_reporter,
+        )
+
+        assert out == "0\n1\n2\n3\n4\n5\nb\nnil\n"
+        assert error_reporter.errors == [
+            "Undefined property 'value'.\n[line 6]",
+        ]
+
+    @pytest.mark.parametrize(
+        ("source", "error"),
+        [
+            ("print -nil;", "Operand must be a number.\n[line 1]"),
+            ("print 1 < nil;", "Operands must be numbers.\n[line 1]"),
+            (
+                'print 1 + "a";',
+                "Operands must be two numbers or two strings.\n[line 1]",
+            ),
+            ("print 1 / 0;", "Division by zero.\n[line 1]"),
+            ("print a;", "Undefined variable 'a'.\n[line 1]"),
+            ("a = 1;", "Undefined variable 'a'.\n[line 1]"),
+            ('"a"();', "Can only call functions and classes.\n[line 1]"),
+            ("fun f(a) {}\nf();", "Expected 1 arguments but got 0.\n[line 2]"),
+            ("fun f() { f(); }\nf();", "Stack overflow.\n[line 1]"),
+            ("print 1.a;", "Only instances have properties.\n[line 1]"),
+            ("nil.a = 1;", "Only instances have fields.\n[line 1]"),
+            ("class A {}\nprint A().a;", "Undefined property 'a'.\n[line 2]"),
+            ("class A {}\nA().a();", "Undefined property 'a'.\n[line 2]"),
+            ("var A = 1;\nclass B < A {}", "Superclass must be a class.\n[line 2]"),
+            ("class A {}\nA(1);", "Expected 0 arguments but got 1.\n[line 2]"),
+            (
+                "class A { init(a) {} }\nA();",
+                "Expected 1 arguments but got 0.\n[line 2]",
+            ),
+            (
+                "class A { m() { this.m(); } }\nA().m();",
+                "Stack overflow.\n[line 1]",
+            ),
+        ],
+    )
+    def test_reports_runtime_errors(self: Self, source: str, error: str) -> None:
+        error_reporter = ListErrorReporter()
+
+        out = interpret(f"{source} print 1;", error_reporter)
+
+        assert out == ""
+        assert error_reporter.had_runtime_error is True
+        assert error_reporter.errors == [error]
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "fun f(n) { if (n > 0) return f(n - 1) + 1; return 0; }\nprint f(500);",
+            "class A { m(n) { if (n > 0) return this.m(n - 1) + 1; return 0; } }\n"
+            "print A().m(500);",
+        ],
+        ids=["function", "method"],
+    )
+    def test_calls_deeper_than_recursion_limit(self: Self, source: str) -> None:
+        # Each call takes several Python frames, so 500 of them are beyond the
+        # default recursion limit.
+        error_reporter = ListErrorReporter()
+        limit = sys.getrecursionlimit()
+
+        out = interpret(source, error_reporter)
+
+        assert out == "500\n"
+        assert error_reporter.errors == []
+        assert sys.getrecursionlimit() == limit
@@ -0,0 +1,136 @@
+import os
+import pathlib
+from typing import Self
+
+import pytest
+
+from plox.__main__ import Lox
+from plox.embedded import EmbeddedLox
+from plox.errors import ListErrorReporter
+from plox.limits import Limits
+from plox.pipeline import Engine
+from plox.program_cache import ProgramCache
+
+
+class TestLimits:
+    @pytest.mark.parametrize("engine", list(Engine))
+    @pytest.mark.parametrize(
+        ("limits", "source", "error"),
+        [
+            (
+                Limits(max_steps=100),
+                "while (true) {}",
+                "Exceeded the limit of 100 steps.\n[line 1]",
+            ),
+            (
+                Limits(max_steps=100),
+                "fun f() {}\nfor (var i = 0; i < 60; i = i + 1) f();",
+                "Exceeded the limit of 100 steps.\n[line 2]",
+            ),
+            (
+                Limits(timeout=0.01),
+                "while (true) {}",
+                "Timed out after 0.01 seconds.\n[line 1]",
+            ),
+            (
+                Limits(max_string_length=64),
+                'var s = "ab";\nwhile (true) s = s + s;',
+                "Strings can't be longer than 64 characters.\n[line 2]",
+            ),
+            (
+                Limits(max_allocations=10),
+                "class A {}\nwhile (true) A();",
+                "Exceeded the limit of 10 allocations.\n[line 2]",
+            ),
+            (
+                Limits(max_call_depth=5),
+                "fun f(n) { if (n > 0) f(n - 1); }\nf(10);",
+                "Stack overflow.\n[line 1]",
+            ),
+        ],
+    )
+    def test_reports_exceeded_limits(
+        self: Self,
+        engine: Engine,
+        limits: Limits,
+        source: str,
+        error: str,
+    ) -> None:
+        result = EmbeddedLox(engine=engine, limits=limits).execute(source)
+
+        assert result.errors == [error]
+        assert result.had_runtime_error is True
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_limits_constant_strings(self: Self, engine: Engine) -> None:
+        limits = Limits(max_string_length=3)
+
+        # The optimizer does not fold what the engines would reject.
+        for optimize in (True, False):
+            lox = EmbeddedLox(engine=engine, optimize=optimize, limits=limits)
+            result = lox.execute('print "ab" + "cd";')
+
+            assert result.errors == [
+                "Strings can't be longer than 3 characters.\n[line 1]",
+            ]
+
+    def test_keeps_programs_apart_by_string_limit(
+        self: Self,
+        tmp_path: pathlib.Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        program_cache = ProgramCache(tmp_path)
+        script = tmp_path / "script.lox"
+        script.write_text('print "ab" + "cd";')
+
+        lox = Lox(ListErrorReporter(), engine=Engine.VM, program_cache=program_cache)
+        lox.run_file(str(script))
+        error_reporter = ListErrorReporter()
+        lox = Lox(
+            error_reporter,
+            engine=Engine.VM,
+            program_cache=program_cache,
+            limits=Limits(max_string_length=3),
+        )
+        with pytest.raises(SystemExit):
+            lox.run_file(str(script))
+
+        assert capsys.readouterr().out == "abcd\n"
+        assert error_reporter.errors == [
+            "Strings can't be longer than 3 characters.\n[line 1]",
+        ]
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_reports_through_error_reporter(self: Self, engine: Engine) -> None:
+        error_reporter = ListErrorReporter()
+        lox = Lox(error_reporter, engine=engine, limits=Limits(max_steps=10))
+
+        assert lox.run("while (true) {}") == os.EX_SOFTWARE
+
+        assert error_reporter.errors == ["Exceeded the limit of 10 steps.\n[line 1]"]
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_limits_every_run(
+        self: Self,
+        engine: Engine,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        error_reporter = ListErrorReporter()
+        lox = Lox(
+            error_reporter,
+            engine=engine,
+            limits=Limits(max_steps=100, max_call_depth=10),
+        )
+
+        for _ in range(3):
+            lox.run(
+                """
+                fun f(n) { if (n > 0) return f(n - 1) + 1; return 0; }
+                var total = 0;
+                for (var i = 0; i < 90; i = i + 1) total = total + 1;
+                print total + f(9);
+                """,
+            )
+
+        assert capsys.readouterr().out == "99\n" * 3
+        assert error_reporter.errors == []
@@ -0,0 +1,74 @@
+import builtins
+import os
+import pathlib
+from typing import Self
+
+import pytest
+
+from plox.__main__ import Lox
+from plox.errors import ListErrorReporter
+from plox.pipeline import Engine
+
+
+class TestLox:
+    @pytest.mark.parametrize("memory_map", [False, True])
+    def test_reports_invalid_utf8(
+        self: Self,
+        tmp_path: pathlib.Path,
+        memory_map: bool,  # noqa: FBT001
+    ) -> None:
+        path = tmp_path / "script.lox"
+        path.write_bytes(b"print 1;\nprint 2 \x89\x00\xff;\n")
+        error_reporter = ListErrorReporter()
+        lox = Lox(error_reporter, memory_map=memory_map)
+
+        with pytest.raises(SystemExit) as exit_info:
+            lox.run_file(str(path))
+
+        assert exit_info.value.code == os.EX_DATAERR
+        assert error_reporter.errors == ["[line 2] Error : Invalid UTF-8."]
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    @pytest.mark.parametrize(
+        ("source", "status"),
+        [
+            ("print 1;", os.EX_OK),
+            ("print 1", os.EX_DATAERR),
+            ("print -nil;", os.EX_SOFTWARE),
+        ],
+    )
+    def test_returns_status(
+        self: Self,
+        engine: Engine,
+        source: str,
+        status: int,
+    ) -> None:
+        lox = Lox(ListErrorReporter(), engine=engine)
+
+        assert lox.run(source) == status
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_prompt_continues_after_errors(
+        self: Self,
+        engine: Engine,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        lines = iter(["var a = 1;", "print a", "print -nil;", "print a + 1;"])
+
+        def read_line(_prompt: str) -> str:
+            try:
+                return next(lines)
+            except StopIteration:
+                raise EOFError from None
+
+        monkeypatch.setattr(builtins, "input", read_line)
+        error_reporter = ListErrorReporter()
+
+        Lox(error_reporter, engine=engine).run_prompt()
+
+        assert capsys.readouterr().out == "2\n"
+        assert error_reporter.errors == [
+            "[line 1] Error at end: Expect ';' after value.",
+            "Operand must be a number.\n[line 1]",
+        ]
@@ -0,0 +1,239 @@
+import io
+from typing import Self
+
+import pytest
+
+from plox.compiler import Compiler
+from plox.errors import ListErrorReporter
+from plox.expr import Binary, Literal, Logical, Variable
+from plox.interpreter import Interpreter
+from plox.optimizer import Optimizer
+from plox.parser import Parser
+from plox.pipeline import Engine
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+from plox.stmt import Block, Expression, Function, If, Print, Return, Stmt, Var, While
+from plox.vm import VM
+
+
+def parse(source: str) -> list[Stmt]:
+    error_reporter = ListErrorReporter()
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    assert error_reporter.errors == []
+    return statements
+
+
+def optimize(source: str) -> list[Stmt]:
+    return Optimizer().optimize(parse(source))
+
+
+def run(statements: list[Stmt], engine: Engine) -> tuple[str, list[str]]:
+    error_reporter = ListErrorReporter()
+    out = io.StringIO()
+    if engine is Engine.VM:
+        VM(error_reporter, out).interpret(Compiler(error_reporter).compile(statements))
+    else:
+        Interpreter(error_reporter, out).interpret(statements)
+
+    return out.getvalue(), error_reporter.errors
+
+
+def printed_value(source: str) -> object:
+    (statement,) = optimize(source)
+    assert type(statement) is Print
+    assert type(statement.expression) is Literal
+    return statement.expression.value
+
+
+SCRIPTS = [
+    pytest.param(
+        """
+        var a = 2;
+        print (1 + 2) * 3 - -a / 4;
+        print "a" + "b" + "c" == "abc";
+        print !nil and 1 <= 2 or a;
+        print nil or a;
+        print a == 2 and !(a != 2);
+        """,
+        id="expressions",
+    ),
+    pytest.param(
+        """
+        var total = 0;
+        for (var i = 0; i < 5; i = i + 1) {
+            if (1 > 2) { var unused = "x"; total = total + 100; }
+            else if (true) total = total + i * (2 + 3);
+            while (false) total = total - 1;
+            {}
+            1 + 2;
+        }
+        print total;
+        """,
+        id="dead branches",
+    ),
+    pytest.param(
+        """
+        fun f(n) {
+            if (n > 1) return n * f(n - 1);
+            return 1;
+            print "unreachable";
+        }
+        fun g() { if (false) return 1; }
+        print f(5);
+        print g();
+        """,
+        id="functions",
+    ),
+    pytest.param(
+        """
+        var a = 1;
+        {
+            var b = 2;
+            if (true) { var c = 3; print a + b + c; }
+            print b;
+        }
+        """,
+        id="scopes",
+    ),
+    pytest.param(
+        """
+        class A { value() { if (false) return 0; return 1 + 2; } }
+        class B < A {
+            init() { this.scale = 2 * 3; }
+            value() { return super.value() * this.scale; }
+        }
+        print B().value();
+        """,
+        id="classes",
+    ),
+    pytest.param("print 1; print 1 / 0; print 2;", id="division by zero"),
+    pytest.param('print 2; print -"a";', id="negated string"),
+    pytest.param('print "a" + 1;', id="mixed operands"),
+    pytest.param("print 1 < true;", id="compared boolean"),
+    pytest.param("print !(1 / 0);", id="nested error"),
+    pytest.param("print false and 1 / 0;", id="skipped error"),
+    pytest.param('if (1 / 0) print "a";', id="error in condition"),
+    pytest.param('nil(); print "a";', id="call of literal"),
+]
+
+
+class TestOptimizer:
+    @pytest.mark.parametrize(
+        ("source", "expected"),
+        [
+            ("print 1 + 2 * 3;", 7.0),
+            ("print -(1 - 3);", 2.0),
+            ("print 7 / 2;", 3.5),
+            ('print "a" + "b";', "ab"),
+            ("print 1 < 2;", True),
+            ("print 2 >= 3;", False),
+            ("print !nil;", True),
+            ("print !0;", False),
+            ("print 1 == 1;", True),
+            ('print "a" != "a";', False),
+            ("print nil == false;", False),
+            ("print ((1));", 1.0),
+            ("print nil or 0;", 0.0),
+            ("print 1 and nil;", None),
+            ('print false and "a";', False),
+            ('print "a" or false;', "a"),
+        ],
+    )
+    def test_folds_constants(
+        self: Self,
+        source: str,
+        expected: object,
+    ) -> None:
+        value = printed_value(source)
+
+        assert value == expected
+        assert type(value) is type(expected)
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "print 1 / 0;",
+            'print -"a";',
+            'print "a" + 1;',
+            "print 1 + nil;",
+            "print true > false;",
+            "print -nil;",
+        ],
+    )
+    def test_keeps_expressions_that_raise(self: Self, source: str) -> None:
+        (statement,) = optimize(source)
+
+        assert type(statement) is Print
+        assert type(statement.expression) is not Literal
+
+    def test_folds_around_variables(self: Self) -> None:
+        (_, statement) = optimize("var a; print a + (1 + 2);")
+
+        assert type(statement) is Print
+        assert type(statement.expression) is Binary
+        assert type(statement.expression.left) is Variable
+        assert type(statement.expression.right) is Literal
+        assert statement.expression.right.value == 3.0  # noqa: PLR2004
+
+    def test_keeps_logical_with_variable_on_left(self: Self) -> None:
+        (_, statement) = optimize("var a; print a or 1 + 1;")
+
+        assert type(statement) is Print
+        assert type(statement.expression) is Logical
+        assert type(statement.expression.right) is Literal
+
+    def test_removes_dead_code(self: Self) -> None:
+        statements = optimize(
+            """
+            if (false) print 1;
+            if (1 > 2) print 2; else print 3;
+            if (nil) { print 4; }
+            while (false) print 5;
+            while (1 == 2) { print 6; }
+            {}
+            1 + 2;
+            print 7;
+            """,
+        )
+
+        assert [type(statement) for statement in statements] == [Print, Print]
+
+    def test_removes_code_after_return(self: Self) -> None:
+        (function,) = optimize("fun f() { print 1; return 2; print 3; }")
+
+        assert type(function) is Function
+        assert [type(statement) for statement in function.body] == [Print, Return]
+
+    def test_keeps_taken_branch(self: Self) -> None:
+        (block,) = optimize("if (true) { var a = 1; print a; } else print 2;")
+
+        assert type(block) is Block
+        assert [type(statement) for statement in block.statements] == [Var, Print]
+
+    def test_empties_branches(self: Self) -> None:
+        (_, statement, loop) = optimize(
+            "var a; if (a) { if (false) print 1; } else {} while (a) 1;",
+        )
+
+        assert type(statement) is If
+        assert type(statement.then_branch) is Block
+        assert statement.then_branch.statements == []
+        assert statement.else_branch is None
+        assert type(loop) is While
+        assert type(loop.body) is Block
+
+    def test_keeps_side_effects(self: Self) -> None:
+        statements = optimize("var a; a = 1 + 1; a;")
+
+        assert [type(statement) for statement in statements] == [
+            Var,
+            Expression,
+            Expression,
+        ]
+
+    @pytest.mark.parametrize("source", SCRIPTS)
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_preserves_behavior(self: Self, source: str, engine: Engine) -> None:
+        assert run(optimize(source), engine) == run(parse(source), engine)
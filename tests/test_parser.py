@@ -0,0 +1,162 @@
+from typing import Self
+
+from plox.errors import ListErrorReporter
+from plox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Get,
+    Grouping,
+    Literal,
+    Logical,
+    Set,
+    Super,
+    This,
+    Unary,
+    Variable,
+)
+from plox.parser import Parser
+from plox.scanner import Scanner
+from plox.stmt import (
+    Block,
+    Class,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    Var,
+    While,
+)
+from plox.token_type import TokenType
+
+
+def parse(source: str, error_reporter: ListErrorReporter) -> list[Stmt]:
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    return Parser(tokens, error_reporter).parse()
+
+
+class TestParser:
+    def test_parses_precedence(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        [statement] = parse("-1 + 2 * (3 - 4) == 5 or !a and b;", error_reporter)
+
+        assert isinstance(statement, Expression)
+        expression = statement.expression
+        assert isinstance(expression, Logical)
+        assert expression.operator.type is TokenType.OR
+        assert isinstance(expression.right, Logical)
+        assert isinstance(expression.right.left, Unary)
+
+        equality = expression.left
+        assert isinstance(equality, Binary)
+        assert equality.operator.type is TokenType.EQUAL_EQUAL
+        assert isinstance(equality.left, Binary)
+        assert equality.left.operator.type is TokenType.PLUS
+        assert isinstance(equality.left.left, Unary)
+        assert isinstance(equality.left.right, Binary)
+        assert isinstance(equality.left.right.right, Grouping)
+        assert error_reporter.errors == []
+
+    def test_parses_declarations(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        statements = parse(
+            "var a = 1; fun f(x, y) { return x; } a = f(a, 2)(3); print a;",
+            error_reporter,
+        )
+
+        var, function, assignment, print_statement = statements
+        assert isinstance(var, Var)
+        assert isinstance(var.initializer, Literal)
+        assert var.initializer.value == 1.0
+        assert isinstance(function, Function)
+        assert [param.lexeme for param in function.params] == ["x", "y"]
+        assert isinstance(function.body[0], Return)
+        assert isinstance(assignment, Expression)
+        assert isinstance(assignment.expression, Assign)
+        assert isinstance(assignment.expression.value, Call)
+        assert isinstance(assignment.expression.value.callee, Call)
+        assert isinstance(print_statement, Print)
+        assert isinstance(print_statement.expression, Variable)
+        assert error_reporter.errors == []
+
+    def test_parses_classes(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        [klass, statement] = parse(
+            "class B < A { init(x) { this.x = x; } get() { return super.get(); } }"
+            "b.c.d = b.e().f;",
+            error_reporter,
+        )
+
+        assert isinstance(klass, Class)
+        assert klass.name.lexeme == "B"
+        assert isinstance(klass.superclass, Variable)
+        assert klass.superclass.name.lexeme == "A"
+        assert [method.name.lexeme for method in klass.methods] == ["init", "get"]
+        initializer = klass.methods[0].body[0]
+        assert isinstance(initializer, Expression)
+        assert isinstance(initializer.expression, Set)
+        assert isinstance(initializer.expression.object, This)
+        returned = klass.methods[1].body[0]
+        assert isinstance(returned, Return)
+        assert isinstance(returned.value, Call)
+        assert isinstance(returned.value.callee, Super)
+        assert returned.value.callee.method.lexeme == "get"
+
+        assert isinstance(statement, Expression)
+        assignment = statement.expression
+        assert isinstance(assignment, Set)
+        assert assignment.name.lexeme == "d"
+        assert isinstance(assignment.object, Get)
+        assert isinstance(assignment.value, Get)
+        assert isinstance(assignment.value.object, Call)
+        assert isinstance(assignment.value.object.callee, Get)
+        assert error_reporter.errors == []
+
+    def test_desugars_for_loop(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        [statement] = parse(
+            "for (var i = 0; i < 3; i = i + 1) if (i) print i; else print 0;",
+            error_reporter,
+        )
+
+        assert isinstance(statement, Block)
+        initializer, loop = statement.statements
+        assert isinstance(initializer, Var)
+        assert isinstance(loop, While)
+        assert isinstance(loop.body, Block)
+        body, increment = loop.body.statements
+        assert isinstance(body, If)
+        assert isinstance(increment, Expression)
+        assert error_reporter.errors == []
+
+    def test_reports_errors_and_synchronizes(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        statements = parse("var = 1; 1 = 2; print (1;\nprint 2", error_reporter)
+
+        assert len(statements) == 1
+        assert error_reporter.errors == [
+            "[line 1] Error at '=': Expect variable name.",
+            "[line 1] Error at '=': Invalid assignment target.",
+            "[line 1] Error at ';': Expect ')' after expression.",
+            "[line 2] Error at end: Expect ';' after value.",
+        ]
+
+    def test_reports_class_errors(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        parse("a.1; super; class { } class A < { } class B { 1 }", error_reporter)
+
+        assert error_reporter.errors == [
+            "[line 1] Error at '1': Expect property name after '.'.",
+            "[line 1] Error at ';': Expect '.' after 'super'.",
+            "[line 1] Error at '{': Expect class name.",
+            "[line 1] Error at '{': Expect superclass name.",
+            "[line 1] Error at '1': Expect method name.",
+        ]
@@ -0,0 +1,88 @@
+import io
+import json
+from typing import Self
+
+import pytest
+
+from plox.__main__ import Lox
+from plox.errors import ListErrorReporter
+from plox.pipeline import Engine
+from plox.profiling import Profile
+from plox.scanner import Scanner, ScannerEngine
+from plox.token_type import TokenType
+
+SOURCE = 'var a = "b"; /* c */ print 1 + 2; @'
+
+
+class TestProfiling:
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_profiles_scanner(self: Self, engine: ScannerEngine) -> None:
+        profile = Profile()
+        error_reporter = ListErrorReporter()
+
+        tokens = Scanner(SOURCE, error_reporter, engine, profile=profile).scan_tokens()
+
+        assert profile.token_counts[TokenType.NUMBER] == len(
+            [token for token in tokens if token.type is TokenType.NUMBER],
+        )
+        assert profile.token_counts.total() == len(tokens)
+        assert profile.error_count == len(error_reporter.errors)
+        assert profile.scanned == len(SOURCE)
+        assert profile.scan_seconds > 0
+        assert set(profile.sub_scanner_seconds) == {
+            "string",
+            "number",
+            "identifier",
+            "multiline_comment",
+        }
+        if engine is ScannerEngine.CLASSIC:
+            assert all(seconds > 0 for seconds in profile.sub_scanner_seconds.values())
+
+    def test_counts_streamed_tokens(self: Self) -> None:
+        profile = Profile()
+        expected = Scanner(SOURCE, ListErrorReporter()).scan_tokens()
+
+        for source in (io.StringIO(SOURCE), SOURCE.encode()):
+            scanner = Scanner(source, ListErrorReporter(), profile=profile)
+            if isinstance(source, bytes):
+                scanner.scan_token_stream()
+            else:
+                scanner.scan_tokens()
+
+        assert profile.token_counts.total() == 2 * len(expected)
+        assert profile.error_count == 2  # noqa: PLR2004
+
+    def test_does_not_instrument_unprofiled_scanner(self: Self) -> None:
+        scanner = Scanner(SOURCE, ListErrorReporter())
+
+        assert "_scan_string" not in vars(scanner)
+        assert "_scan_until" not in vars(scanner)
+
+    @pytest.mark.parametrize("engine", list(Engine))
+    def test_profiles_phases(
+        self: Self,
+        engine: Engine,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        profile = Profile()
+
+        Lox(ListErrorReporter(), engine=engine, profile=profile).run("print 1 + 2;")
+
+        assert capsys.readouterr().out == "3\n"
+        expected_phases = ["parse", "resolve", "optimize", "execute"]
+        if engine is Engine.VM:
+            expected_phases.insert(3, "compile")
+        assert list(profile.phase_seconds) == expected_phases
+        assert profile.token_counts.total() == 6  # noqa: PLR2004
+
+    def test_reports(self: Self) -> None:
+        profile = Profile()
+        Scanner(SOURCE, ListErrorReporter(), profile=profile).scan_tokens()
+
+        report = profile.report()
+
+        assert f"scanned {len(SOURCE)} characters" in report
+        assert "1 errors" in report
+        assert "  STRING" in report
+        counts = json.loads(json.dumps(profile.as_dict()))["token_counts"]
+        assert counts["NUMBER"] == 2  # noqa: PLR2004
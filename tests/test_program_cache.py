@@ -0,0 +1,173 @@
+import io
+import os
+import pathlib
+from typing import Self
+
+import pytest
+
+from plox import program_cache
+from plox.__main__ import Lox
+from plox.chunk import CompiledFunction
+from plox.compiler import Compiler
+from plox.errors import ListErrorReporter
+from plox.inline_cache import InlineCache
+from plox.parser import Parser
+from plox.pipeline import Engine
+from plox.profiling import Profile
+from plox.program_cache import ProgramCache
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+from plox.vm import VM
+
+SOURCE = """
+class Greeter {
+    init(name) { this.name = name; }
+    greet() { return "hello " + this.name; }
+}
+fun counter() {
+    var count = 0.5;
+    fun increment() { count = count + 1; return count; }
+    return increment;
+}
+print Greeter("\u00e9").greet();
+print counter()();
+"""
+
+
+def compile_source(source: str) -> CompiledFunction:
+    error_reporter = ListErrorReporter()
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    function = Compiler(error_reporter).compile(statements)
+    assert error_reporter.errors == []
+    return function
+
+
+def run(function: CompiledFunction) -> str:
+    out = io.StringIO()
+    VM(ListErrorReporter(), out).interpret(function)
+    return out.getvalue()
+
+
+def assert_same_function(
+    function: CompiledFunction,
+    expected: CompiledFunction,
+) -> None:
+    assert (function.name, function.arity, function.upvalue_count) == (
+        expected.name,
+        expected.arity,
+        expected.upvalue_count,
+    )
+    assert function.chunk.code == expected.chunk.code
+    assert function.chunk.lines == expected.chunk.lines
+    assert len(function.chunk.constants) == len(expected.chunk.constants)
+    for constant, expected_constant in zip(
+        function.chunk.constants,
+        expected.chunk.constants,
+        strict=True,
+    ):
+        assert type(constant) is type(expected_constant)
+        if type(constant) is CompiledFunction:
+            assert_same_function(constant, expected_constant)
+        elif type(constant) is InlineCache:
+            assert constant is not expected_constant
+            assert constant.name == expected_constant.name
+            assert constant.key is None
+        else:
+            assert constant == expected_constant
+
+
+class TestProgramCache:
+    def test_stores_and_loads_programs(self: Self, tmp_path: pathlib.Path) -> None:
+        cache = ProgramCache(tmp_path)
+        expected = compile_source(SOURCE)
+        run(expected)
+
+        assert cache.load(SOURCE, optimize=True) is None
+        cache.store(SOURCE, expected, optimize=True)
+        function = cache.load(SOURCE, optimize=True)
+
+        assert function is not None
+        assert_same_function(function, expected)
+        assert run(function) == run(expected) == "hello é\n1.5\n"
+        assert len(list(tmp_path.glob("*.loxc"))) == 1
+
+    def test_keys_on_bytecode_version_and_optimization(
+        self: Self,
+        tmp_path: pathlib.Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        cache = ProgramCache(tmp_path)
+        cache.store(SOURCE, compile_source(SOURCE), optimize=True)
+
+        assert cache.load(SOURCE, optimize=False) is None
+        assert cache.load(SOURCE + " ", optimize=True) is None
+        monkeypatch.setattr(program_cache, "BYTECODE_VERSION", -1)
+        assert cache.load(SOURCE, optimize=True) is None
+
+    @pytest.mark.parametrize(
+        "corrupt",
+        [
+            pytest.param(lambda data: data[:-1], id="truncated"),
+            pytest.param(lambda data: data + b"\0", id="trailing data"),
+            pytest.param(lambda data: b"XXXX" + data[4:], id="bad magic"),
+            pytest.param(lambda _: b"", id="empty"),
+        ],
+    )
+    def test_discards_corrupt_entry(
+        self: Self,
+        tmp_path: pathlib.Path,
+        corrupt: object,
+    ) -> None:
+        cache = ProgramCache(tmp_path)
+        cache.store(SOURCE, compile_source(SOURCE), optimize=True)
+        [path] = tmp_path.glob("*.loxc")
+        path.write_bytes(corrupt(path.read_bytes()))  # type: ignore[operator]
+
+        assert cache.load(SOURCE, optimize=True) is None
+        assert path.exists() is False
+
+    def test_evicts_least_recently_used(self: Self, tmp_path: pathlib.Path) -> None:
+        cache = ProgramCache(tmp_path)
+        for source in ["var a;", "var b;", "var c;"]:
+            cache.store(source, compile_source(source), optimize=True)
+        paths = sorted(tmp_path.glob("*.loxc"))
+        for age, path in enumerate(paths):
+            os.utime(path, (age, age))
+        max_size = sum(path.stat().st_size for path in paths)
+
+        ProgramCache(tmp_path, max_size=max_size).store(
+            "var d;",
+            compile_source("var d;"),
+            optimize=True,
+        )
+
+        assert paths[0].exists() is False
+        assert all(path.exists() for path in paths[1:])
+
+    def test_lox_skips_compiling_cached_programs(
+        self: Self,
+        tmp_path: pathlib.Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        script = tmp_path / "script.lox"
+        script.write_text(SOURCE)
+        cache = ProgramCache(tmp_path / "cache")
+        phases = []
+
+        for _ in range(2):
+            profile = Profile()
+            Lox(
+                ListErrorReporter(),
+                program_cache=cache,
+                engine=Engine.VM,
+                profile=profile,
+            ).run_file(str(script))
+            phases.append(list(profile.phase_seconds))
+
+        assert capsys.readouterr().out == "hello é\n1.5\n" * 2
+        assert phases == [
+            ["load", "parse", "resolve", "optimize", "compile", "execute"],
+            ["load", "execute"],
+        ]
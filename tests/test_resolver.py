@@ -0,0 +1,165 @@
+from typing import Self
+
+from plox.errors import ListErrorReporter
+from plox.expr import Assign, Binary, Super, This, Variable
+from plox.parser import Parser
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+from plox.stmt import Block, Class, Expression, Function, Print, Return, Stmt, Var
+
+
+def resolve(source: str, error_reporter: ListErrorReporter) -> list[Stmt]:
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    return statements
+
+
+class TestResolver:
+    def test_assigns_slots(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        [global_var, block] = resolve(
+            "var g; { var a; var b; { var c; print a + c; } b = g; }",
+            error_reporter,
+        )
+
+        assert isinstance(global_var, Var)
+        assert global_var.slot == -1
+        assert isinstance(block, Block)
+        assert block.size == 2  # noqa: PLR2004
+        first, second, inner, assignment = block.statements
+        assert isinstance(first, Var)
+        assert isinstance(second, Var)
+        assert (first.slot, second.slot) == (0, 1)
+
+        assert isinstance(inner, Block)
+        assert inner.size == 1
+        print_statement = inner.statements[1]
+        assert isinstance(print_statement, Print)
+        addition = print_statement.expression
+        assert isinstance(addition, Binary)
+        assert isinstance(addition.left, Variable)
+        assert isinstance(addition.right, Variable)
+        assert (addition.left.depth, addition.left.slot) == (1, 0)
+        assert (addition.right.depth, addition.right.slot) == (0, 0)
+
+        assert isinstance(assignment, Expression)
+        assert isinstance(assignment.expression, Assign)
+        assert (assignment.expression.depth, assignment.expression.slot) == (0, 1)
+        assert isinstance(assignment.expression.value, Variable)
+        assert assignment.expression.value.depth == -1
+        assert error_reporter.errors == []
+
+    def test_places_parameters_first(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        [function] = resolve("fun f(a, b) { var c; return b; }", error_reporter)
+
+        assert isinstance(function, Function)
+        assert function.size == 3  # noqa: PLR2004
+        returned = function.body[1]
+        assert isinstance(returned, Return)
+        assert isinstance(returned.value, Variable)
+        assert (returned.value.depth, returned.value.slot) == (0, 1)
+        assert error_reporter.errors == []
+
+    def test_reports_errors(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        resolve("return 1; { var a = a; var b; var b; }", error_reporter)
+
+        assert error_reporter.errors == [
+            "[line 1] Error at 'return': Can't return from top-level code.",
+            "[line 1] Error at 'a': Can't read local variable in its own initializer.",
+            "[line 1] Error at 'b': Already a variable with this name in this scope.",
+        ]
+
+    def test_places_this_before_parameters(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        [_, klass] = resolve(
+            "class A {} class B < A { m(a) { return super.m(this, a); } }",
+            error_reporter,
+        )
+
+        assert isinstance(klass, Class)
+        [method] = klass.methods
+        assert method.size == 2  # noqa: PLR2004
+        returned = method.body[0]
+        assert isinstance(returned, Return)
+        call = returned.value
+        assert call is not None
+        super_expression = call.callee  # type: ignore[attr-defined]
+        this_expression, parameter = call.arguments  # type: ignore[attr-defined]
+        assert isinstance(super_expression, Super)
+        assert (super_expression.depth, super_expression.slot) == (1, 0)
+        assert isinstance(this_expression, This)
+        assert (this_expression.depth, this_expression.slot) == (0, 0)
+        assert isinstance(parameter, Variable)
+        assert (parameter.depth, parameter.slot) == (0, 1)
+        assert error_reporter.errors == []
+
+    def test_reports_class_errors(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        resolve(
+            """
+            print this;
+            print super.a;
+            class A < A { init() { return 1; } }
+            class B { m() { super.m(); } }
+            fun f() { this; }
+            """,
+            error_reporter,
+        )
+
+        assert error_reporter.errors == [
+            "[line 2] Error at 'this': Can't use 'this' outside of a class.",
+            "[line 3] Error at 'super': Can't use 'super' outside of a class.",
+            "[line 4] Error at 'A': A class can't inherit from itself.",
+            "[line 4] Error at 'return': Can't return a value from an initializer.",
+            "[line 5] Error at 'super': "
+            "Can't use 'super' in a class with no superclass.",
+            "[line 6] Error at 'this': Can't use 'this' outside of a class.",
+        ]
+
+    def test_marks_capturing_functions(self: Self) -> None:
+        error_reporter = ListErrorReporter()
+
+        [outer, klass] = resolve(
+            """
+            fun outer(a) {
+                fun plain(b) { return b; }
+                fun reads() { return a; }
+                fun nested() { fun inner() { return a; } }
+                fun recursive(n) { return recursive(n); }
+            }
+            class A { m() { return this; } n() { fun f() { return this; } } }
+            """,
+            error_reporter,
+        )
+
+        assert isinstance(outer, Function)
+        assert outer.captures is False
+        plain, reads, nested, recursive = outer.body
+        assert isinstance(plain, Function)
+        assert isinstance(reads, Function)
+        assert isinstance(nested, Function)
+        assert isinstance(recursive, Function)
+        assert plain.captures is False
+        assert reads.captures is True
+        assert nested.captures is True
+        [inner] = nested.body
+        assert isinstance(inner, Function)
+        assert inner.captures is True
+        assert recursive.captures is True
+
+        assert isinstance(klass, Class)
+        method, other = klass.methods
+        assert method.captures is False
+        assert other.captures is False
+        [function] = other.body
+        assert isinstance(function, Function)
+        assert function.captures is True
+        assert error_reporter.errors == []
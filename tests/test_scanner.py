@@ -1,9 +1,26 @@
+import io
+import pathlib
+import random
 from typing import Self
 
 import pytest
 
 from plox.errors import ListErrorReporter
-from plox.scanner import Scanner
+from plox.interner import Interner
+from plox.profiling import Profile
+from plox.scanner import (
+    _IDENTIFIER,
+    _MULTILINE_COMMENT,
+    _NEWLINE,
+    _NUMBER,
+    _OPERATOR,
+    _STRING,
+    Scanner,
+    ScannerEngine,
+    _lexeme_pattern,
+    scan_file,
+)
+from plox.span import Span
 from plox.token import Token
 from plox.token_type import TokenType
 
@@ -429,16 +446,19 @@ class TestScanner:
             ),
         ],
     )
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
     def test_scans_tokens(
         self: Self,
         source: str,
         expected_tokens: list[Token],
+        engine: ScannerEngine,
     ) -> None:
         error_reporter = ListErrorReporter()
 
         scanner = Scanner(
             source=source,
             error_reporter=error_reporter,
+            engine=engine,
         )
 
         tokens = scanner.scan_tokens()
@@ -461,19 +481,442 @@ class TestScanner:
             ),
         ],
     )
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
     def test_reports_errors(
         self: Self,
         source: str,
         expected_errors: list[str],
+        engine: ScannerEngine,
     ) -> None:
         error_reporter = ListErrorReporter()
 
         scanner = Scanner(
             source=source,
             error_reporter=error_reporter,
+            engine=engine,
         )
 
         scanner.scan_tokens()
 
         assert error_reporter.had_error is True
         assert error_reporter.errors == expected_errors
+
+    @pytest.mark.parametrize(
+        ("source", "expected_errors"),
+        [
+            pytest.param(
+                "@#$",
+                ["[line 1] Error : Unexpected characters: '@#$'."],
+                id="run",
+            ),
+            pytest.param(
+                "@ #\n$",
+                [
+                    "[line 1] Error : Unexpected character: '@'.",
+                    "[line 1] Error : Unexpected character: '#'.",
+                    "[line 2] Error : Unexpected character: '$'.",
+                ],
+                id="separate characters",
+            ),
+            pytest.param(
+                "a@#b",
+                ["[line 1] Error : Unexpected characters: '@#'."],
+                id="inside identifier",
+            ),
+            pytest.param(
+                "@" * 100_000,
+                [
+                    "[line 1] Error : Unexpected characters: "
+                    f"{'@' * 16!r}... (100000 in total).",
+                ],
+                id="long run",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_coalesces_unexpected_characters(
+        self: Self,
+        source: str,
+        expected_errors: list[str],
+        engine: ScannerEngine,
+    ) -> None:
+        # Whole, split into chunks that cut the run and as bytes.
+        chunks = [source[index : index + 3] for index in range(0, len(source), 3)]
+        reporters = [ListErrorReporter() for _ in range(3)]
+
+        Scanner(source, reporters[0], engine).scan_tokens()
+        Scanner(chunks, reporters[1], engine).scan_tokens()
+        Scanner(memoryview(source.encode()), reporters[2]).scan_token_stream()
+
+        for error_reporter in reporters:
+            assert error_reporter.errors == expected_errors
+
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_reports_error_spans(self: Self, engine: ScannerEngine) -> None:
+        source = 'é @@ x\n  "ab'
+        error_reporter = ListErrorReporter()
+        byte_error_reporter = ListErrorReporter()
+        chunked_error_reporter = ListErrorReporter()
+
+        Scanner(source, error_reporter, engine).scan_tokens()
+        Scanner(memoryview(source.encode()), byte_error_reporter).scan_token_stream()
+        Scanner([source], chunked_error_reporter, engine).scan_tokens()
+
+        assert [diagnostic.span for diagnostic in error_reporter.diagnostics] == [
+            Span(start=2, end=4, line=1, column=3),
+            Span(start=9, end=12, line=2, column=3),
+        ]
+        # Offsets and columns of byte sources count bytes.
+        assert [diagnostic.span for diagnostic in byte_error_reporter.diagnostics] == [
+            Span(start=3, end=5, line=1, column=4),
+            Span(start=10, end=13, line=2, column=3),
+        ]
+        assert [
+            diagnostic.span for diagnostic in chunked_error_reporter.diagnostics
+        ] == [None, None]
+
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_stops_after_max_errors(self: Self, engine: ScannerEngine) -> None:
+        error_reporter = ListErrorReporter()
+
+        tokens = Scanner(
+            source="a @ b # c $ d % e",
+            error_reporter=error_reporter,
+            engine=engine,
+            max_errors=2,
+        ).scan_tokens()
+
+        assert error_reporter.errors == [
+            "[line 1] Error : Unexpected character: '@'.",
+            "[line 1] Error : Unexpected character: '#'.",
+            "[line 1] Error : Too many errors.",
+        ]
+        assert tokens[-1].type is TokenType.EOF
+
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_stops_iterating_after_max_errors(
+        self: Self,
+        engine: ScannerEngine,
+    ) -> None:
+        error_reporter = ListErrorReporter()
+
+        tokens = list(
+            Scanner(
+                source=["a @ b # c", " $ d % e"] * 1000,
+                error_reporter=error_reporter,
+                engine=engine,
+                max_errors=10,
+            ).iter_tokens(),
+        )
+
+        assert len(error_reporter.errors) == 11  # noqa: PLR2004
+        assert error_reporter.errors[-1] == "[line 1] Error : Too many errors."
+        assert tokens[-1].type is TokenType.EOF
+
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    @pytest.mark.parametrize(
+        "lexeme",
+        ["/* " + "a\n" * 50000 + "*/", '"' + "a\n" * 50000 + '"'],
+        ids=["comment", "string"],
+    )
+    def test_scans_lexemes_across_chunks_once(
+        self: Self,
+        engine: ScannerEngine,
+        lexeme: str,
+    ) -> None:
+        source = f"var a = 1;\nprint {lexeme};\nprint a;\n"
+        chunks = [source[start : start + 1000] for start in range(0, len(source), 1000)]
+        profile = Profile()
+        error_reporter = ListErrorReporter()
+
+        tokens = list(
+            Scanner(chunks, error_reporter, engine, profile=profile).iter_tokens(),
+        )
+
+        assert tokens == Scanner(source, ListErrorReporter(), engine).scan_tokens()
+        assert error_reporter.errors == []
+        # Not scanned again from its start for every chunk it spans.
+        assert profile.scanned < 4 * len(source)
+
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    @pytest.mark.parametrize("chunk_size", [None, 4096])
+    def test_keeps_tokens_before_max_errors(
+        self: Self,
+        engine: ScannerEngine,
+        chunk_size: int | None,
+    ) -> None:
+        # The errors only start in a later batch of the scanner.
+        source = "a b\n" * 20000 + "c @ d $ " * 20
+        expected_errors = ListErrorReporter()
+        expected = Scanner(
+            source,
+            expected_errors,
+            engine,
+            max_errors=10,
+        ).scan_tokens()
+
+        error_reporter = ListErrorReporter()
+        chunks = (
+            source
+            if chunk_size is None
+            else [
+                source[start : start + chunk_size]
+                for start in range(0, len(source), chunk_size)
+            ]
+        )
+        tokens = list(
+            Scanner(chunks, error_reporter, engine, max_errors=10).iter_tokens(),
+        )
+
+        assert tokens == expected
+        assert error_reporter.errors == expected_errors.errors
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            pytest.param("var a = 1.5;\nprint a >= 2;", id="statements"),
+            pytest.param("/* a\n * b */ + /* c", id="comments"),
+            pytest.param('"a\nb" "c', id="strings"),
+            pytest.param("12.5.3 7. .5", id="numbers"),
+            pytest.param("ab\u00e9c \u00e9 12\u0663 1.\u0663", id="non-ascii"),
+            pytest.param("@#$ _a \f \v", id="invalid characters"),
+            pytest.param("a/b//c\n/", id="slashes"),
+        ],
+    )
+    def test_engines_agree(self: Self, source: str) -> None:
+        self._assert_engines_agree(source)
+
+    def test_engines_agree_on_random_sources(self: Self) -> None:
+        rng = random.Random(1234)  # noqa: S311
+
+        for _ in range(500):
+            self._assert_engines_agree(self._random_source(rng))
+
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_iterates_tokens(self: Self, engine: ScannerEngine) -> None:
+        source = 'var a = "one\ntwo"; @ /* three\n */ a = a + 1.5;' * 5000
+        expected_reporter = ListErrorReporter()
+        error_reporter = ListErrorReporter()
+
+        expected_tokens = Scanner(
+            source=source,
+            error_reporter=expected_reporter,
+            engine=engine,
+        ).scan_tokens()
+        tokens = list(
+            Scanner(
+                source=source,
+                error_reporter=error_reporter,
+                engine=engine,
+            ).iter_tokens(),
+        )
+
+        assert tokens == expected_tokens
+        assert error_reporter.errors == expected_reporter.errors
+
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+    def test_scans_chunked_source(
+        self: Self,
+        engine: ScannerEngine,
+        chunk_size: int,
+    ) -> None:
+        rng = random.Random(chunk_size)  # noqa: S311
+
+        for _ in range(100):
+            source = self._random_source(rng)
+            chunks = [
+                source[i : i + chunk_size] for i in range(0, len(source), chunk_size)
+            ]
+            expected_reporter = ListErrorReporter()
+            error_reporter = ListErrorReporter()
+
+            expected_tokens = Scanner(
+                source=source,
+                error_reporter=expected_reporter,
+            ).scan_tokens()
+            tokens = Scanner(
+                source=chunks,
+                error_reporter=error_reporter,
+                engine=engine,
+            ).scan_tokens()
+
+            assert tokens == expected_tokens
+            assert error_reporter.errors == expected_reporter.errors
+
+    def test_scans_file_object(self: Self) -> None:
+        source = 'print "a long string";\n' * 10000
+        error_reporter = ListErrorReporter()
+
+        tokens = list(
+            Scanner(
+                source=io.StringIO(source),
+                error_reporter=error_reporter,
+            ).iter_tokens(),
+        )
+
+        assert tokens == Scanner(source, ListErrorReporter()).scan_tokens()
+        assert error_reporter.had_error is False
+
+    def test_scans_bytes(self: Self) -> None:
+        rng = random.Random(4321)  # noqa: S311
+
+        for _ in range(500):
+            source = self._random_source(rng)
+            expected_reporter = ListErrorReporter()
+            error_reporter = ListErrorReporter()
+
+            expected_tokens = Scanner(
+                source=source,
+                error_reporter=expected_reporter,
+            ).scan_tokens()
+            stream = Scanner(
+                source=memoryview(source.encode()),
+                error_reporter=error_reporter,
+            ).scan_token_stream()
+
+            assert list(stream) == expected_tokens
+            assert error_reporter.errors == expected_reporter.errors
+
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_interns_lexemes_and_literals(self: Self, engine: ScannerEngine) -> None:
+        interner = Interner()
+        source = 'var name = "text" + 1.5;\n'
+
+        first = Scanner(source, ListErrorReporter(), engine, interner=interner)
+        second = Scanner(source * 2, ListErrorReporter(), engine, interner=interner)
+        tokens = first.scan_tokens() + second.scan_tokens()
+
+        for token in tokens:
+            for other in tokens:
+                if token.lexeme == other.lexeme:
+                    assert token.lexeme is other.lexeme
+                    assert token.literal is other.literal
+
+    def test_rejects_tokens_from_bytes(self: Self) -> None:
+        scanner = Scanner(b"var a;", ListErrorReporter())
+
+        with pytest.raises(TypeError):
+            scanner.scan_tokens()
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            pytest.param("", id="empty"),
+            pytest.param('var \u00e9t\u00e9 = "\u017c\u00f3\u0142w";\n@', id="utf-8"),
+        ],
+    )
+    def test_scans_file(self: Self, tmp_path: pathlib.Path, source: str) -> None:
+        path = tmp_path / "script.lox"
+        path.write_bytes(source.encode())
+        expected_reporter = ListErrorReporter()
+        error_reporter = ListErrorReporter()
+
+        stream = scan_file(path, error_reporter)
+
+        assert list(stream) == Scanner(source, expected_reporter).scan_tokens()
+        assert error_reporter.errors == expected_reporter.errors
+
+    @pytest.mark.parametrize(
+        ("source", "expected_errors"),
+        [
+            pytest.param(
+                b"print 1;\n\xff\xfe;",
+                ["[line 2] Error : Invalid UTF-8."],
+                id="bytes",
+            ),
+            pytest.param(
+                b'print "a\xc3";\n@\xe9@',
+                [
+                    "[line 1] Error : Invalid UTF-8.",
+                    "[line 2] Error : Invalid UTF-8.",
+                ],
+                id="string",
+            ),
+            pytest.param(b"// \xff\n/* \xfe */", [], id="comments"),
+        ],
+    )
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_reports_invalid_utf8(
+        self: Self,
+        tmp_path: pathlib.Path,
+        source: bytes,
+        expected_errors: list[str],
+        engine: ScannerEngine,
+    ) -> None:
+        path = tmp_path / "script.lox"
+        path.write_bytes(source)
+        error_reporter = ListErrorReporter()
+        file_error_reporter = ListErrorReporter()
+
+        with path.open(errors="surrogateescape") as file:
+            tokens = list(Scanner(file, error_reporter, engine).iter_tokens())
+        stream = scan_file(path, file_error_reporter)
+
+        assert error_reporter.errors == expected_errors
+        assert file_error_reporter.errors == expected_errors
+        assert list(stream) == tokens
+
+    def test_counts_invalid_utf8_in_max_errors(
+        self: Self,
+        tmp_path: pathlib.Path,
+    ) -> None:
+        path = tmp_path / "script.lox"
+        path.write_bytes(b"\xff;\n\xfe;\n\xfd;\n")
+        error_reporter = ListErrorReporter()
+
+        stream = scan_file(path, error_reporter, max_errors=1)
+
+        assert error_reporter.errors == [
+            "[line 1] Error : Invalid UTF-8.",
+            "[line 2] Error : Too many errors.",
+        ]
+        assert stream.type(len(stream) - 1) is TokenType.EOF
+
+    def _random_source(self: Self, rng: random.Random) -> str:
+        fragments = [
+            *'(){},.-+;*/!=<> \t\r\n"@_',
+            "//",
+            "/*",
+            "*/",
+            "and",
+            "var",
+            "name",
+            "12",
+            "3.4",
+            "\u00e9",
+            "\u0663",
+            "\u2014",
+        ]
+        return "".join(rng.choices(fragments, k=rng.randint(0, 40)))
+
+    def _assert_engines_agree(self: Self, source: str) -> None:
+        classic_reporter = ListErrorReporter()
+        regex_reporter = ListErrorReporter()
+
+        classic_tokens = Scanner(
+            source=source,
+            error_reporter=classic_reporter,
+            engine=ScannerEngine.CLASSIC,
+        ).scan_tokens()
+        regex_tokens = Scanner(
+            source=source,
+            error_reporter=regex_reporter,
+            engine=ScannerEngine.REGEX,
+        ).scan_tokens()
+
+        assert regex_tokens == classic_tokens
+        assert regex_reporter.errors == classic_reporter.errors
+
+
+class TestLexemePattern:
+    def test_group_indices(self: Self) -> None:
+        # The scanner refers to the groups of its lexeme pattern by index.
+        groups = _lexeme_pattern().groupindex
+
+        assert groups["identifier"] == _IDENTIFIER
+        assert groups["operator"] == _OPERATOR
+        assert groups["number"] == _NUMBER
+        assert groups["string"] == _STRING
+        assert groups["newline"] == _NEWLINE
+        assert groups["multiline_comment"] == _MULTILINE_COMMENT
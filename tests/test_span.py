@@ -0,0 +1,30 @@
+from typing import Self
+
+import pytest
+
+from plox.span import LineIndex, Span
+
+
+class TestLineIndex:
+    @pytest.mark.parametrize(
+        ("offset", "expected"),
+        [(0, (1, 1)), (3, (1, 4)), (4, (2, 1)), (5, (3, 1)), (8, (4, 1)), (9, (4, 2))],
+    )
+    def test_locates_offsets(
+        self: Self,
+        offset: int,
+        expected: tuple[int, int],
+    ) -> None:
+        index = LineIndex("abc\n\nde\nf")
+
+        assert len(index) == 4  # noqa: PLR2004
+        assert index.locate(offset) == expected
+
+    def test_counts_from_first_line(self: Self) -> None:
+        index = LineIndex(b"a\nb", line=10)
+
+        assert index.locate(2) == (11, 1)
+        assert index.span(0, 3) == Span(start=0, end=3, line=10, column=1)
+
+    def test_indexes_empty_source(self: Self) -> None:
+        assert LineIndex("").span(0, 0) == Span(start=0, end=0, line=1, column=1)
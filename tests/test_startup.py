@@ -0,0 +1,80 @@
+import pathlib
+import subprocess
+import sys
+from typing import Final, Self
+
+import pytest
+
+# Time that importing everything needed to run a script may take. Generous, so
+# that it only trips when the startup path grows a new heavy import.
+_IMPORT_BUDGET_SECONDS: Final = 0.15
+
+# Modules that running a small script with the default options must not import.
+_DEFERRED_MODULES: Final = (
+    "argparse",
+    "concurrent.futures",
+    "hashlib",
+    "multiprocessing",
+    "pathlib",
+    "tempfile",
+    "plox.batch",
+    "plox.compiler",
+    "plox.profiling",
+    "plox.token_cache",
+    "plox.vm",
+)
+
+
+def _import_times(*args: str) -> dict[str, float]:
+    # Runs plox with `-X importtime` and returns the cumulative import time, in
+    # seconds, of every module it imported at the top level.
+    stderr = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-m", "plox", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+    times = {}
+    started = False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        if name.strip() == "plox":
+            # Everything before it is imported by Python itself.
+            started = True
+        if started and not name.startswith("  "):
+            times[name.strip()] = int(cumulative) / 1_000_000
+
+    return times
+
+
+@pytest.fixture
+def script(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "script.lox"
+    path.write_text("var a = 1;\nprint a + 2;\n")
+    return path
+
+
+class TestStartup:
+    def test_defers_heavy_imports(self: Self, script: pathlib.Path) -> None:
+        stderr = subprocess.run(  # noqa: S603
+            [sys.executable, "-X", "importtime", "-m", "plox", str(script)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stderr
+        imported = {line.split("|")[-1].strip() for line in stderr.splitlines()}
+
+        assert imported.isdisjoint(_DEFERRED_MODULES)
+
+    def test_import_time_within_budget(self: Self, script: pathlib.Path) -> None:
+        # The best of a few runs, to keep a busy machine from failing the test.
+        elapsed = min(sum(_import_times(str(script)).values()) for _ in range(3))
+
+        assert 0 < elapsed < _IMPORT_BUDGET_SECONDS
+
+    def test_imports_vm_when_selected(self: Self, script: pathlib.Path) -> None:
+        assert "plox.vm" in _import_times("--engine", "vm", str(script))
@@ -0,0 +1,108 @@
+import os
+import pathlib
+from typing import Self
+
+import pytest
+
+from plox import token_cache
+from plox.errors import ListErrorReporter
+from plox.scanner import Scanner
+from plox.token_cache import TokenCache
+
+SOURCE = 'var a = "one\ntwo";\n@ print a;'
+
+
+class TestTokenCache:
+    def test_stores_and_reuses_tokens(self: Self, tmp_path: pathlib.Path) -> None:
+        cache = TokenCache(tmp_path)
+        expected_reporter = ListErrorReporter()
+        expected_tokens = Scanner(SOURCE, expected_reporter).scan_tokens()
+
+        for _ in range(2):
+            error_reporter = ListErrorReporter()
+
+            tokens = cache.scan(SOURCE, error_reporter)
+
+            assert list(tokens) == expected_tokens
+            assert error_reporter.errors == expected_reporter.errors
+            assert len(list(tmp_path.glob("*.tokens"))) == 1
+
+    def test_hit_skips_scanning(
+        self: Self,
+        tmp_path: pathlib.Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        cache = TokenCache(tmp_path)
+        tokens = cache.scan(SOURCE, ListErrorReporter())
+        monkeypatch.setattr(token_cache, "Scanner", None)
+
+        assert list(cache.scan(SOURCE, ListErrorReporter())) == list(tokens)
+
+    def test_keys_on_scanner_version(
+        self: Self,
+        tmp_path: pathlib.Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        cache = TokenCache(tmp_path)
+        cache.scan(SOURCE, ListErrorReporter())
+        monkeypatch.setattr(token_cache, "SCANNER_VERSION", -1)
+
+        cache.scan(SOURCE, ListErrorReporter())
+
+        assert len(list(tmp_path.glob("*.tokens"))) == 2  # noqa: PLR2004
+
+    @pytest.mark.parametrize(
+        "corrupt",
+        [
+            pytest.param(lambda data: data[:-1], id="truncated"),
+            pytest.param(lambda data: data + b"\0", id="trailing data"),
+            pytest.param(lambda data: b"XXXX" + data[4:], id="bad magic"),
+            pytest.param(lambda _: b"", id="empty"),
+        ],
+    )
+    def test_replaces_corrupt_entry(
+        self: Self,
+        tmp_path: pathlib.Path,
+        corrupt: object,
+    ) -> None:
+        cache = TokenCache(tmp_path)
+        expected_tokens = list(cache.scan(SOURCE, ListErrorReporter()))
+        [path] = tmp_path.glob("*.tokens")
+        path.write_bytes(corrupt(path.read_bytes()))  # type: ignore[operator]
+        error_reporter = ListErrorReporter()
+
+        tokens = cache.scan(SOURCE, error_reporter)
+
+        assert list(tokens) == expected_tokens
+        assert error_reporter.had_error is True
+        assert list(TokenCache(tmp_path).scan(SOURCE, ListErrorReporter())) == (
+            expected_tokens
+        )
+
+    def test_evicts_least_recently_used(self: Self, tmp_path: pathlib.Path) -> None:
+        cache = TokenCache(tmp_path)
+        for i in range(3):
+            cache.scan(f"var a{i};", ListErrorReporter())
+        paths = sorted(tmp_path.glob("*.tokens"))
+        for age, path in enumerate(paths):
+            os.utime(path, (age, age))
+        max_size = sum(path.stat().st_size for path in paths)
+
+        TokenCache(tmp_path, max_size=max_size).scan("var b;", ListErrorReporter())
+
+        assert paths[0].exists() is False
+        assert all(path.exists() for path in paths[1:])
+        assert len(list(tmp_path.glob("*.tokens"))) == len(paths)
+
+    def test_removes_stale_temporary_files(self: Self, tmp_path: pathlib.Path) -> None:
+        stale = tmp_path / "tmpstale.tmp"
+        stale.write_bytes(b"partial")
+        os.utime(stale, (0, 0))
+        # Possibly still being written by another process.
+        fresh = tmp_path / "tmpfresh.tmp"
+        fresh.write_bytes(b"partial")
+
+        TokenCache(tmp_path).scan("var a;", ListErrorReporter())
+
+        assert stale.exists() is False
+        assert fresh.exists() is True
@@ -0,0 +1,119 @@
+import pathlib
+import struct
+import subprocess
+import sys
+from typing import Self
+
+import pytest
+
+from plox.errors import ListErrorReporter
+from plox.scanner import Scanner
+from plox.token import Token
+from plox.token_format import (
+    FORMAT_VERSION,
+    TokenFormatError,
+    dump_tokens,
+    load_tokens,
+)
+from plox.token_type import TokenType
+
+SOURCE = 'var a = "one\ntwo";\n/* é */ print a + 1.50;\n@ fun f() { return "é"; }'
+
+
+class TestTokenFormat:
+    @pytest.mark.parametrize(
+        "source",
+        [SOURCE, "", '"unterminated', "// \ud800 comment\nx", "a" * 70000],
+    )
+    def test_round_trips_scanner_output(self: Self, source: str) -> None:
+        tokens = Scanner(source, ListErrorReporter()).scan_tokens()
+
+        assert list(load_tokens(dump_tokens(tokens))) == tokens
+
+    def test_round_trips_many_strings(self: Self) -> None:
+        # More strings than fit in a one- or two-byte index.
+        source = " ".join(f'v{index} "{index}"' for index in range(40000))
+        tokens = Scanner(source, ListErrorReporter()).scan_tokens()
+
+        assert list(load_tokens(dump_tokens(tokens))) == tokens
+
+    def test_round_trips_any_tokens(self: Self) -> None:
+        tokens = [
+            Token(TokenType.NUMBER, "1", 2.5, 10),
+            Token(TokenType.STRING, "x", "y", 3),
+            Token(TokenType.IDENTIFIER, "x", None, 1_000_000),
+            Token(TokenType.NUMBER, "2", 2.0, 0),
+        ]
+
+        assert list(load_tokens(dump_tokens(tokens))) == tokens
+
+    def test_rejects_unsupported_literals(self: Self) -> None:
+        with pytest.raises(TypeError):
+            dump_tokens([Token(TokenType.TRUE, "true", True, 1)])  # noqa: FBT003
+
+    def test_accesses_columns(self: Self) -> None:
+        tokens = Scanner(SOURCE, ListErrorReporter()).scan_tokens()
+
+        loaded = load_tokens(dump_tokens(tokens))
+
+        assert len(loaded) == len(tokens)
+        assert loaded[3] == tokens[3]
+        assert loaded[-1] == tokens[-1]
+        assert loaded[2:6] == tokens[2:6]
+        assert [loaded.type(index) for index in range(len(loaded))] == [
+            token.type for token in tokens
+        ]
+        assert loaded.lexeme(3) == tokens[3].lexeme
+        assert loaded.literal(3) == "one\ntwo"
+        assert loaded.line(5) == tokens[5].line
+
+    def test_loads_from_memoryview(self: Self) -> None:
+        tokens = Scanner(SOURCE, ListErrorReporter()).scan_tokens()
+
+        data = memoryview(bytearray(dump_tokens(tokens)))
+
+        assert list(load_tokens(data)) == tokens
+
+    def test_rejects_truncated_data(self: Self) -> None:
+        data = dump_tokens(Scanner(SOURCE, ListErrorReporter()).scan_tokens())
+
+        for size in range(len(data)):
+            with pytest.raises(TokenFormatError):
+                load_tokens(data[:size])
+
+    def test_rejects_trailing_data(self: Self) -> None:
+        data = dump_tokens(Scanner(SOURCE, ListErrorReporter()).scan_tokens())
+
+        with pytest.raises(TokenFormatError):
+            load_tokens(data + b"\x00")
+
+    def test_rejects_corrupt_data(self: Self) -> None:
+        data = dump_tokens(Scanner(SOURCE, ListErrorReporter()).scan_tokens())
+
+        for index in range(len(data)):
+            corrupt = bytearray(data)
+            corrupt[index] ^= 0x10
+            with pytest.raises(TokenFormatError):
+                load_tokens(corrupt)
+
+    def test_rejects_other_versions(self: Self) -> None:
+        data = bytearray(dump_tokens([]))
+        struct.pack_into("<H", data, 4, FORMAT_VERSION + 1)
+
+        with pytest.raises(TokenFormatError, match="version"):
+            load_tokens(data)
+
+    def test_emits_tokens(self: Self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "script.lox"
+        path.write_text(SOURCE)
+        expected = Scanner(SOURCE, ListErrorReporter()).scan_tokens()
+
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-m", "plox", "--emit-tokens", str(path)],
+            check=False,
+            capture_output=True,
+        )
+
+        assert list(load_tokens(result.stdout)) == expected
+        assert result.stderr == b"[line 4] Error : Unexpected character: '@'.\n"
+        assert result.returncode == 65  # noqa: PLR2004
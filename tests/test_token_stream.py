@@ -0,0 +1,108 @@
+from typing import Self
+
+import pytest
+
+from plox.errors import ListErrorReporter
+from plox.scanner import Scanner, ScannerEngine
+from plox.span import Span
+from plox.token import Token
+from plox.token_stream import TokenStream
+from plox.token_type import TokenType
+
+SOURCE = 'var a = "one\ntwo";\n/* comment\n */ print a + 1.5; @ b.c != 2.'
+
+
+class TestTokenStream:
+    @pytest.mark.parametrize("engine", list(ScannerEngine))
+    def test_matches_scanned_tokens(self: Self, engine: ScannerEngine) -> None:
+        expected_reporter = ListErrorReporter()
+        error_reporter = ListErrorReporter()
+
+        expected_tokens = Scanner(
+            source=SOURCE,
+            error_reporter=expected_reporter,
+            engine=engine,
+        ).scan_tokens()
+        stream = Scanner(
+            source=SOURCE,
+            error_reporter=error_reporter,
+            engine=engine,
+        ).scan_token_stream()
+
+        assert list(stream) == expected_tokens
+        assert len(stream) == len(expected_tokens)
+        assert error_reporter.errors == expected_reporter.errors
+
+    def test_indexes_tokens(self: Self) -> None:
+        stream = Scanner(SOURCE, ListErrorReporter()).scan_token_stream()
+
+        assert stream[3] == Token(
+            type=TokenType.STRING,
+            lexeme='"one\ntwo"',
+            literal="one\ntwo",
+            line=2,
+        )
+        assert stream[-1] == Token(
+            type=TokenType.EOF,
+            lexeme="",
+            literal=None,
+            line=4,
+        )
+        assert stream[6:8] == [
+            Token(type=TokenType.IDENTIFIER, lexeme="a", literal=None, line=4),
+            Token(type=TokenType.PLUS, lexeme="+", literal=None, line=4),
+        ]
+
+    def test_accesses_columns(self: Self) -> None:
+        stream = Scanner(SOURCE, ListErrorReporter()).scan_token_stream()
+
+        assert stream.type(8) is TokenType.NUMBER
+        assert stream.lexeme(8) == "1.5"
+        assert stream.literal(8) == 1.5  # noqa: PLR2004
+        assert stream.line(8) == 4  # noqa: PLR2004
+
+    def test_finds_spans(self: Self) -> None:
+        stream = Scanner(SOURCE, ListErrorReporter()).scan_token_stream()
+
+        # The string ends on line 2, but starts on line 1.
+        assert stream.span(3) == Span(start=8, end=17, line=1, column=9)
+        assert stream.span(8) == Span(start=44, end=47, line=4, column=15)
+        assert stream.span(len(stream) - 1) == Span(
+            start=60,
+            end=60,
+            line=4,
+            column=31,
+        )
+        assert len(stream.line_index) == 4  # noqa: PLR2004
+
+    @pytest.mark.parametrize("index", [2, -3])
+    def test_raises_on_index_out_of_range(self: Self, index: int) -> None:
+        stream = TokenStream("a")
+        stream.append(TokenType.IDENTIFIER, 0, 1, 1)
+        stream.append(TokenType.EOF, 1, 0, 1)
+
+        with pytest.raises(IndexError):
+            stream[index]
+
+    def test_restores_columns(self: Self) -> None:
+        stream = TokenStream("a b")
+        stream.append(TokenType.IDENTIFIER, 0, 1, 1)
+        stream.append(TokenType.IDENTIFIER, 2, 1, 1)
+
+        restored = TokenStream(stream.source, stream.to_columns())
+
+        assert list(restored) == list(stream)
+
+    def test_rejects_columns_of_different_lengths(self: Self) -> None:
+        stream = TokenStream("a")
+        stream.append(TokenType.IDENTIFIER, 0, 1, 1)
+        types, starts, lengths, _ = stream.to_columns()
+
+        with pytest.raises(ValueError, match="differ in length"):
+            TokenStream("a", (types, starts, lengths, b""))
+
+    def test_rejects_chunked_source(self: Self) -> None:
+        scanner = Scanner(["var a;"], ListErrorReporter())
+
+        with pytest.raises(TypeError):
+            scanner.scan_token_stream()
@@ -0,0 +1,294 @@
+import io
+from typing import Self
+
+import pytest
+
+from plox.compiler import Compiler
+from plox.errors import ListErrorReporter
+from plox.interpreter import Interpreter
+from plox.limits import Limits
+from plox.optimizer import Optimizer
+from plox.parser import Parser
+from plox.resolver import Resolver
+from plox.scanner import Scanner
+from plox.stmt import Stmt
+from plox.vm import VM
+
+PROGRAMS = [
+    "print 1 + 2 * 3 - 4 / 8;",
+    'print "a" + "b" == "ab";',
+    "print 1 < 2 and 2 <= 2 and !(3 > 4) and 4 >= 4 and 1 != 2;",
+    "print nil or false; print nil and 1; print 0 or 1; print 1 and 2;",
+    "print -(-1); print !nil; print nil == false; print true == 1;",
+    "var a; print a; a = 2; print a = 3; print a;",
+    """
+    var total = 0;
+    for (var i = 0; i < 10; i = i + 1) {
+        if (i == 3) total = total + 10; else if (i > 7) total = total - i;
+        else total = total + i;
+    }
+    print total;
+    """,
+    """
+    fun fib(n) {
+        if (n < 2) return n;
+        return fib(n - 1) + fib(n - 2);
+    }
+    fun nothing() {}
+    print fib(15);
+    print nothing();
+    print fib;
+    print clock;
+    """,
+    """
+    fun counter() {
+        var count = 0;
+        fun increment() {
+            count = count + 1;
+            return count;
+        }
+        return increment;
+    }
+    var first = counter();
+    var second = counter();
+    first();
+    print first();
+    print second();
+    """,
+    """
+    var a = "global";
+    {
+        fun show() { print a; }
+        show();
+        var a = "local";
+        show();
+        print a;
+    }
+    """,
+    """
+    var getters = nil;
+    for (var i = 0; i < 3; i = i + 1) {
+        var j = i;
+        fun get() { return j; }
+        if (i == 1) getters = get;
+    }
+    print getters();
+    """,
+    """
+    fun pair() {
+        var value = 1;
+        fun get() { return value; }
+        fun set(new) { value = new; }
+        set(5);
+        print get();
+        return get;
+    }
+    print pair()();
+    """,
+    """
+    fun outer() {
+        var x = "outer";
+        fun middle() {
+            fun inner() { return x; }
+            return inner;
+        }
+        return middle;
+    }
+    print outer()()();
+    """,
+    """
+    fun find() {
+        for (var i = 0; i < 10; i = i + 1) {
+            { var unused = i; if (i == 4) return i; }
+        }
+        return -1;
+    }
+    print find();
+    """,
+    """
+    class Point {
+        init(x, y) { this.x = x; this.y = y; }
+        sum() { return this.x + this.y; }
+        scaled(factor) { return Point(this.x * factor, this.y * factor); }
+    }
+    class Solid < Point {
+        init(x, y, z) { super.init(x, y); this.z = z; }
+        sum() { return super.sum() + this.z; }
+    }
+    var point = Solid(1, 2, 3);
+    var sum = point.sum;
+    print point.sum();
+    print sum();
+    print point.scaled(2).sum();
+    print point.init(4, 5, 6) == point;
+    print point;
+    print Solid;
+    print sum;
+    point.sum = sum;
+    print point.sum();
+    """,
+    """
+    class Shape { area() { return 0; } }
+    class Square < Shape { init(side) { this.side = side; } }
+    class Circle < Shape { area() { return 3; } }
+    class Empty {}
+    var shapes = 0;
+    for (var i = 0; i < 12; i = i + 1) {
+        var shape = Empty();
+        if (i < 4) shape = Square(i);
+        else if (i < 8) shape = Circle();
+        else shape = Shape();
+        if (i == 10) shape.extra = i;
+        shapes = shapes + shape.area();
+    }
+    print shapes;
+    print Empty();
+    """,
+    """
+    class Counter {
+        init() { this.count = 0; return; }
+        increment() {
+            fun add() { this.count = this.count + 1; }
+            add();
+            return this;
+        }
+    }
+    var counter = Counter();
+    print counter.increment().increment().count;
+    print Counter().init().count;
+    """,
+    """
+    fun countdown(n) { if (n == 0) return "done"; return countdown(n - 1); }
+    fun even(n) { if (n == 0) return true; return odd(n - 1); }
+    fun odd(n) { if (n == 0) return false; return even(n - 1); }
+    print countdown(50);
+    print even(51);
+    var saved;
+    fun keep(n) {
+        fun get() { return n; }
+        if (saved == nil) saved = get;
+        if (n > 0) return keep(n - 1);
+        return n;
+    }
+    print keep(3);
+    print saved();
+    """,
+    """
+    class Node {
+        init(value) { this.value = value; }
+        last(n) { if (n == 0) return this; return this.last(n - 1); }
+    }
+    class Leaf < Node { last(n) { return super.last(n); } }
+    fun make(value) { return Node(value); }
+    fun run(n) { return Leaf(n).last(n); }
+    print make(1).value;
+    print run(5).value;
+    """,
+    "class A {}\nA().missing;",
+    "class A {}\nA().missing();",
+    "var a = 1;\na.b;",
+    "var a = 1;\na.b = 2;",
+    "var a = 1;\nclass B < a {}",
+    "class A {}\nA(1);",
+    "class A { init(x) {} }\nA();",
+    "print -nil;",
+    "print 1 < nil;",
+    'print 1 + "a";',
+    "print 1 / 0;",
+    "print a;",
+    "a = 1;",
+    '"a"();',
+    "fun f(a) {}\nf();",
+    "clock(1);",
+    "fun f() { f(); }\nf();",
+]
+
+
+def parse(source: str) -> list[Stmt]:
+    error_reporter = ListErrorReporter()
+    tokens = Scanner(source, error_reporter).iter_tokens()
+    statements = Parser(tokens, error_reporter).parse()
+    Resolver(error_reporter).resolve(statements)
+    assert error_reporter.errors == []
+    return statements
+
+
+class TestVM:
+    @pytest.mark.parametrize("source", PROGRAMS)
+    def test_matches_interpreter(self: Self, source: str) -> None:
+        interpreter_out = io.StringIO()
+        interpreter_errors = ListErrorReporter()
+        Interpreter(interpreter_errors, interpreter_out).interpret(parse(source))
+
+        vm_out = io.StringIO()
+        vm_errors = ListErrorReporter()
+        function = Compiler(vm_errors).compile(parse(source))
+        VM(vm_errors, vm_out).interpret(function)
+
+        assert vm_out.getvalue() == interpreter_out.getvalue()
+        assert vm_errors.errors == interpreter_errors.errors
+
+    def test_keeps_globals_between_runs(self: Self) -> None:
+        out = io.StringIO()
+        error_reporter = ListErrorReporter()
+        vm = VM(error_reporter, out)
+
+        vm.interpret(Compiler(error_reporter).compile(parse("var a = 1;")))
+        vm.interpret(Compiler(error_reporter).compile(parse("print a + 1;")))
+
+        assert out.getvalue() == "2\n"
+        assert error_reporter.errors == []
+
+    def test_keeps_negative_zero_apart(self: Self) -> None:
+        out = io.StringIO()
+        error_reporter = ListErrorReporter()
+        statements = Optimizer().optimize(parse("var z = 0; print z; print -0;"))
+
+        VM(error_reporter, out).interpret(Compiler(error_reporter).compile(statements))
+
+        assert out.getvalue() == "0\n-0\n"
+        assert error_reporter.errors == []
+
+    def test_reuses_frames_for_tail_calls(self: Self) -> None:
+        out = io.StringIO()
+        error_reporter = ListErrorReporter()
+        source = """
+        fun countdown(n) { if (n == 0) return "done"; return countdown(n - 1); }
+        fun even(n) { if (n == 0) return true; return odd(n - 1); }
+        fun odd(n) { if (n == 0) return false; return even(n - 1); }
+        print countdown(100000);
+        print even(100001);
+        """
+
+        function = Compiler(error_reporter).compile(parse(source))
+        VM(error_reporter, out, limits=Limits(max_call_depth=8)).interpret(function)
+
+        assert out.getvalue() == "done\nfalse\n"
+        assert error_reporter.errors == []
+
+    @pytest.mark.parametrize(
+        ("max_call_depth", "expected", "errors"),
+        [
+            (20000, "50005000\n", []),
+            (100, "", ["Stack overflow.\n[line 2]"]),
+        ],
+    )
+    def test_limits_call_depth(
+        self: Self,
+        max_call_depth: int,
+        expected: str,
+        errors: list[str],
+    ) -> None:
+        out = io.StringIO()
+        error_reporter = ListErrorReporter()
+        source = """
+        fun sum(n) { if (n == 0) return 0; return n + sum(n - 1); }
+        print sum(10000);
+        """
+
+        function = Compiler(error_reporter).compile(parse(source))
+        vm = VM(error_reporter, out, limits=Limits(max_call_depth=max_call_depth))
+        vm.interpret(function)
+
+        assert out.getvalue() == expected
+        assert error_reporter.errors == errors